@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare per-run overhead of the BacktestNode (Parquet catalog), in-memory BacktestEngine and
+single-pass matrix paths on synthetic bars. Strategy time grows with the bar count, so small runs
+isolate the fixed cost; pass several --strategy/--venue ids to see the matrix amortize it:
+
+    uv run python scripts/benchmark_backtest_execution.py --bars 500 --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from data.bar_frame import BarFrame  # noqa: E402
+from training.nautilus_backtest import (  # noqa: E402
+    BACKTEST_EXECUTION_ENGINE,
+    BACKTEST_EXECUTION_MATRIX,
+    BACKTEST_EXECUTION_NODE,
+    BACKTEST_EXECUTIONS,
+    run_backtest,
+)
+
+
+def _synthetic_bars(count: int, seed: int) -> BarFrame:
+    rng = np.random.default_rng(seed)
+    close = np.round(2000.0 + np.cumsum(rng.normal(0.0, 0.5, count)), 2)
+    timestamps = 1_704_067_200 * 1_000_000_000 + np.arange(count, dtype=np.int64) * 60_000_000_000
+    volume = np.round(rng.gamma(2.0, 50.0, count), 3)
+    return BarFrame(timestamps, close, close + 0.5, close - 0.5, close, volume)
+
+
+def _time_run(frame: BarFrame, execution: str, strategy_ids: list[str], venue_ids: list[str]) -> float:
+    started = time.perf_counter()
+    results = run_backtest(
+        pair="Gold-USDT",
+        interval="1m",
+        features=frame,
+        model_path=None,
+        window_size=30,
+        decision_threshold=0.5,
+        strategy_ids=strategy_ids,
+        venue_ids=venue_ids,
+        execution=execution,
+    )
+    elapsed = time.perf_counter() - started
+    return elapsed / max(1, len(results))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--strategy", action="append", default=[], help="strategy id (repeatable)")
+    parser.add_argument("--venue", action="append", default=[], help="venue id (repeatable)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    frame = _synthetic_bars(args.bars, args.seed)
+    strategy_ids = args.strategy or ["ema_trend"]
+    venue_ids = args.venue or ["bingx_margin"]
+
+    with tempfile.TemporaryDirectory() as catalog_root:
+        # Cold catalog on the first node run, warm (cached) afterwards; both are reported.
+        os.environ["RL_BACKTEST_CATALOG_PATH"] = catalog_root
+        timings: dict[str, list[float]] = {execution: [] for execution in BACKTEST_EXECUTIONS}
+        for _ in range(max(1, args.repeats)):
+            for execution in BACKTEST_EXECUTIONS:
+                timings[execution].append(_time_run(frame, execution, strategy_ids, venue_ids))
+
+    print(f"{args.bars} bars, strategies={strategy_ids}, venues={venue_ids}, repeats={args.repeats}")
+    for execution, values in timings.items():
+        warm = values[1:] or values
+        print(
+            f"{execution:>6}: first {values[0]:.3f}s/run, "
+            f"median {statistics.median(warm):.3f}s/run over {len(warm)} warm runs"
+        )
+    node = statistics.median(timings[BACKTEST_EXECUTION_NODE])
+    for execution in (BACKTEST_EXECUTION_ENGINE, BACKTEST_EXECUTION_MATRIX):
+        elapsed = statistics.median(timings[execution])
+        print(f"{execution} saves {node - elapsed:.3f}s per run ({(1 - elapsed / node) * 100 if node else 0.0:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
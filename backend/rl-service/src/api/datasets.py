@@ -1,11 +1,30 @@
 from __future__ import annotations
 
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
+from api.payloads import request_body, request_body_openapi
+from config import load_config
+from data.bar_frame import BarFrame
 from data.dataset_builder import build_dataset
-from schemas import DatasetPreviewResponse, DatasetRequest, DatasetVersionPayload
+from data.dataset_cache import get_dataset_cache
+from data.quality import repair_candles, validate_candles
+from data.timestamp_index import nanos_to_iso
+from data_lake.manifest import LakeManifest
+from schemas import (
+    CandleBatch,
+    DatasetAvailabilityResponse,
+    DatasetCacheRequest,
+    DatasetCacheResponse,
+    DatasetCoverage,
+    DatasetPreviewResponse,
+    DatasetRequest,
+    DatasetValidateRequest,
+    DatasetValidateResponse,
+    DatasetVersionPayload,
+)
 
 router = APIRouter()
 
@@ -78,7 +97,105 @@ def build_dataset_preview(payload: DatasetRequest) -> DatasetPreviewResponse:
             "feature_set_version_id": payload.feature_set_version_id,
             "feature_schema_fingerprint": payload.feature_schema_fingerprint,
         },
+        hash_mode=payload.hash_mode,
+        quality_check=payload.quality_check or bool(payload.quality_repairs),
+        quality_repairs=payload.quality_repairs,
     )
 
     version = DatasetVersionPayload(**result["dataset_version"])
-    return DatasetPreviewResponse(version=version, window_count=len(result["windows"]))
+    return DatasetPreviewResponse(version=version, window_count=len(result["windows"]), quality=result["quality"])
+
+
+@router.post(
+    "/datasets/validate",
+    response_model=DatasetValidateResponse,
+    openapi_extra=request_body_openapi(DatasetValidateRequest, "rows"),
+)
+def validate_dataset(
+    payload: DatasetValidateRequest = Depends(request_body(DatasetValidateRequest, "rows")),
+) -> DatasetValidateResponse:
+    try:
+        interval_seconds = _parse_interval_seconds(payload.interval) if payload.interval else None
+        source = payload.rows.to_bar_frame() if isinstance(payload.rows, CandleBatch) else payload.rows
+        report = validate_candles(source, interval_seconds, outlier_zscore=payload.outlier_zscore)
+        rows = None
+        if payload.repairs:
+            rows = repair_candles(source.to_rows() if isinstance(source, BarFrame) else source, report, payload.repairs)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    summary = report.summary()
+    if rows is not None:
+        summary["repairs"] = list(payload.repairs)
+        summary["repaired_row_count"] = len(rows)
+    return DatasetValidateResponse(
+        summary=summary,
+        issue_rows=report.issue_rows(payload.issue_row_limit),
+        rows=rows if payload.return_rows else None,
+    )
+
+
+def _cache_response(manifest: dict) -> DatasetCacheResponse:
+    return DatasetCacheResponse(
+        dataset_ref=manifest["dataset_ref"],
+        row_count=manifest["row_count"],
+        columns=[entry["name"] for entry in manifest["columns"]],
+    )
+
+
+@router.post(
+    "/datasets/cache",
+    response_model=DatasetCacheResponse,
+    openapi_extra=request_body_openapi(DatasetCacheRequest, "rows"),
+)
+def cache_dataset(
+    payload: DatasetCacheRequest = Depends(request_body(DatasetCacheRequest, "rows")),
+) -> DatasetCacheResponse:
+    rows = payload.rows.to_rows() if isinstance(payload.rows, CandleBatch) else payload.rows
+    try:
+        manifest = get_dataset_cache().put(rows, base_ref=payload.base_ref)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"Dataset {payload.base_ref} is not cached") from exc
+    return _cache_response(manifest)
+
+
+@router.get("/datasets/cache/{dataset_ref}", response_model=DatasetCacheResponse)
+def get_cached_dataset(dataset_ref: str) -> DatasetCacheResponse:
+    try:
+        manifest = get_dataset_cache().manifest(dataset_ref)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=f"Dataset {dataset_ref} is not cached") from exc
+    return _cache_response(manifest)
+
+
+@router.get("/datasets/availability", response_model=DatasetAvailabilityResponse)
+def get_dataset_availability(
+    pair: str | None = None,
+    interval: str | None = None,
+    table: Literal["candles", "tickers"] | None = None,
+) -> DatasetAvailabilityResponse:
+    root = load_config().data_lake_path
+    # Answer from the manifest's coverage rows only; a lake without one has nothing indexed yet.
+    if not LakeManifest.exists(root):
+        return DatasetAvailabilityResponse(series=[])
+    with LakeManifest(root) as manifest:
+        coverage = manifest.coverage(table=table, pair=pair, interval=interval)
+    return DatasetAvailabilityResponse(
+        series=[
+            DatasetCoverage(
+                table=entry.table,
+                pair=entry.pair,
+                interval=entry.interval or None,
+                first_at=datetime.fromisoformat(nanos_to_iso(entry.first_ts)),
+                last_at=datetime.fromisoformat(nanos_to_iso(entry.last_ts)),
+                row_count=entry.row_count,
+                file_count=entry.file_count,
+                gap_count=entry.gap_count,
+            )
+            for entry in coverage
+        ]
+    )
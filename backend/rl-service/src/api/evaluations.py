@@ -1,23 +1,37 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from schemas import EvaluationReport, EvaluationRequest
+from api.payloads import request_body, request_body_openapi
+from data.dataset_cache import resolve_dataset
+from schemas import CandleBatch, EvaluationReport, EvaluationRequest
 from training.evaluation import run_evaluation
 
 router = APIRouter()
 
 
-@router.post("/evaluations", response_model=EvaluationReport)
-def run_evaluation_endpoint(payload: EvaluationRequest) -> EvaluationReport:
+@router.post(
+    "/evaluations",
+    response_model=EvaluationReport,
+    openapi_extra=request_body_openapi(EvaluationRequest, "dataset_features"),
+)
+def run_evaluation_endpoint(
+    payload: EvaluationRequest = Depends(request_body(EvaluationRequest, "dataset_features")),
+) -> EvaluationReport:
     try:
+        try:
+            dataset_features, dataset_hasher = resolve_dataset(payload.dataset_features, payload.dataset_ref)
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail=f"Dataset {payload.dataset_ref} is not cached") from exc
+        if isinstance(dataset_features, CandleBatch):
+            dataset_features = dataset_features.to_bar_frame()
         return run_evaluation(
             pair=payload.pair,
             period_start=payload.period_start,
             period_end=payload.period_end,
             interval=payload.interval,
             context_intervals=payload.context_intervals,
-            dataset_features=payload.dataset_features,
+            dataset_features=dataset_features,
             artifact_base64=payload.artifact_base64,
             artifact_download_url=payload.artifact_download_url,
             artifact_checksum=payload.artifact_checksum,
@@ -37,6 +51,8 @@ def run_evaluation_endpoint(payload: EvaluationRequest) -> EvaluationReport:
             feature_key_extras=payload.feature_key_extras,
             walk_forward=payload.walk_forward,
             feature_schema_fingerprint=payload.feature_schema_fingerprint,
+            dataset_hash_mode=payload.dataset_hash_mode,
+            dataset_hasher=dataset_hasher,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -3,7 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, HTTPException
 
 from config import load_config
-from features.extractors import extract_features, vectorize_features
+from features.extractors import build_policy_observation, extract_features
 from models.action_mapper import map_action
 from models.artifact_loader import decode_base64, fetch_artifact
 from models.registry import ModelMetadata, ModelRegistry
@@ -64,7 +64,15 @@ def run_inference(payload: InferenceRequest) -> InferenceResponse:
             )
             import numpy as np
 
-            obs = np.array(vectorize_features(features), dtype=float)
+            obs = build_policy_observation(
+                payload.market,
+                payload.ideas,
+                payload.signals,
+                payload.news,
+                payload.ocr,
+                features,
+                observation_spec=registry.observation_spec(payload.policy_version),
+            )
             action, _ = model.predict(obs, deterministic=True)
             try:
                 score = float(action)
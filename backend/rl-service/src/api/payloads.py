@@ -0,0 +1,276 @@
+"""
+Request body negotiation for endpoints that carry candle datasets. JSON stays the default;
+Arrow IPC streams, msgpack streams and NDJSON are decoded straight into column buffers so a
+large upload never materializes one Python dict per candle.
+
+Streamed formats (NDJSON, msgpack) share one framing: the first object is the request header
+(every field except the candles), and each following object is one candle, either a map or an
+array ordered by the header's "columns". Arrow IPC carries the candles as the record batches and
+the header as JSON under the "request" schema metadata key.
+"""
+
+from __future__ import annotations
+
+import json
+from array import array
+from typing import Any, Awaitable, Callable, Iterable, TypeVar, get_args
+
+import numpy as np
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from data.bar_frame import BAR_COLUMNS, CTX_COLUMN_PREFIX, FUTURES_COLUMNS, BarFrame
+from data.timestamp_index import timestamp_to_nanos
+from schemas import TIMESTAMP_UNIT_NANOS, CandleBatch
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_NDJSON = "application/x-ndjson"
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+CONTENT_TYPE_ARROW_STREAM = "application/vnd.apache.arrow.stream"
+# Accepted aliases per format
+_CONTENT_TYPE_ALIASES = {
+    "application/json": CONTENT_TYPE_JSON,
+    "application/x-ndjson": CONTENT_TYPE_NDJSON,
+    "application/ndjson": CONTENT_TYPE_NDJSON,
+    "application/jsonlines": CONTENT_TYPE_NDJSON,
+    "application/msgpack": CONTENT_TYPE_MSGPACK,
+    "application/x-msgpack": CONTENT_TYPE_MSGPACK,
+    "application/vnd.apache.arrow.stream": CONTENT_TYPE_ARROW_STREAM,
+}
+ARROW_REQUEST_METADATA_KEY = b"request"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _is_extra_column(name: str) -> bool:
+    return name in FUTURES_COLUMNS or name.startswith(CTX_COLUMN_PREFIX)
+
+
+class CandleColumnBuilder:
+    """Appends candles into typed array buffers; memory grows with the final column size."""
+
+    def __init__(self, columns: Iterable[str] | None = None, timestamp_unit: str = "ms") -> None:
+        if timestamp_unit not in TIMESTAMP_UNIT_NANOS:
+            raise ValueError(f"timestamp_unit must be one of {tuple(TIMESTAMP_UNIT_NANOS)}")
+        self._columns = list(columns) if columns is not None else None
+        self._unit_nanos = TIMESTAMP_UNIT_NANOS[timestamp_unit]
+        self._timestamps = array("q")
+        self._values = {name: array("d") for name in BAR_COLUMNS}
+        self._extras: dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def _timestamp(self, value: object) -> int:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return int(value) * self._unit_nanos
+        return timestamp_to_nanos(value)
+
+    def _extra(self, name: str) -> array:
+        values = self._extras.get(name)
+        if values is None:
+            # Called after the current timestamp is appended: back-fill every earlier candle.
+            values = array("d", [float("nan")]) * (len(self._timestamps) - 1)
+            self._extras[name] = values
+        return values
+
+    def append(self, candle: object) -> None:
+        if isinstance(candle, (list, tuple)):
+            if self._columns is None:
+                raise ValueError("array candles require 'columns' in the request header")
+            if len(candle) != len(self._columns):
+                raise ValueError(f"candle has {len(candle)} values, expected {len(self._columns)}")
+            candle = dict(zip(self._columns, candle))
+        if not isinstance(candle, dict):
+            raise ValueError("each candle must be an object or an array")
+        self._timestamps.append(self._timestamp(candle.get("timestamp")))
+        for name in BAR_COLUMNS:
+            value = candle.get(name)
+            self._values[name].append(float(value) if value is not None else float("nan"))
+        for name, values in self._extras.items():
+            if name not in candle:
+                values.append(float("nan"))
+        for name, value in candle.items():
+            if isinstance(name, str) and _is_extra_column(name):
+                self._extra(name).append(float(value) if value is not None else float("nan"))
+
+    def to_bar_frame(self) -> BarFrame:
+        return BarFrame(
+            np.frombuffer(self._timestamps, dtype=np.int64),
+            *(np.frombuffer(self._values[name], dtype=np.float64) for name in BAR_COLUMNS),
+            extras={name: np.frombuffer(values, dtype=np.float64) for name, values in self._extras.items()},
+        )
+
+
+def _content_type(request: Request) -> str:
+    raw = request.headers.get("content-type", CONTENT_TYPE_JSON).split(";", 1)[0].strip().lower()
+    resolved = _CONTENT_TYPE_ALIASES.get(raw)
+    if resolved is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported Content-Type {raw!r}; use one of {sorted(set(_CONTENT_TYPE_ALIASES.values()))}",
+        )
+    return resolved
+
+
+async def _iter_ndjson(request: Request):
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        lines = pending.split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if pending.strip():
+        yield json.loads(pending)
+
+
+async def _iter_msgpack(request: Request):
+    try:
+        import msgpack
+    except Exception as exc:  # pragma: no cover - optional dependency guard
+        raise HTTPException(status_code=415, detail="msgpack is required for application/msgpack bodies") from exc
+    unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+    async for chunk in request.stream():
+        unpacker.feed(chunk)
+        for item in unpacker:
+            yield item
+
+
+async def _read_streamed(objects, candles_field: str, batch_type: type[CandleBatch]) -> dict[str, Any]:
+    header: dict[str, Any] | None = None
+    builder: CandleColumnBuilder | None = None
+    async for item in objects:
+        if header is None:
+            if not isinstance(item, dict):
+                raise ValueError("the first streamed object must be the request header")
+            header = item
+            builder = CandleColumnBuilder(header.pop("columns", None), header.pop("timestamp_unit", "ms"))
+            continue
+        builder.append(item)
+    if header is None:
+        raise ValueError("request body is empty")
+    if len(builder):
+        header[candles_field] = batch_type.from_bar_frame(builder.to_bar_frame())
+    return header
+
+
+def _arrow_timestamps(column, unit: str) -> np.ndarray:
+    import pyarrow as pa
+
+    if pa.types.is_timestamp(column.type):
+        return column.cast(pa.timestamp("ns", tz=column.type.tz)).cast(pa.int64()).to_numpy()
+    if pa.types.is_integer(column.type):
+        return column.cast(pa.int64()).to_numpy() * TIMESTAMP_UNIT_NANOS[unit]
+    return np.fromiter((timestamp_to_nanos(value) for value in column.to_pylist()), dtype=np.int64, count=len(column))
+
+
+async def _read_arrow(request: Request, candles_field: str, batch_type: type[CandleBatch]) -> dict[str, Any]:
+    try:
+        import pyarrow as pa
+    except Exception as exc:  # pragma: no cover - optional dependency guard
+        raise HTTPException(status_code=415, detail="pyarrow is required for Arrow IPC bodies") from exc
+
+    body = await request.body()
+    try:
+        table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except pa.ArrowInvalid as exc:
+        raise ValueError(f"invalid Arrow IPC stream: {exc}") from exc
+    metadata = table.schema.metadata or {}
+    header = json.loads(metadata.get(ARROW_REQUEST_METADATA_KEY, b"{}"))
+    unit = header.pop("timestamp_unit", "ms")
+    missing = [name for name in ("timestamp", *BAR_COLUMNS) if name not in table.column_names]
+    if missing:
+        raise ValueError(f"Arrow stream is missing columns: {missing}")
+
+    def numeric(name: str) -> np.ndarray:
+        column = table.column(name).cast(pa.float64())
+        return column.to_numpy() if column.null_count == 0 else column.fill_null(float("nan")).to_numpy()
+
+    frame = BarFrame(
+        _arrow_timestamps(table.column("timestamp"), unit),
+        *(numeric(name) for name in BAR_COLUMNS),
+        extras={name: numeric(name) for name in table.column_names if _is_extra_column(name)},
+    )
+    header[candles_field] = batch_type.from_bar_frame(frame)
+    return header
+
+
+def _inline_refs(node: Any, definitions: dict[str, Any]) -> Any:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/$defs/"):
+            return _inline_refs(definitions[ref.removeprefix("#/$defs/")], definitions)
+        return {key: _inline_refs(value, definitions) for key, value in node.items() if key != "$defs"}
+    if isinstance(node, list):
+        return [_inline_refs(item, definitions) for item in node]
+    return node
+
+
+def request_body_openapi(model: type[BaseModel], candles_field: str) -> dict[str, Any]:
+    """
+    `openapi_extra` documenting the body that request_body() parses: the model's JSON schema plus
+    the streamed alternatives. Nested definitions are inlined because "#/$defs" refs would resolve
+    against the OpenAPI document root.
+    """
+    schema = model.model_json_schema()
+    json_schema = _inline_refs(schema, schema.get("$defs", {}))
+    streamed = (
+        f"First object: the request header (every field except {candles_field!r}, optionally 'columns' "
+        "and 'timestamp_unit'); each following object is one candle."
+    )
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                CONTENT_TYPE_JSON: {"schema": json_schema},
+                CONTENT_TYPE_NDJSON: {"schema": {"type": "string", "format": "binary", "description": streamed}},
+                CONTENT_TYPE_MSGPACK: {"schema": {"type": "string", "format": "binary", "description": streamed}},
+                CONTENT_TYPE_ARROW_STREAM: {
+                    "schema": {
+                        "type": "string",
+                        "format": "binary",
+                        "description": (
+                            f"Record batches hold {candles_field!r}; the other fields are JSON under the "
+                            f"{ARROW_REQUEST_METADATA_KEY.decode()!r} schema metadata key."
+                        ),
+                    }
+                },
+            },
+        }
+    }
+
+
+def _candle_batch_type(model: type[BaseModel], candles_field: str) -> type[CandleBatch]:
+    """The CandleBatch (sub)class declared on `candles_field`, so binary bodies get the same checks as JSON."""
+    annotation = model.model_fields[candles_field].annotation
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, CandleBatch):
+            return candidate
+    return CandleBatch
+
+
+def request_body(model: type[ModelT], candles_field: str) -> Callable[[Request], Awaitable[ModelT]]:
+    """Dependency parsing `model` from JSON, NDJSON, msgpack or Arrow IPC by Content-Type."""
+    batch_type = _candle_batch_type(model, candles_field)
+
+    async def _parse(request: Request) -> ModelT:
+        content_type = _content_type(request)
+        try:
+            if content_type == CONTENT_TYPE_JSON:
+                return model.model_validate_json(await request.body())
+            if content_type == CONTENT_TYPE_ARROW_STREAM:
+                payload = await _read_arrow(request, candles_field, batch_type)
+            elif content_type == CONTENT_TYPE_MSGPACK:
+                payload = await _read_streamed(_iter_msgpack(request), candles_field, batch_type)
+            else:
+                payload = await _read_streamed(_iter_ndjson(request), candles_field, batch_type)
+            return model.model_validate(payload)
+        except ValidationError as exc:
+            raise RequestValidationError(exc.errors(include_url=False)) from exc
+        except (ValueError, TypeError) as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    return _parse
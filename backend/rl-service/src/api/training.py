@@ -1,22 +1,45 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from data.dataset_builder import build_dataset
-from schemas import TrainingRequest, TrainingResponse
+from data.dataset_builder import build_dataset, period_warmup_rows, select_period
+from api.payloads import request_body, request_body_openapi
+from data.dataset_cache import resolve_dataset
+from schemas import CandleBatch, TrainingRequest, TrainingResponse
 from training.sb3_trainer import TrainingConfig, train_policy
 
 router = APIRouter()
 
 
-@router.post("/training/run", response_model=TrainingResponse)
-def run_training(payload: TrainingRequest) -> TrainingResponse:
+@router.post(
+    "/training/run",
+    response_model=TrainingResponse,
+    openapi_extra=request_body_openapi(TrainingRequest, "dataset_features"),
+)
+def run_training(
+    payload: TrainingRequest = Depends(request_body(TrainingRequest, "dataset_features")),
+) -> TrainingResponse:
     try:
-        if not payload.dataset_features:
-            raise HTTPException(status_code=400, detail="dataset_features are required for training")
+        try:
+            dataset_features, dataset_hasher = resolve_dataset(payload.dataset_features, payload.dataset_ref)
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail=f"Dataset {payload.dataset_ref} is not cached") from exc
+        if isinstance(dataset_features, CandleBatch):
+            dataset_features = dataset_features.to_rows()
+        if not dataset_features:
+            raise HTTPException(status_code=400, detail="dataset_features or dataset_ref are required for training")
+
+        # Bars before period_start only give the first in-period windows their context.
+        warmup = period_warmup_rows(payload.window_size, payload.history_length)
+        selected = select_period(dataset_features, payload.period_start, payload.period_end, warmup)
+        if not selected.rows:
+            raise HTTPException(status_code=400, detail="No dataset rows between period_start and period_end")
+        if selected.rows is not dataset_features:
+            # Cached chunk digests describe the rows before sorting/selection.
+            dataset_hasher = None
 
         result = build_dataset(
-            payload.dataset_features,
+            selected,
             window_size=payload.window_size,
             stride=payload.stride,
             metadata={
@@ -26,6 +49,7 @@ def run_training(payload: TrainingRequest) -> TrainingResponse:
                 "end_at": payload.period_end,
                 "feature_schema_fingerprint": payload.feature_schema_fingerprint,
             },
+            hasher=dataset_hasher,
         )
 
         windows = result["windows"]
@@ -46,7 +70,15 @@ def run_training(payload: TrainingRequest) -> TrainingResponse:
                 feedback_timesteps=payload.feedback_timesteps,
                 feedback_hard_ratio=payload.feedback_hard_ratio,
                 feature_key_extras=payload.feature_key_extras,
+                episode_mode=payload.episode_mode,
+                window_size=payload.window_size,
+                episode_length=payload.episode_length,
+                min_episode_length=payload.min_episode_length,
+                observation_normalization=payload.observation_normalization,
+                history_length=payload.history_length,
+                decision_interval=payload.decision_interval,
             ),
+            series=windows.rows,
         )
 
         return TrainingResponse(
@@ -56,5 +88,7 @@ def run_training(payload: TrainingRequest) -> TrainingResponse:
             algorithm_label=training_result.algorithm_label,
             hyperparameter_summary=training_result.hyperparameter_summary,
         )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
@@ -12,6 +12,12 @@ class ServiceConfig:
     log_level: str
     request_timeout_ms: int
     model_registry_path: str
+    dataset_cache_path: str
+    dataset_cache_codec: str
+    data_lake_path: str
+    backtest_catalog_path: str
+    backtest_catalog_max_bytes: int
+    backtest_execution: str
     artifact_bucket: str | None
     strict_model_inference: bool
     strict_backtest: bool
@@ -50,6 +56,12 @@ def load_config(env: dict[str, str] | None = None) -> ServiceConfig:
         log_level=env.get("RL_SERVICE_LOG_LEVEL", "info"),
         request_timeout_ms=_get_int(env, "RL_SERVICE_REQUEST_TIMEOUT_MS", 15000),
         model_registry_path=env.get("RL_MODEL_REGISTRY_PATH", "./models"),
+        dataset_cache_path=env.get("RL_DATASET_CACHE_PATH", "./dataset_cache"),
+        dataset_cache_codec=env.get("RL_DATASET_CACHE_CODEC", "npy"),
+        data_lake_path=env.get("RL_DATA_LAKE_PATH", "./lake"),
+        backtest_catalog_path=env.get("RL_BACKTEST_CATALOG_PATH", "./backtest_catalogs"),
+        backtest_catalog_max_bytes=_get_int(env, "RL_BACKTEST_CATALOG_MAX_BYTES", 2 * 1024**3),
+        backtest_execution=env.get("RL_BACKTEST_EXECUTION", "node"),
         artifact_bucket=env.get("RL_ARTIFACT_BUCKET"),
         strict_model_inference=_get_bool(env, "RL_STRICT_MODEL_INFERENCE", True),
         strict_backtest=_get_bool(env, "RL_STRICT_BACKTEST", True),
@@ -0,0 +1,149 @@
+"""
+BarFrame: struct-of-arrays candle container used internally instead of list[dict] rows.
+Timestamps are int64 epoch nanoseconds and prices float64, so a bar costs ~48 bytes plus
+optional futures/ctx columns instead of a dict with boxed floats and an ISO string.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Iterable
+
+import numpy as np
+
+from data.timestamp_index import TimestampIndex, nanos_to_iso, timestamp_to_nanos
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+# Optional numeric columns carried through when present: futures context plus ctx_* features
+FUTURES_COLUMNS = ("funding_rate", "open_interest", "mark_price", "index_price")
+CTX_COLUMN_PREFIX = "ctx_"
+
+
+def _float_or_nan(value: object) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+@dataclass(frozen=True)
+class BarFrame:
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    extras: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        size = self.timestamps.shape[0]
+        for name in (*BAR_COLUMNS, *self.extras):
+            if self.column(name).shape != (size,):
+                raise ValueError(f"column {name!r} must be 1-D with {size} rows")
+
+    @classmethod
+    def empty(cls) -> BarFrame:
+        return cls(np.empty(0, dtype=np.int64), *(np.empty(0, dtype=np.float64) for _ in BAR_COLUMNS))
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict], extra_columns: Iterable[str] | None = None) -> BarFrame:
+        """
+        Convert API rows once. Without explicit extra_columns, futures columns and ctx_* keys seen
+        in any row are kept; missing or non-numeric values become NaN.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        if extra_columns is None:
+            seen: dict[str, None] = {}
+            for row in rows:
+                for key in row:
+                    if key in FUTURES_COLUMNS or (isinstance(key, str) and key.startswith(CTX_COLUMN_PREFIX)):
+                        seen[key] = None
+            extra_columns = seen
+        count = len(rows)
+        timestamps = np.fromiter((timestamp_to_nanos(row.get("timestamp")) for row in rows), dtype=np.int64, count=count)
+        base = [
+            np.fromiter((_float_or_nan(row.get(name, 0.0)) for row in rows), dtype=np.float64, count=count)
+            for name in BAR_COLUMNS
+        ]
+        extras = {
+            name: np.fromiter((_float_or_nan(row.get(name)) for row in rows), dtype=np.float64, count=count)
+            for name in extra_columns
+        }
+        return cls(timestamps, *base, extras=extras)
+
+    def to_rows(self) -> list[dict]:
+        """Dict rows for the API edge; NaN extras are omitted rather than serialized."""
+        names = (*BAR_COLUMNS, *self.extras)
+        columns = [self.column(name).tolist() for name in names]
+        rows: list[dict] = []
+        for position, timestamp in enumerate(self.timestamps.tolist()):
+            row = {"timestamp": nanos_to_iso(timestamp)}
+            for name, values in zip(names, columns):
+                value = values[position]
+                if value == value or name in BAR_COLUMNS:
+                    row[name] = value
+            rows.append(row)
+        return rows
+
+    def __len__(self) -> int:
+        return int(self.timestamps.shape[0])
+
+    def __getitem__(self, item: slice | np.ndarray) -> BarFrame:
+        """Slices return views; integer or boolean arrays gather copies."""
+        if isinstance(item, (int, np.integer)):
+            raise TypeError("BarFrame indexing takes a slice or index array; use column() for scalars")
+        return BarFrame(
+            self.timestamps[item],
+            *(self.column(name)[item] for name in BAR_COLUMNS),
+            extras={name: values[item] for name, values in self.extras.items()},
+        )
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return ("timestamp", *BAR_COLUMNS, *self.extras)
+
+    def column(self, name: str) -> np.ndarray:
+        if name == "timestamp":
+            return self.timestamps
+        if name in BAR_COLUMNS:
+            return getattr(self, name)
+        try:
+            return self.extras[name]
+        except KeyError as exc:
+            raise KeyError(f"BarFrame has no column {name!r}") from exc
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(self.column(name).nbytes for name in self.columns))
+
+    @cached_property
+    def timestamp_index(self) -> TimestampIndex:
+        """Built once per frame; the column arrays are treated as immutable."""
+        return TimestampIndex(self.timestamps)
+
+    def is_sorted(self) -> bool:
+        return bool(len(self) < 2 or np.all(self.timestamps[1:] >= self.timestamps[:-1]))
+
+    def sorted(self) -> BarFrame:
+        if self.is_sorted():
+            return self
+        return self[np.argsort(self.timestamps, kind="stable")]
+
+    def resample(self, seconds: int) -> BarFrame:
+        """Aggregate sorted bars into fixed buckets of `seconds`; extras take the bucket's last value."""
+        if len(self) == 0:
+            return self
+        keys = self.timestamp_index.bucket_keys(seconds)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+        ends = np.concatenate((starts[1:], [len(self)])) - 1
+        return BarFrame(
+            self.timestamps[starts],
+            self.open[starts],
+            np.maximum.reduceat(self.high, starts),
+            np.minimum.reduceat(self.low, starts),
+            self.close[ends],
+            np.add.reduceat(self.volume, starts),
+            extras={name: values[ends] for name, values in self.extras.items()},
+        )
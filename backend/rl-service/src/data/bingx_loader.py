@@ -1,43 +1,290 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Iterable
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Protocol
 
+import numpy as np
 from convex import ConvexClient
 
+from data.bar_frame import BarFrame
+from data.candle_store import CandleStore
+from data.timestamp_index import timestamp_to_nanos
 from schemas import MarketCandle, MarketSnapshot, TradingPair
 
+try:
+    from prometheus_client import Counter, Gauge
+except Exception:  # pragma: no cover - optional dependency guard
+    Counter = None
+    Gauge = None
+
+CANDLE_COLUMNS = ["open_time", "open", "high", "low", "close", "volume"]
+TICKER_COLUMNS = ["last_price", "volume_24h", "price_change_24h", "captured_at"]
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 0.5
+# Cached bars re-fetched on every sync so a revised (still-forming) last bar is replaced
+DEFAULT_OVERLAP_BARS = 2
+_INTERVAL_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+# Numeric timestamps above this are epoch milliseconds, otherwise epoch seconds
+_EPOCH_MS_THRESHOLD = 1_000_000_000_000
+_NAT = np.iinfo(np.int64).min
+
+
+if Counter is not None and Gauge is not None:
+    # Hit ratio is bars{source="cache"} / sum(bars); the gauge holds the ratio of the last read.
+    CANDLE_CACHE_BARS = Counter(
+        "rl_candle_cache_bars_total", "Candles served by the loader, by source", ["source"]
+    )
+    CANDLE_CACHE_HIT_RATIO = Gauge(
+        "rl_candle_cache_hit_ratio", "Share of the last read served from the candle cache", ["pair", "interval"]
+    )
+    CANDLE_CACHE_SYNC_LAG = Gauge(
+        "rl_candle_cache_sync_lag_seconds", "Age of the newest cached bar after a sync", ["pair", "interval"]
+    )
+else:  # pragma: no cover - metrics disabled without prometheus_client
+    CANDLE_CACHE_BARS = CANDLE_CACHE_HIT_RATIO = CANDLE_CACHE_SYNC_LAG = None
+
+
+class ConvexQueryClient(Protocol):
+    def query(self, name: str, args: dict) -> Any: ...
+
+
+@dataclass(frozen=True)
+class CandleSyncResult:
+    fetched: int
+    # Bars the cache did not hold before the sync; `fetched` also counts the re-fetched overlap.
+    new: int
+    high_water_mark: datetime | None
+    lag_seconds: float | None
+
 
 class BingxMarketDataLoader:
-    def __init__(self, convex_url: str, timeout_ms: int = 10_000) -> None:
-        if not convex_url:
-            raise ValueError("convex_url is required")
-        self._client = ConvexClient(convex_url)
+    def __init__(
+        self,
+        convex_url: str | None = None,
+        timeout_ms: int = 10_000,
+        client: ConvexQueryClient | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+        cache: CandleStore | None = None,
+        overlap_bars: int = DEFAULT_OVERLAP_BARS,
+    ) -> None:
+        if client is None:
+            if not convex_url:
+                raise ValueError("convex_url is required")
+            client = ConvexClient(convex_url)
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+        if overlap_bars < 0:
+            raise ValueError("overlap_bars must be >= 0")
+        self._client = client
         self._timeout_ms = timeout_ms
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._sleep = sleep
+        self._cache = cache
+        self._overlap_bars = overlap_bars
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bingx-loader")
 
     def close(self) -> None:
-        return None
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> BingxMarketDataLoader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
     def fetch_candles(self, pair: TradingPair, interval: str, limit: int = 200) -> list[MarketCandle]:
-        rows = self._query(
-            {
-                "table": "bingx_candles",
-                "select": ["open_time", "open", "high", "low", "close", "volume"],
-                "filters": [
-                    {"field": "pair", "op": "eq", "value": pair.value},
-                    {"field": "interval", "op": "eq", "value": interval},
-                ],
-                "order": {"field": "open_time", "direction": "asc"},
-                "limit": limit,
-            }
+        """The most recent `limit` bars, oldest first."""
+        if self._cache is not None:
+            sync = self.sync_candles(pair, interval, latest=limit)
+            return self._served(pair, interval, self._cache.read(pair.value, interval, limit=limit, newest=True), sync)
+        rows = self._query(_candle_query(pair, interval, limit, direction="desc"))
+        return parse_candle_rows(reversed(rows))
+
+    def sync_candles(
+        self,
+        pair: TradingPair,
+        interval: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        since: datetime | None = None,
+        latest: int | None = None,
+    ) -> CandleSyncResult:
+        """
+        Pull bars newer than the cache high-water mark into the cache. The last overlap_bars cached
+        bars are fetched again and upserted so a revised last bar replaces the stale one.
+
+        `since` bounds the history a read needs: a cold cache is filled from there rather than from
+        the first bar in Convex, and a warm cache starting after it gets the missing head fetched.
+        Leaving it None on a cold cache backfills the full history, which is a job for an explicit
+        sync rather than the read path.
+
+        `latest` asks for the newest `latest` bars wherever the Convex mirror currently ends, so a
+        lagging mirror still fills a full read: a cold cache is seeded with one descending query,
+        and a warm cache gets the bars before its high-water mark back-filled.
+        """
+        if self._cache is None:
+            raise RuntimeError("sync_candles requires a candle cache")
+        high_water_mark = self._cache.high_water_mark(pair.value, interval)
+        step = interval_to_seconds(interval) or 0
+        if high_water_mark is None:
+            if latest is not None and since is None:
+                rows = self._query(_candle_query(pair, interval, latest, direction="desc"))
+                candles = parse_candle_rows(reversed(rows))
+            else:
+                candles = parse_candle_rows(self._fetch_span(pair, interval, since, None, page_size))
+            new = len(candles)
+        else:
+            if latest is not None and step:
+                anchor = high_water_mark - timedelta(seconds=step * (latest - 1))
+                since = anchor if since is None else min(_as_utc(since), anchor)
+            head: list[MarketCandle] = []
+            low_water_mark = self._cache.low_water_mark(pair.value, interval)
+            if since is not None and _as_utc(since) < low_water_mark:
+                upper = low_water_mark - timedelta(milliseconds=1)
+                head = parse_candle_rows(self._fetch_span(pair, interval, since, upper, page_size))
+            if self._overlap_bars:
+                lower = high_water_mark - timedelta(seconds=step * (self._overlap_bars - 1))
+            else:
+                lower = high_water_mark + timedelta(milliseconds=1)
+            tail = parse_candle_rows(self._fetch_span(pair, interval, lower, None, page_size))
+            candles = head + tail
+            new = len(head) + sum(1 for candle in tail if candle.timestamp > high_water_mark)
+        self._cache.upsert(pair.value, interval, candles)
+        high_water_mark = self._cache.high_water_mark(pair.value, interval)
+        lag = None
+        if high_water_mark is not None:
+            lag = max(0.0, (datetime.now(timezone.utc) - high_water_mark).total_seconds())
+            if CANDLE_CACHE_SYNC_LAG is not None:
+                CANDLE_CACHE_SYNC_LAG.labels(pair=pair.value, interval=interval).set(lag)
+        return CandleSyncResult(fetched=len(candles), new=new, high_water_mark=high_water_mark, lag_seconds=lag)
+
+    def _served(
+        self, pair: TradingPair, interval: str, candles: list[MarketCandle], sync: CandleSyncResult
+    ) -> list[MarketCandle]:
+        self._record_served(pair, interval, len(candles), sync)
+        return candles
+
+    def _record_served(self, pair: TradingPair, interval: str, served: int, sync: CandleSyncResult) -> None:
+        from_convex = min(served, sync.new)
+        from_cache = served - from_convex
+        if CANDLE_CACHE_BARS is not None:
+            CANDLE_CACHE_BARS.labels(source="cache").inc(from_cache)
+            CANDLE_CACHE_BARS.labels(source="convex").inc(from_convex)
+            if served:
+                CANDLE_CACHE_HIT_RATIO.labels(pair=pair.value, interval=interval).set(from_cache / served)
+
+    def fetch_candle_range(
+        self,
+        pair: TradingPair,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> list[MarketCandle]:
+        """
+        Candles with start <= open_time <= end. The range is split into spans of about one page each,
+        fetched concurrently; a span returning a full page keeps paging by open_time cursor.
+        """
+        start, end = _check_range(start, end, page_size)
+        if self._cache is not None:
+            sync = self.sync_candles(pair, interval, page_size=page_size, since=start)
+            return self._served(pair, interval, self._cache.read(pair.value, interval, start=start, end=end), sync)
+        return parse_candle_rows(self._fetch_range_rows(pair, interval, start, end, page_size))
+
+    def fetch_candle_frame(
+        self,
+        pair: TradingPair,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> BarFrame:
+        """fetch_candle_range as a BarFrame, skipping per-candle model construction."""
+        start, end = _check_range(start, end, page_size)
+        if self._cache is not None:
+            sync = self.sync_candles(pair, interval, page_size=page_size, since=start)
+            frame = self._cache.read_frame(pair.value, interval, start=start, end=end)
+            self._record_served(pair, interval, len(frame), sync)
+            return frame
+        return parse_candle_frame(self._fetch_range_rows(pair, interval, start, end, page_size))
+
+    def fetch_ticker_rows(
+        self,
+        pair: TradingPair,
+        start: datetime,
+        end: datetime,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        span: timedelta = timedelta(days=1),
+    ) -> list[dict]:
+        """Raw bingx_tickers rows with start <= captured_at <= end, oldest first, fetched span by span."""
+        start, end = _check_range(start, end, page_size)
+        spans = _split_range(start, end, span)
+        pages = self._executor.map(
+            lambda bounds: self._paginate(
+                lambda lower, upper: _ticker_query(pair, page_size, lower, upper), "captured_at", *bounds, page_size
+            ),
+            spans,
         )
-        return parse_candle_rows(rows)
+        return _dedupe_rows(pages, "captured_at")
+
+    def _fetch_range_rows(
+        self, pair: TradingPair, interval: str, start: datetime, end: datetime, page_size: int
+    ) -> list[dict]:
+        step = interval_to_seconds(interval)
+        spans = _split_range(start, end, timedelta(seconds=step * page_size) if step else end - start)
+        # Spans are disjoint and each is ascending, so concatenating in span order keeps rows sorted.
+        pages = self._executor.map(lambda bounds: self._fetch_span(pair, interval, *bounds, page_size), spans)
+        return _dedupe_rows(pages, "open_time")
+
+    def _fetch_span(
+        self, pair: TradingPair, interval: str, start: datetime | None, end: datetime | None, page_size: int
+    ) -> list[dict]:
+        return self._paginate(
+            lambda lower, upper: _candle_query(pair, interval, page_size, lower=lower, upper=upper),
+            "open_time",
+            start,
+            end,
+            page_size,
+        )
+
+    def _paginate(
+        self,
+        build_query: Callable[[str | None, str | None], dict],
+        cursor_field: str,
+        start: datetime | None,
+        end: datetime | None,
+        page_size: int,
+    ) -> list[dict]:
+        rows: list[dict] = []
+        cursor = _format_open_time(start) if start is not None else None
+        upper = _format_open_time(end) if end is not None else None
+        while True:
+            page = self._query(build_query(cursor, upper))
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            last = _parse_timestamp(page[-1].get(cursor_field))
+            if last is None:
+                return rows
+            cursor = _format_open_time(last + timedelta(milliseconds=1))
+            if upper is not None and cursor > upper:
+                return rows
 
     def fetch_latest_ticker(self, pair: TradingPair) -> dict | None:
         rows = self._query(
             {
                 "table": "bingx_tickers",
-                "select": ["last_price", "volume_24h", "price_change_24h", "captured_at"],
+                "select": TICKER_COLUMNS,
                 "filters": [{"field": "pair", "op": "eq", "value": pair.value}],
                 "order": {"field": "captured_at", "direction": "desc"},
                 "limit": 1,
@@ -46,13 +293,24 @@ class BingxMarketDataLoader:
         return rows[0] if rows else None
 
     def load_market_snapshot(self, pair: TradingPair, interval: str, limit: int = 200) -> MarketSnapshot:
-        candles = self.fetch_candles(pair, interval, limit=limit)
-        ticker = self.fetch_latest_ticker(pair)
+        candles_future = self._executor.submit(self.fetch_candles, pair, interval, limit)
+        ticker_future = self._executor.submit(self.fetch_latest_ticker, pair)
+        candles = candles_future.result()
+        ticker = ticker_future.result()
         last_price = ticker.get("last_price") if ticker else None
-        return build_market_snapshot(pair, candles, last_price=last_price)
+        return build_market_snapshot(pair, candles, last_price=last_price, ticker=ticker)
 
     def _query(self, payload: dict) -> list[dict]:
-        response = self._client.query("data:query", payload)
+        attempt = 0
+        while True:
+            try:
+                response = self._client.query("data:query", payload)
+                break
+            except Exception:
+                if attempt >= self._max_retries:
+                    raise
+                self._sleep(self._backoff_seconds * (2**attempt))
+                attempt += 1
         if isinstance(response, dict):
             rows = response.get("data")
             if isinstance(rows, list):
@@ -60,6 +318,95 @@ class BingxMarketDataLoader:
         return []
 
 
+def interval_to_seconds(interval: str) -> int | None:
+    interval = interval.strip()
+    if len(interval) < 2 or not interval[:-1].isdigit():
+        return None
+    amount = int(interval[:-1])
+    unit_seconds = _INTERVAL_UNIT_SECONDS.get(interval[-1])
+    if amount <= 0 or unit_seconds is None:
+        return None
+    return amount * unit_seconds
+
+
+def _candle_query(
+    pair: TradingPair,
+    interval: str,
+    limit: int,
+    lower: str | None = None,
+    upper: str | None = None,
+    direction: str = "asc",
+) -> dict:
+    filters = [
+        {"field": "pair", "op": "eq", "value": pair.value},
+        {"field": "interval", "op": "eq", "value": interval},
+    ]
+    if lower is not None:
+        filters.append({"field": "open_time", "op": "gte", "value": lower})
+    if upper is not None:
+        filters.append({"field": "open_time", "op": "lte", "value": upper})
+    return {
+        "table": "bingx_candles",
+        "select": CANDLE_COLUMNS,
+        "filters": filters,
+        "order": {"field": "open_time", "direction": direction},
+        "limit": limit,
+    }
+
+
+def _ticker_query(pair: TradingPair, limit: int, lower: str | None = None, upper: str | None = None) -> dict:
+    filters: list[dict] = [{"field": "pair", "op": "eq", "value": pair.value}]
+    if lower is not None:
+        filters.append({"field": "captured_at", "op": "gte", "value": lower})
+    if upper is not None:
+        filters.append({"field": "captured_at", "op": "lte", "value": upper})
+    return {
+        "table": "bingx_tickers",
+        "select": TICKER_COLUMNS,
+        "filters": filters,
+        "order": {"field": "captured_at", "direction": "asc"},
+        "limit": limit,
+    }
+
+
+def _split_range(start: datetime, end: datetime, span: timedelta) -> list[tuple[datetime, datetime]]:
+    spans: list[tuple[datetime, datetime]] = []
+    cursor = start
+    while True:
+        span_end = min(end, cursor + span)
+        spans.append((cursor, span_end))
+        if span_end >= end:
+            return spans
+        cursor = span_end + timedelta(milliseconds=1)
+
+
+def _dedupe_rows(pages: Iterable[list[dict]], key: str) -> list[dict]:
+    rows: dict[str, dict] = {}
+    for page in pages:
+        for row in page:
+            rows.setdefault(str(row.get(key)), row)
+    return list(rows.values())
+
+
+def _check_range(start: datetime, end: datetime, page_size: int) -> tuple[datetime, datetime]:
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+    start, end = _as_utc(start), _as_utc(end)
+    if end < start:
+        raise ValueError("end must not be before start")
+    return start, end
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _format_open_time(value: datetime) -> str:
+    # Matches JavaScript toISOString(), which the ingest jobs use, so string comparison orders correctly.
+    value = _as_utc(value)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+
 def parse_candle_rows(rows: Iterable[dict]) -> list[MarketCandle]:
     candles: list[MarketCandle] = []
     for row in rows:
@@ -79,13 +426,89 @@ def parse_candle_rows(rows: Iterable[dict]) -> list[MarketCandle]:
     return candles
 
 
+def parse_candle_frame(rows: Iterable[dict]) -> BarFrame:
+    """
+    Columnar counterpart of parse_candle_rows: one pass over the rows, then timestamps are
+    converted per kind as whole arrays (epoch ms/s arithmetic, ISO strings via datetime64).
+    Rows without a parseable timestamp are dropped; row order is kept.
+    """
+    records = [
+        (
+            row.get("open_time") or row.get("timestamp"),
+            row.get("open") or 0,
+            row.get("high") or 0,
+            row.get("low") or 0,
+            row.get("close") or 0,
+            row.get("volume") or 0,
+        )
+        for row in rows
+    ]
+    if not records:
+        return BarFrame.empty()
+    raw_timestamps, *raw_values = zip(*records)
+    timestamps = _timestamps_to_nanos(raw_timestamps)
+    keep = timestamps != _NAT
+    values = [np.asarray(column, dtype=np.float64)[keep] for column in raw_values]
+    return BarFrame(timestamps[keep], *values)
+
+
+def _timestamps_to_nanos(values: tuple[object, ...]) -> np.ndarray:
+    """Epoch nanoseconds per value; invalid or missing timestamps become _NAT."""
+    result = np.full(len(values), _NAT, dtype=np.int64)
+    kinds = np.fromiter(
+        (
+            1 if isinstance(value, (int, float)) and not isinstance(value, bool) else 2 if isinstance(value, str) else 0
+            for value in values
+        ),
+        dtype=np.int8,
+        count=len(values),
+    )
+    numeric = np.flatnonzero(kinds == 1)
+    if numeric.size:
+        raw = np.asarray([values[position] for position in numeric], dtype=np.float64)
+        # Round to whole microseconds in float64 (exact for epoch values) before scaling in int64.
+        micros = np.round(np.where(raw > _EPOCH_MS_THRESHOLD, raw * 1_000, raw * 1_000_000))
+        finite = np.isfinite(micros)
+        result[numeric[finite]] = micros[finite].astype(np.int64) * 1_000
+    strings = np.flatnonzero(kinds == 2)
+    if strings.size:
+        result[strings] = _iso_to_nanos([values[position] for position in strings])
+    for position in np.flatnonzero(kinds == 0).tolist():
+        if isinstance(values[position], datetime):
+            result[position] = timestamp_to_nanos(values[position])
+    return result
+
+
+def _iso_to_nanos(values: list[str]) -> np.ndarray:
+    # datetime64 parses naive ISO strings in C; the UTC "Z" suffix is stripped first and any
+    # other offset falls back to the exact per-value parser.
+    naive = [value[:-1] if value.endswith("Z") else value for value in values]
+    if not any("+" in value[10:] or "-" in value[10:] for value in naive):
+        try:
+            # NaT (from empty strings) is int64 min, i.e. _NAT.
+            return np.array(naive, dtype="datetime64[ns]").astype(np.int64)
+        except ValueError:
+            pass
+    result = np.full(len(values), _NAT, dtype=np.int64)
+    for position, value in enumerate(values):
+        try:
+            result[position] = timestamp_to_nanos(value)
+        except ValueError:
+            continue
+    return result
+
+
 def build_market_snapshot(
     pair: TradingPair,
     candles: list[MarketCandle],
     last_price: float | None = None,
     spread: float | None = None,
+    ticker: dict | None = None,
+    extras: dict[str, float] | None = None,
 ) -> MarketSnapshot:
-    return MarketSnapshot(pair=pair, candles=candles, last_price=last_price, spread=spread)
+    return MarketSnapshot(
+        pair=pair, candles=candles, last_price=last_price, spread=spread, ticker=ticker, extras=extras or {}
+    )
 
 
 def _parse_timestamp(value: object) -> datetime | None:
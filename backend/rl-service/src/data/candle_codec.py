@@ -0,0 +1,216 @@
+"""
+Compact columnar codec for candle data. Integer columns (timestamps) are stored as delta-of-delta
+values, which are zero for a regular bar series; float columns that are exact decimals at some
+precision (prices, sizes) are stored as deltas of integers scaled by 10**precision. Each encoded
+column is packed into the narrowest integer width that holds it and compressed with zstd through
+pyarrow's codec when pyarrow is installed, zlib otherwise. Decoding is a decompress, np.frombuffer and one or two
+np.cumsum calls per column.
+
+Layout: MAGIC, little-endian uint32 header length, JSON header, then the compressed column blobs.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except Exception:  # pragma: no cover - optional dependency guard
+    pa = None
+
+MAGIC = b"RLC1"
+CODEC_SUFFIX = ".rlc"
+MAX_PRECISION = 12
+# Scaled prices must stay exactly representable as float64 integers.
+_MAX_SCALED = 2**53
+_WIDTHS = (np.int8, np.int16, np.int32, np.int64)
+_HEADER_LENGTH = struct.Struct("<I")
+COMPRESSORS = ("zstd", "zlib")
+ZSTD_LEVEL = 9
+
+
+def _zstd_available() -> bool:
+    return pa is not None and pa.Codec.is_available("zstd")
+
+
+def default_compressor() -> str:
+    return "zstd" if _zstd_available() else "zlib"
+
+
+def _compress(data: bytes, compressor: str) -> bytes:
+    if compressor == "zstd":
+        if not _zstd_available():
+            raise RuntimeError("pyarrow with zstd support is required for zstd-compressed candle files")
+        return pa.Codec("zstd", compression_level=ZSTD_LEVEL).compress(data, asbytes=True)
+    if compressor == "zlib":
+        return zlib.compress(data, 6)
+    raise ValueError(f"Unsupported compressor: {compressor}")
+
+
+def _decompress(data: memoryview, compressor: str, size: int) -> memoryview | bytes:
+    if compressor == "zstd":
+        if not _zstd_available():
+            raise RuntimeError("pyarrow with zstd support is required for zstd-compressed candle files")
+        return memoryview(pa.Codec("zstd").decompress(data, decompressed_size=size))
+    if compressor == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unsupported compressor: {compressor}")
+
+
+def _narrow(values: np.ndarray) -> np.ndarray:
+    if values.size == 0:
+        return values.astype(np.int8)
+    low, high = int(values.min()), int(values.max())
+    for dtype in _WIDTHS:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+
+def detect_precision(values: np.ndarray, max_precision: int = MAX_PRECISION) -> int | None:
+    """Smallest number of decimals at which every value round-trips exactly; None if there is none."""
+    if values.size and not np.all(np.isfinite(values)):
+        return None
+    for precision in range(max_precision + 1):
+        if _scale(values, precision) is not None:
+            return precision
+    return None
+
+
+def _scale(values: np.ndarray, precision: int) -> np.ndarray | None:
+    factor = 10.0**precision
+    scaled = np.round(values * factor)
+    if scaled.size and np.abs(scaled).max() >= _MAX_SCALED:
+        return None
+    # Decoding divides by the same factor, so this check is the exact decode.
+    if not np.array_equal(scaled / factor, values):
+        return None
+    return scaled.astype(np.int64)
+
+
+def _delta(values: np.ndarray) -> tuple[int, np.ndarray]:
+    """(first value, successive differences with a leading zero); the first value goes in the header."""
+    if not values.size:
+        return 0, values
+    first = int(values[0])
+    return first, np.diff(values, prepend=np.int64(first))
+
+
+def _encode_column(values: np.ndarray, precision: int | None) -> tuple[dict, np.ndarray]:
+    if values.dtype.kind in "iu":
+        first, steps = _delta(values.astype(np.int64))
+        step, dod = _delta(steps[1:])
+        return {"encoding": "dod", "first": first, "step": step}, _narrow(dod)
+    floats = values.astype(np.float64)
+    if precision is None:
+        precision = detect_precision(floats)
+    scaled = _scale(floats, precision) if precision is not None and np.all(np.isfinite(floats)) else None
+    if scaled is None:
+        return {"encoding": "float"}, floats
+    first, steps = _delta(scaled)
+    return {"encoding": "scaled", "precision": precision, "first": first}, _narrow(steps)
+
+
+def encode_columns(
+    columns: dict[str, np.ndarray],
+    precisions: dict[str, int] | None = None,
+    compressor: str | None = None,
+) -> bytes:
+    """Encode equal-length 1-D numeric columns; `precisions` pins decimals per column (e.g. instrument tick)."""
+    compressor = compressor or default_compressor()
+    if compressor not in COMPRESSORS:
+        raise ValueError(f"Unsupported compressor: {compressor}")
+    precisions = precisions or {}
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("columns must have equal length")
+    header: dict = {"rows": lengths.pop() if lengths else 0, "compressor": compressor, "columns": []}
+    blobs = []
+    offset = 0
+    for name, values in columns.items():
+        values = np.asarray(values)
+        if values.ndim != 1 or values.dtype.kind not in "iuf":
+            raise ValueError(f"column {name!r} must be a 1-D numeric array")
+        meta, packed = _encode_column(values, precisions.get(name))
+        blob = _compress(packed.tobytes(), compressor)
+        header["columns"].append(
+            {
+                "name": name,
+                "dtype": packed.dtype.name,
+                "offset": offset,
+                "size": len(blob),
+                "raw_size": packed.nbytes,
+                **meta,
+            }
+        )
+        blobs.append(blob)
+        offset += len(blob)
+    encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return b"".join((MAGIC, _HEADER_LENGTH.pack(len(encoded_header)), encoded_header, *blobs))
+
+
+def read_header(data: bytes | memoryview) -> tuple[dict, int]:
+    """(header, offset of the first column blob)."""
+    if bytes(data[: len(MAGIC)]) != MAGIC:
+        raise ValueError("not an encoded candle file")
+    start = len(MAGIC) + _HEADER_LENGTH.size
+    (length,) = _HEADER_LENGTH.unpack_from(data, len(MAGIC))
+    return json.loads(bytes(data[start : start + length])), start + length
+
+
+def decode_columns(data: bytes | memoryview, columns: Iterable[str] | None = None) -> dict[str, np.ndarray]:
+    """Decode all columns, or only `columns`, into int64/float64 arrays in file order."""
+    header, base = read_header(data)
+    entries = {entry["name"]: entry for entry in header["columns"]}
+    names = list(entries) if columns is None else list(columns)
+    missing = [name for name in names if name not in entries]
+    if missing:
+        raise ValueError(f"encoded candle file has no columns {missing}")
+    view = memoryview(data)
+    decoded = {}
+    for name in names:
+        entry = entries[name]
+        start = base + entry["offset"]
+        raw = _decompress(view[start : start + entry["size"]], header["compressor"], entry["raw_size"])
+        values = np.frombuffer(raw, dtype=entry["dtype"])
+        if entry["encoding"] == "dod":
+            steps = np.empty(header["rows"], dtype=np.int64)
+            if steps.size:
+                steps[0] = entry["first"]
+                np.cumsum(values, dtype=np.int64, out=steps[1:])
+                steps[1:] += entry["step"]
+            decoded[name] = np.cumsum(steps, dtype=np.int64)
+        elif entry["encoding"] == "scaled":
+            scaled = np.cumsum(values, dtype=np.int64)
+            scaled += entry["first"]
+            decoded[name] = scaled / (10.0 ** entry["precision"])
+        else:
+            decoded[name] = values.copy()
+    return decoded
+
+
+def write_encoded(
+    path: str | Path,
+    columns: dict[str, np.ndarray],
+    precisions: dict[str, int] | None = None,
+    compressor: str | None = None,
+) -> Path:
+    """Encode columns to `path` via a staging file and os.replace, so readers never see partial files."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.tmp")
+    staging.write_bytes(encode_columns(columns, precisions=precisions, compressor=compressor))
+    os.replace(staging, path)
+    return path
+
+
+def read_encoded(path: str | Path, columns: Iterable[str] | None = None) -> dict[str, np.ndarray]:
+    return decode_columns(Path(path).read_bytes(), columns)
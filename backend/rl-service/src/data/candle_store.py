@@ -0,0 +1,161 @@
+"""
+Local SQLite candle cache for the market data loader, keyed by (pair, interval, open_time).
+Bars are stored as epoch milliseconds so the newest and oldest cached bars (the sync water marks)
+are index lookups, and revised bars are replaced in place by upserting on the primary key.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from data.bar_frame import BarFrame
+from schemas import MarketCandle
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    pair TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    open_time_ms INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL NOT NULL,
+    PRIMARY KEY (pair, interval, open_time_ms)
+) WITHOUT ROWID
+"""
+
+
+def _to_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * 1_000 + delta.microseconds // 1_000
+
+
+def _from_ms(value: int) -> datetime:
+    seconds, millis = divmod(int(value), 1_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=millis * 1_000)
+
+
+class CandleStore:
+    """Thread-safe SQLite candle cache; use ":memory:" for a process-local cache."""
+
+    def __init__(self, path: str | Path) -> None:
+        path = str(path)
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def high_water_mark(self, pair: str, interval: str) -> datetime | None:
+        """Open time of the newest cached bar, or None for a cold cache."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MAX(open_time_ms) FROM candles WHERE pair = ? AND interval = ?", (pair, interval)
+            ).fetchone()
+        return _from_ms(row[0]) if row and row[0] is not None else None
+
+    def low_water_mark(self, pair: str, interval: str) -> datetime | None:
+        """Open time of the oldest cached bar, or None for a cold cache."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MIN(open_time_ms) FROM candles WHERE pair = ? AND interval = ?", (pair, interval)
+            ).fetchone()
+        return _from_ms(row[0]) if row and row[0] is not None else None
+
+    def count(self, pair: str, interval: str) -> int:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM candles WHERE pair = ? AND interval = ?", (pair, interval)
+            ).fetchone()
+        return int(row[0])
+
+    def upsert(self, pair: str, interval: str, candles: Iterable[MarketCandle]) -> int:
+        """Insert candles, replacing any cached bar with the same open time. Returns rows written."""
+        rows = [
+            (pair, interval, _to_ms(candle.timestamp), candle.open, candle.high, candle.low, candle.close, candle.volume)
+            for candle in candles
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def read(
+        self,
+        pair: str,
+        interval: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+        newest: bool = False,
+    ) -> list[MarketCandle]:
+        """
+        Cached candles with start <= open_time <= end, oldest first. `limit` keeps the oldest bars,
+        or the newest ones with newest=True.
+        """
+        return [
+            MarketCandle.model_construct(
+                timestamp=_from_ms(open_time), open=open_, high=high, low=low, close=close, volume=volume
+            )
+            for open_time, open_, high, low, close, volume in self._select(pair, interval, start, end, limit, newest)
+        ]
+
+    def read_frame(
+        self,
+        pair: str,
+        interval: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+    ) -> BarFrame:
+        rows = self._select(pair, interval, start, end, limit)
+        if not rows:
+            return BarFrame.empty()
+        table = np.array(rows, dtype=np.float64)
+        # Timestamps come from the raw ints, not the float64 table, to keep the int64 scaling exact.
+        timestamps = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)) * 1_000_000
+        return BarFrame(timestamps, *(np.ascontiguousarray(table[:, column]) for column in range(1, 6)))
+
+    def _select(
+        self,
+        pair: str,
+        interval: str,
+        start: datetime | None,
+        end: datetime | None,
+        limit: int | None,
+        newest: bool = False,
+    ) -> list[tuple]:
+        query = "SELECT open_time_ms, open, high, low, close, volume FROM candles WHERE pair = ? AND interval = ?"
+        params: list[object] = [pair, interval]
+        if start is not None:
+            query += " AND open_time_ms >= ?"
+            params.append(_to_ms(start))
+        if end is not None:
+            query += " AND open_time_ms <= ?"
+            params.append(_to_ms(end))
+        if limit is not None and newest:
+            query = f"SELECT * FROM ({query} ORDER BY open_time_ms DESC LIMIT ?) ORDER BY open_time_ms ASC"
+            params.append(int(limit))
+        else:
+            query += " ORDER BY open_time_ms ASC"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(int(limit))
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
@@ -2,10 +2,163 @@ from __future__ import annotations
 
 import hashlib
 import json
+from collections.abc import Sequence
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, Iterator, overload
 from uuid import uuid4
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from data.quality import repair_candles, validate_candles
+from data.timestamp_index import TimestampIndex
+
+# Dataset hash modes: Merkle root over fixed-size row chunks, or the legacy per-window JSON digest
+DATASET_HASH_MERKLE = "merkle"
+DATASET_HASH_LEGACY = "legacy"
+DATASET_HASH_MODES = (DATASET_HASH_MERKLE, DATASET_HASH_LEGACY)
+DEFAULT_HASH_CHUNK_ROWS = 1024
+MERKLE_HASH_SCHEME = "merkle-sha256-v1"
+
+
+class WindowedDataset(Sequence):
+    """
+    Lazy windows over one contiguous list of rows. A window is only an index range until it
+    is accessed, so memory stays O(N) instead of O(N * window_size) list slots.
+    Numeric columns are copied once into float64 arrays on demand and exposed per window as
+    strided views.
+    """
+
+    def __init__(
+        self,
+        rows: list[dict],
+        window_size: int,
+        stride: int = 1,
+        timestamp_index: TimestampIndex | None = None,
+    ) -> None:
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+        if stride <= 0:
+            raise ValueError("stride must be positive")
+        self._rows = rows
+        self._window_size = window_size
+        self._stride = stride
+        self._count = (len(rows) - window_size) // stride + 1 if len(rows) >= window_size else 0
+        self._columns: dict[str, np.ndarray] = {}
+        if timestamp_index is not None and len(timestamp_index) != len(rows):
+            raise ValueError("timestamp_index must have one entry per row")
+        self._timestamp_index = timestamp_index
+
+    @property
+    def rows(self) -> list[dict]:
+        return self._rows
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    @property
+    def stride(self) -> int:
+        return self._stride
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> list[dict]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[list[dict]]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(self._count))]
+        start, end = self.window_bounds(index)
+        return self._rows[start:end]
+
+    def __iter__(self) -> Iterator[list[dict]]:
+        for index in range(self._count):
+            yield self[index]
+
+    def window_bounds(self, index: int) -> tuple[int, int]:
+        if index < 0:
+            index += self._count
+        if index < 0 or index >= self._count:
+            raise IndexError("window index out of range")
+        start = index * self._stride
+        return start, start + self._window_size
+
+    def window_starts(self) -> np.ndarray:
+        return np.arange(self._count, dtype=np.int64) * self._stride
+
+    def column(self, name: str) -> np.ndarray:
+        values = self._columns.get(name)
+        if values is None:
+            values = np.array([_to_float(row.get(name)) for row in self._rows], dtype=np.float64)
+            self._columns[name] = values
+        return values
+
+    def window_view(self, name: str) -> np.ndarray:
+        """Read-only (windows, window_size) strided view over one numeric column."""
+        if self._count == 0:
+            return np.empty((0, self._window_size), dtype=np.float64)
+        return sliding_window_view(self.column(name), self._window_size)[:: self._stride]
+
+    @property
+    def timestamp_index(self) -> TimestampIndex:
+        """Sorted nanosecond index over the rows, parsed on first use. Rows must be chronological."""
+        if self._timestamp_index is None:
+            self._timestamp_index = TimestampIndex.from_rows(self._rows)
+        return self._timestamp_index
+
+    def slice_period(
+        self, start: object | None = None, end: object | None = None, warmup: int = 0
+    ) -> WindowedDataset:
+        """
+        Rows with start <= timestamp <= end plus up to ``warmup`` rows before start, windowed the
+        same way; self when nothing is cut.
+        """
+        bounds = self.timestamp_index.slice_between(start, end, warmup)
+        if bounds.start == 0 and bounds.stop == len(self._rows):
+            return self
+        return WindowedDataset(
+            self._rows[bounds], self._window_size, self._stride, timestamp_index=self.timestamp_index[bounds]
+        )
+
+    def with_windows(self, window_size: int, stride: int = 1) -> WindowedDataset:
+        if window_size == self._window_size and stride == self._stride:
+            return self
+        return WindowedDataset(self._rows, window_size, stride, timestamp_index=self._timestamp_index)
+
+
+def period_warmup_rows(window_size: int, history_length: int = 1) -> int:
+    """Rows kept before a period start so its first bars get a full window and observation history."""
+    return max(0, int(window_size) + int(history_length) - 1)
+
+
+def select_period(
+    features: list[dict] | WindowedDataset,
+    start: object | None = None,
+    end: object | None = None,
+    warmup: int = 0,
+) -> WindowedDataset:
+    """
+    Rows with start <= timestamp <= end, preceded by up to ``warmup`` earlier rows (see
+    ``period_warmup_rows``), as a single-row-window dataset carrying its timestamp index;
+    re-window it with ``with_windows``. Unsorted row lists are stable-sorted first.
+    """
+    if not isinstance(features, WindowedDataset):
+        rows, index = TimestampIndex.sort_rows(features)
+        features = WindowedDataset(rows, 1, timestamp_index=index)
+    return features.slice_period(start, end, warmup)
+
+
+def _to_float(value: object) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
 
 def build_feature_windows(features: list[dict], window_size: int, stride: int = 1) -> list[list[dict]]:
     if window_size <= 0:
@@ -26,23 +179,172 @@ def _serialize_payload(payload: object) -> str:
     return json.dumps(payload, sort_keys=True, default=str)
 
 
-def compute_dataset_checksum(windows: list[list[dict]], metadata: dict) -> str:
+def compute_dataset_checksum(windows: Iterable[list[dict]], metadata: dict) -> str:
     digest = hashlib.sha256()
     digest.update(_serialize_payload(metadata).encode())
-    digest.update(_serialize_payload(windows).encode())
+    # Stream the JSON array window by window; bytes match json.dumps(list(windows)).
+    digest.update(b"[")
+    for index, window in enumerate(windows):
+        if index:
+            digest.update(b", ")
+        digest.update(_serialize_payload(window).encode())
+    digest.update(b"]")
     return digest.hexdigest()
 
 
+def _chunk_digest(serialized_rows: Iterable[bytes]) -> bytes:
+    digest = hashlib.sha256(b"\x00")
+    for row in serialized_rows:
+        digest.update(row)
+        digest.update(b"\n")
+    return digest.digest()
+
+
+def merkle_root(leaves: list[bytes]) -> bytes:
+    """Binary Merkle root; an odd node at any level is promoted unchanged."""
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    level = list(leaves)
+    while len(level) > 1:
+        paired = [hashlib.sha256(b"\x01" + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+class IncrementalDatasetHasher:
+    """
+    Content hash over dataset rows. Each row is serialized once; rows are grouped into
+    fixed-size chunks whose digests form the leaves of a Merkle tree. Appending bars only
+    re-hashes the open tail chunk, and ranges sharing a chunk-aligned prefix share digests.
+    """
+
+    def __init__(
+        self,
+        chunk_rows: int = DEFAULT_HASH_CHUNK_ROWS,
+        chunk_digests: list[str] | None = None,
+        tail_rows: list[dict] | None = None,
+        tail_serialized: list[str] | None = None,
+    ) -> None:
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        self._chunk_rows = chunk_rows
+        self._sealed: list[bytes] = [bytes.fromhex(value) for value in chunk_digests or []]
+        self._tail: list[bytes] = []
+        if tail_serialized:
+            if len(tail_serialized) >= chunk_rows:
+                raise ValueError("tail_serialized must be shorter than one chunk")
+            self._tail = [row.encode() for row in tail_serialized]
+        if tail_rows:
+            self.append(tail_rows)
+
+    @property
+    def chunk_rows(self) -> int:
+        return self._chunk_rows
+
+    @property
+    def row_count(self) -> int:
+        return len(self._sealed) * self._chunk_rows + len(self._tail)
+
+    def sealed_chunk_digests(self) -> list[str]:
+        """Hex digests of the full chunks; together with the tail rows they restore the hasher."""
+        return [leaf.hex() for leaf in self._sealed]
+
+    def tail_serialized(self) -> list[str]:
+        """The open chunk's rows exactly as hashed, so a restored hasher needs no row conversion."""
+        return [row.decode() for row in self._tail]
+
+    def append(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self._tail.append(_serialize_payload(row).encode())
+            if len(self._tail) == self._chunk_rows:
+                self._sealed.append(_chunk_digest(self._tail))
+                self._tail = []
+
+    def copy(self) -> IncrementalDatasetHasher:
+        clone = IncrementalDatasetHasher(self._chunk_rows)
+        clone._sealed = list(self._sealed)
+        clone._tail = list(self._tail)
+        return clone
+
+    def root(self) -> str:
+        return merkle_root(self._leaves()).hex()
+
+    def dataset_hash(self, metadata: dict, window_size: int, stride: int) -> str:
+        digest = hashlib.sha256()
+        digest.update(_serialize_payload(metadata).encode())
+        digest.update(
+            _serialize_payload(
+                {
+                    "scheme": MERKLE_HASH_SCHEME,
+                    "chunk_rows": self._chunk_rows,
+                    "row_count": self.row_count,
+                    "root": self.root(),
+                    "window_size": window_size,
+                    "stride": stride,
+                }
+            ).encode()
+        )
+        return digest.hexdigest()
+
+    def _leaves(self) -> list[bytes]:
+        if self._tail:
+            return [*self._sealed, _chunk_digest(self._tail)]
+        return list(self._sealed)
+
+
+def compute_dataset_hash(
+    windows: WindowedDataset,
+    metadata: dict,
+    hash_mode: str = DATASET_HASH_MERKLE,
+    chunk_rows: int = DEFAULT_HASH_CHUNK_ROWS,
+    hasher: IncrementalDatasetHasher | None = None,
+) -> str:
+    """
+    ``hasher`` may carry the chunk digests of ``windows.rows`` (e.g. restored from the dataset
+    cache); it is used as-is when it covers exactly the windowed rows, so no row is re-serialized.
+    """
+    if hash_mode == DATASET_HASH_LEGACY:
+        return compute_dataset_checksum(windows, metadata)
+    if hash_mode != DATASET_HASH_MERKLE:
+        raise ValueError(f"hash_mode must be one of {DATASET_HASH_MODES}, got {hash_mode!r}")
+    # Only rows covered by at least one window contribute, matching the legacy payload.
+    covered = windows.window_bounds(len(windows) - 1)[1] if len(windows) else 0
+    if hasher is None or hasher.chunk_rows != chunk_rows or hasher.row_count != covered:
+        hasher = IncrementalDatasetHasher(chunk_rows)
+        hasher.append(windows.rows[:covered])
+    return hasher.dataset_hash(metadata, windows.window_size, windows.stride)
+
+
 def build_dataset(
-    features: list[dict],
+    features: list[dict] | WindowedDataset,
     window_size: int,
     stride: int = 1,
     metadata: dict | None = None,
+    hash_mode: str = DATASET_HASH_MERKLE,
+    quality_check: bool = False,
+    quality_repairs: Iterable[str] | None = None,
+    hasher: IncrementalDatasetHasher | None = None,
 ) -> dict:
-    windows = build_feature_windows(features, window_size, stride)
+    quality = None
+    if quality_check:
+        rows = features.rows if isinstance(features, WindowedDataset) else features
+        report = validate_candles(rows)
+        quality = report.summary()
+        if quality_repairs:
+            features = repair_candles(rows, report, quality_repairs)
+            # Repaired rows no longer match the digests the caller passed in.
+            hasher = None
+            quality["repairs"] = list(quality_repairs)
+            quality["repaired_row_count"] = len(features)
+    if isinstance(features, WindowedDataset):
+        windows = features.with_windows(window_size, stride)
+    else:
+        windows = WindowedDataset(features, window_size, stride)
     dataset_version = None
     if metadata:
-        dataset_hash = compute_dataset_checksum(windows, metadata)
+        dataset_hash = compute_dataset_hash(windows, metadata, hash_mode=hash_mode, hasher=hasher)
         dataset_version = {
             "id": str(uuid4()),
             "pair": metadata.get("pair"),
@@ -55,6 +357,7 @@ def build_dataset(
             "feature_schema_fingerprint": metadata.get("feature_schema_fingerprint"),
             "window_size": window_size,
             "stride": stride,
+            "hash_mode": hash_mode,
             "created_at": datetime.now(timezone.utc),
         }
     return {
@@ -62,4 +365,5 @@ def build_dataset(
         "stride": stride,
         "windows": windows,
         "dataset_version": dataset_version,
+        "quality": quality,
     }
@@ -0,0 +1,290 @@
+"""
+Local content-addressed dataset cache. Rows are stored once per dataset_ref as one .npy file
+per column so repeated training/evaluation runs can load them with np.load(mmap_mode="r")
+instead of re-uploading and re-parsing JSON. With codec="delta" the numeric columns are instead
+packed together into one candle_codec file (delta-of-delta ints, scaled-integer price deltas),
+trading memory mapping for a several-fold smaller footprint; either layout reads back the same.
+The manifest also keeps the Merkle chunk digests behind the dataset_ref and the open tail chunk's
+serialized rows, so appending bars to a cached dataset only hashes the new rows and hashing it for a
+dataset version hashes nothing again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from config import load_config
+from data.candle_codec import CODEC_SUFFIX, read_encoded, write_encoded
+from data.dataset_builder import MERKLE_HASH_SCHEME, IncrementalDatasetHasher
+
+MANIFEST_FILE = "manifest.json"
+# Column kinds stored on disk. Numbers mixing ints and floats are stored as float with a mask of the
+# int positions; strings are fixed-width text; anything else (mixed types, nested values, ints outside
+# int64 or float64's exact range) is stored as one JSON document per value, so rows read back as given.
+COLUMN_KINDS = ("bool", "int", "float", "str", "json")
+# Presence codes for columns with gaps: key missing, explicit null, value present
+_MISSING, _NULL, _PRESENT = 0, 1, 2
+DEFAULT_LOADED_DATASETS = 4
+CACHE_CODECS = ("npy", "delta")
+ENCODED_COLUMNS_FILE = f"columns{CODEC_SUFFIX}"
+
+_DATASET_REF_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def compute_dataset_ref(rows: list[dict]) -> str:
+    hasher = IncrementalDatasetHasher()
+    hasher.append(rows)
+    return hasher.root()
+
+
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+# Ints stored in a float column must convert back exactly
+_FLOAT_EXACT_INT = 2**53
+
+
+def _is_int(value: object) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _column_kind(values: list[object]) -> str:
+    present = [value for value in values if value is not None]
+    if not present:
+        return "str"
+    if all(isinstance(value, bool) for value in present):
+        return "bool"
+    if all(_is_int(value) for value in present):
+        return "int" if all(_INT64_MIN <= value <= _INT64_MAX for value in present) else "json"
+    if all(_is_int(value) or isinstance(value, float) for value in present):
+        exact = all(abs(value) <= _FLOAT_EXACT_INT for value in present if _is_int(value))
+        return "float" if exact else "json"
+    if all(isinstance(value, str) for value in present):
+        return "str"
+    return "json"
+
+
+def _column_array(values: list[object], kind: str) -> np.ndarray:
+    if kind == "bool":
+        return np.array([bool(value) if value is not None else False for value in values], dtype=np.bool_)
+    if kind == "int":
+        return np.array([value if value is not None else 0 for value in values], dtype=np.int64)
+    if kind == "float":
+        return np.array([value if value is not None else np.nan for value in values], dtype=np.float64)
+    if kind == "json":
+        return np.array(["" if value is None else json.dumps(value) for value in values], dtype=np.str_)
+    return np.array(["" if value is None else value for value in values], dtype=np.str_)
+
+
+def _column_values(array: np.ndarray, entry: dict, directory: Path) -> list[object]:
+    values = array.tolist()
+    if entry["kind"] == "json":
+        return [json.loads(value) if value else None for value in values]
+    if entry.get("ints"):
+        ints = np.load(directory / entry["ints"], mmap_mode="r")
+        for position in np.flatnonzero(ints).tolist():
+            values[position] = int(values[position])
+    return values
+
+
+class DatasetCache:
+    def __init__(self, root: str | Path, max_loaded: int = DEFAULT_LOADED_DATASETS, codec: str = "npy") -> None:
+        if codec not in CACHE_CODECS:
+            raise ValueError(f"Unsupported dataset cache codec: {codec}")
+        self._root = Path(root).resolve()
+        self._max_loaded = max(0, int(max_loaded))
+        self._codec = codec
+        self._loaded: OrderedDict[str, list[dict]] = OrderedDict()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _dataset_dir(self, dataset_ref: str) -> Path:
+        if not _DATASET_REF_PATTERN.match(dataset_ref):
+            raise ValueError(f"Invalid dataset_ref: {dataset_ref!r}")
+        return self._root / dataset_ref[:2] / dataset_ref
+
+    def contains(self, dataset_ref: str) -> bool:
+        return (self._dataset_dir(dataset_ref) / MANIFEST_FILE).is_file()
+
+    def put(self, rows: list[dict], base_ref: str | None = None) -> dict:
+        """
+        Store rows under their content hash and return the manifest. Existing entries are reused.
+        With ``base_ref`` the rows are appended to that cached dataset; its stored chunk digests
+        are resumed, so only its tail chunk and the new rows are hashed.
+        """
+        if not rows:
+            raise ValueError("rows must not be empty")
+        if base_ref is not None:
+            base_rows, hasher = self.load(base_ref)
+            rows = [*base_rows, *rows]
+        else:
+            hasher = IncrementalDatasetHasher()
+        hasher.append(rows[hasher.row_count :])
+        dataset_ref = hasher.root()
+        target = self._dataset_dir(dataset_ref)
+        if (target / MANIFEST_FILE).is_file():
+            return self.manifest(dataset_ref)
+
+        names: dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=target.parent))
+        try:
+            columns = []
+            encoded: dict[str, np.ndarray] = {}
+            for index, name in enumerate(names):
+                values = [row.get(name) for row in rows]
+                kind = _column_kind(values)
+                entry = {"name": name, "kind": kind, "file": f"c{index}.npy", "presence": None, "ints": None}
+                array = _column_array(values, kind)
+                if kind == "float":
+                    ints = np.array([_is_int(value) for value in values], dtype=np.bool_)
+                    if ints.any():
+                        entry["ints"] = f"c{index}.ints.npy"
+                        np.save(staging / entry["ints"], ints)
+                if self._codec == "delta" and kind in ("int", "float"):
+                    entry["file"] = ENCODED_COLUMNS_FILE
+                    encoded[name] = array
+                else:
+                    np.save(staging / entry["file"], array)
+                presence = np.array(
+                    [_PRESENT if row.get(name) is not None else (_NULL if name in row else _MISSING) for row in rows],
+                    dtype=np.uint8,
+                )
+                if not np.all(presence == _PRESENT):
+                    entry["presence"] = f"c{index}.presence.npy"
+                    np.save(staging / entry["presence"], presence)
+                columns.append(entry)
+            if encoded:
+                write_encoded(staging / ENCODED_COLUMNS_FILE, encoded)
+            manifest = {
+                "dataset_ref": dataset_ref,
+                "row_count": len(rows),
+                "columns": columns,
+                "hash": {
+                    "scheme": MERKLE_HASH_SCHEME,
+                    "chunk_rows": hasher.chunk_rows,
+                    "chunks": hasher.sealed_chunk_digests(),
+                    "tail": hasher.tail_serialized(),
+                },
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            (staging / MANIFEST_FILE).write_text(json.dumps(manifest, sort_keys=True))
+            try:
+                os.replace(staging, target)
+            except OSError:
+                # Another writer published the same content first.
+                if not (target / MANIFEST_FILE).is_file():
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return self.manifest(dataset_ref)
+
+    def manifest(self, dataset_ref: str) -> dict:
+        path = self._dataset_dir(dataset_ref) / MANIFEST_FILE
+        if not path.is_file():
+            raise KeyError(f"Dataset {dataset_ref} is not cached")
+        return json.loads(path.read_text())
+
+    def hasher(self, dataset_ref: str, rows: list[dict] | None = None) -> IncrementalDatasetHasher:
+        """
+        Merkle hasher over the cached rows, restored from the stored chunk digests and tail rows.
+        ``rows`` may pass the already loaded rows for the fallback on older entries.
+        """
+        state = self.manifest(dataset_ref).get("hash")
+        if state and state.get("scheme") == MERKLE_HASH_SCHEME and "tail" in state:
+            return IncrementalDatasetHasher(
+                state["chunk_rows"], chunk_digests=state["chunks"], tail_serialized=state["tail"]
+            )
+        # Entries written before the digests and tail were stored: hash the rows as they read back.
+        hasher = IncrementalDatasetHasher()
+        hasher.append(rows if rows is not None else self.load_rows(dataset_ref))
+        return hasher
+
+    def load(self, dataset_ref: str) -> tuple[list[dict], IncrementalDatasetHasher]:
+        """The cached rows and their hasher, decoding the dataset once."""
+        rows = self.load_rows(dataset_ref)
+        return rows, self.hasher(dataset_ref, rows=rows)
+
+    def columns(self, dataset_ref: str) -> dict[str, np.ndarray]:
+        """Column arrays keyed by row field name; memory-mapped unless the column was delta-encoded."""
+        manifest = self.manifest(dataset_ref)
+        return _read_columns(self._dataset_dir(dataset_ref), manifest["columns"])
+
+    def load_rows(self, dataset_ref: str) -> list[dict]:
+        """Fresh row dicts on every call; callers may mutate them without touching the cached copy."""
+        cached = self._loaded.get(dataset_ref)
+        if cached is not None:
+            self._loaded.move_to_end(dataset_ref)
+            return [dict(row) for row in cached]
+
+        manifest = self.manifest(dataset_ref)
+        directory = self._dataset_dir(dataset_ref)
+        row_count = int(manifest["row_count"])
+        rows: list[dict] = [{} for _ in range(row_count)]
+        arrays = _read_columns(directory, manifest["columns"])
+        for entry in manifest["columns"]:
+            name = entry["name"]
+            values = _column_values(arrays[name], entry, directory)
+            if entry["presence"] is None:
+                for row, value in zip(rows, values):
+                    row[name] = value
+                continue
+            presence = np.load(directory / entry["presence"], mmap_mode="r").tolist()
+            for row, value, state in zip(rows, values, presence):
+                if state == _PRESENT:
+                    row[name] = value
+                elif state == _NULL:
+                    row[name] = None
+
+        if self._max_loaded:
+            self._loaded[dataset_ref] = rows
+            while len(self._loaded) > self._max_loaded:
+                self._loaded.popitem(last=False)
+            return [dict(row) for row in rows]
+        return rows
+
+
+def _read_columns(directory: Path, entries: list[dict]) -> dict[str, np.ndarray]:
+    encoded_names = [entry["name"] for entry in entries if entry["file"] == ENCODED_COLUMNS_FILE]
+    arrays = read_encoded(directory / ENCODED_COLUMNS_FILE, encoded_names) if encoded_names else {}
+    for entry in entries:
+        if entry["name"] not in arrays:
+            arrays[entry["name"]] = np.load(directory / entry["file"], mmap_mode="r")
+    return {entry["name"]: arrays[entry["name"]] for entry in entries}
+
+
+_caches: dict[str, DatasetCache] = {}
+
+
+def get_dataset_cache() -> DatasetCache:
+    config = load_config()
+    key = f"{config.dataset_cache_path}|{config.dataset_cache_codec}"
+    cache = _caches.get(key)
+    if cache is None:
+        cache = DatasetCache(config.dataset_cache_path, codec=config.dataset_cache_codec)
+        _caches[key] = cache
+    return cache
+
+
+def resolve_dataset(
+    dataset_features: list[dict] | None, dataset_ref: str | None
+) -> tuple[list[dict] | None, IncrementalDatasetHasher | None]:
+    """
+    Inline rows win and carry no hasher; otherwise the referenced dataset's rows and its cached
+    chunk digests, loaded from the local cache in one pass.
+    """
+    if dataset_features or not dataset_ref:
+        return dataset_features, None
+    return get_dataset_cache().load(dataset_ref)
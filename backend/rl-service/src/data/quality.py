@@ -0,0 +1,242 @@
+"""
+Vectorized data-quality checks for candle rows. Columns are extracted once, every check is a
+NumPy expression over the whole series, and results come back as per-row boolean masks.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from data.bar_frame import BarFrame
+from data.timestamp_index import NANOS_PER_SECOND, timestamp_to_nanos
+
+# Row-level checks: the row itself is unusable or out of place
+CHECK_INVALID_TIMESTAMP = "invalid_timestamp"
+CHECK_DUPLICATE_TIMESTAMP = "duplicate_timestamp"
+CHECK_NON_MONOTONIC = "non_monotonic"
+# Value-level checks: the timestamp is fine but the prices are not
+CHECK_MISSING_VALUE = "missing_value"
+CHECK_NON_POSITIVE_PRICE = "non_positive_price"
+CHECK_OHLC_INCONSISTENT = "ohlc_inconsistent"
+CHECK_NEGATIVE_VOLUME = "negative_volume"
+CHECK_OUTLIER_RETURN = "outlier_return"
+# Informational: bar follows a gap larger than the expected interval
+CHECK_GAP = "gap"
+
+STRUCTURAL_CHECKS = (CHECK_INVALID_TIMESTAMP, CHECK_DUPLICATE_TIMESTAMP, CHECK_NON_MONOTONIC)
+VALUE_CHECKS = (
+    CHECK_MISSING_VALUE,
+    CHECK_NON_POSITIVE_PRICE,
+    CHECK_OHLC_INCONSISTENT,
+    CHECK_NEGATIVE_VOLUME,
+    CHECK_OUTLIER_RETURN,
+)
+QUALITY_CHECKS = (*STRUCTURAL_CHECKS, *VALUE_CHECKS, CHECK_GAP)
+
+# Repairs: forward-fill bad prices from the last good close, drop remaining bad rows, add a gap column
+REPAIR_FORWARD_FILL = "forward_fill"
+REPAIR_DROP = "drop"
+REPAIR_FLAG_GAPS = "flag_gaps"
+QUALITY_REPAIRS = (REPAIR_FORWARD_FILL, REPAIR_DROP, REPAIR_FLAG_GAPS)
+GAP_FLAG_KEY = "quality_gap"
+
+# Robust z-score (|log return - median| / (1.4826 * MAD)) above which a return is an outlier
+DEFAULT_OUTLIER_ZSCORE = 12.0
+# Returns smaller than this are never outliers, so near-constant series do not flag every tick
+DEFAULT_MIN_OUTLIER_RETURN = 0.01
+
+_PRICE_KEYS = ("open", "high", "low", "close")
+
+
+@dataclass(frozen=True)
+class DataQualityReport:
+    row_count: int
+    masks: dict[str, np.ndarray]
+    expected_interval_ns: int | None
+    missing_bars: int
+
+    @property
+    def invalid_mask(self) -> np.ndarray:
+        """Rows failing any structural or value check (gaps are informational)."""
+        mask = np.zeros(self.row_count, dtype=bool)
+        for check in (*STRUCTURAL_CHECKS, *VALUE_CHECKS):
+            mask |= self.masks[check]
+        return mask
+
+    def issue_rows(self, limit: int | None = None) -> dict[str, list[int]]:
+        return {check: np.flatnonzero(mask)[:limit].tolist() for check, mask in self.masks.items() if mask.any()}
+
+    def summary(self) -> dict:
+        counts = {check: int(mask.sum()) for check, mask in self.masks.items()}
+        return {
+            "row_count": self.row_count,
+            "valid": not bool(self.invalid_mask.any()),
+            "invalid_rows": int(self.invalid_mask.sum()),
+            "issue_counts": counts,
+            "gap_count": counts[CHECK_GAP],
+            "missing_bars": self.missing_bars,
+            "expected_interval_seconds": (
+                self.expected_interval_ns / NANOS_PER_SECOND if self.expected_interval_ns is not None else None
+            ),
+        }
+
+
+def _float_column(rows: list[dict], key: str) -> np.ndarray:
+    values = np.empty(len(rows), dtype=np.float64)
+    for position, row in enumerate(rows):
+        try:
+            values[position] = float(row.get(key))
+        except (TypeError, ValueError):
+            values[position] = np.nan
+    return values
+
+
+def _timestamp_column(rows: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    values = np.zeros(len(rows), dtype=np.int64)
+    invalid = np.zeros(len(rows), dtype=bool)
+    for position, row in enumerate(rows):
+        try:
+            values[position] = timestamp_to_nanos(row.get("timestamp"))
+        except (TypeError, ValueError):
+            invalid[position] = True
+    return values, invalid
+
+
+def validate_candles(
+    rows: list[dict] | BarFrame,
+    expected_interval_seconds: int | None = None,
+    outlier_zscore: float = DEFAULT_OUTLIER_ZSCORE,
+    min_outlier_return: float = DEFAULT_MIN_OUTLIER_RETURN,
+) -> DataQualityReport:
+    """
+    Check candle rows in one vectorized pass. Without an explicit interval, the expected bar spacing
+    is the median positive timestamp step.
+    """
+    count = len(rows)
+    if isinstance(rows, BarFrame):
+        timestamps, invalid_timestamp = rows.timestamps, np.zeros(count, dtype=bool)
+        prices = np.stack([rows.column(key) for key in _PRICE_KEYS])
+        volumes, has_volume = rows.volume, np.ones(count, dtype=bool)
+    else:
+        timestamps, invalid_timestamp = _timestamp_column(rows)
+        prices = np.stack([_float_column(rows, key) for key in _PRICE_KEYS]) if count else np.empty((4, 0))
+        volumes = _float_column(rows, "volume")
+        has_volume = np.fromiter(("volume" in row for row in rows), dtype=bool, count=count)
+    opens, highs, lows, closes = prices
+
+    valid_ts = ~invalid_timestamp
+    previous_valid = np.full(count, np.iinfo(np.int64).min, dtype=np.int64)
+    if count:
+        # Last valid timestamp before each row, so one bad timestamp does not mask ordering checks.
+        running = np.where(valid_ts, timestamps, np.iinfo(np.int64).min)
+        previous_valid[1:] = np.maximum.accumulate(running)[:-1]
+    non_monotonic = valid_ts & (timestamps < previous_valid)
+
+    duplicate = np.zeros(count, dtype=bool)
+    valid_positions = np.flatnonzero(valid_ts)
+    if valid_positions.size:
+        _, first_seen = np.unique(timestamps[valid_positions], return_index=True)
+        duplicate[valid_positions] = True
+        duplicate[valid_positions[first_seen]] = False
+
+    missing_value = ~np.isfinite(prices).all(axis=0) if count else np.zeros(0, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        non_positive = (prices <= 0).any(axis=0) if count else np.zeros(0, dtype=bool)
+        ohlc_inconsistent = (
+            (highs < lows)
+            | (opens > highs)
+            | (opens < lows)
+            | (closes > highs)
+            | (closes < lows)
+        )
+        negative_volume = has_volume & (volumes < 0)
+
+    outlier = np.zeros(count, dtype=bool)
+    usable_close = np.isfinite(closes) & (closes > 0)
+    close_positions = np.flatnonzero(usable_close & valid_ts & ~duplicate & ~non_monotonic)
+    if close_positions.size > 2:
+        returns = np.diff(np.log(closes[close_positions]))
+        median = np.median(returns)
+        mad = np.median(np.abs(returns - median)) * 1.4826
+        deviation = np.abs(returns - median)
+        large = deviation > min_outlier_return
+        if mad > 0:
+            large &= deviation / mad > outlier_zscore
+        outlier[close_positions[1:]] = large
+
+    gap = np.zeros(count, dtype=bool)
+    missing_bars = 0
+    ordered = np.flatnonzero(valid_ts & ~duplicate & ~non_monotonic)
+    steps = np.diff(timestamps[ordered])
+    expected_ns: int | None = None
+    if expected_interval_seconds:
+        expected_ns = int(expected_interval_seconds) * NANOS_PER_SECOND
+    elif steps.size and (steps > 0).any():
+        expected_ns = int(np.median(steps[steps > 0]))
+    if expected_ns and steps.size:
+        gap[ordered[1:]] = steps > expected_ns
+        missing_bars = int(np.sum(np.maximum(steps // expected_ns - 1, 0)[steps > expected_ns]))
+
+    return DataQualityReport(
+        row_count=count,
+        masks={
+            CHECK_INVALID_TIMESTAMP: invalid_timestamp,
+            CHECK_DUPLICATE_TIMESTAMP: duplicate,
+            CHECK_NON_MONOTONIC: non_monotonic,
+            CHECK_MISSING_VALUE: missing_value,
+            CHECK_NON_POSITIVE_PRICE: non_positive & ~missing_value,
+            CHECK_OHLC_INCONSISTENT: ohlc_inconsistent,
+            CHECK_NEGATIVE_VOLUME: negative_volume,
+            CHECK_OUTLIER_RETURN: outlier,
+            CHECK_GAP: gap,
+        },
+        expected_interval_ns=expected_ns,
+        missing_bars=missing_bars,
+    )
+
+
+def repair_candles(rows: list[dict], report: DataQualityReport, repairs: Iterable[str]) -> list[dict]:
+    """
+    Apply repairs and return new rows. forward_fill replaces bad prices with a flat bar at the last
+    good close; drop removes rows that still fail a check; flag_gaps adds a boolean quality_gap column.
+    """
+    requested = set(repairs)
+    unknown = requested.difference(QUALITY_REPAIRS)
+    if unknown:
+        raise ValueError(f"quality repairs must be drawn from {QUALITY_REPAIRS}, got {sorted(unknown)}")
+    if report.row_count != len(rows):
+        raise ValueError("quality report does not match rows")
+
+    masks = report.masks
+    structural = masks[CHECK_INVALID_TIMESTAMP] | masks[CHECK_DUPLICATE_TIMESTAMP] | masks[CHECK_NON_MONOTONIC]
+    value_bad = np.zeros(report.row_count, dtype=bool)
+    for check in VALUE_CHECKS:
+        value_bad |= masks[check]
+
+    fill_from = np.full(report.row_count, -1, dtype=np.int64)
+    if REPAIR_FORWARD_FILL in requested:
+        good = ~value_bad & ~structural
+        positions = np.where(good, np.arange(report.row_count), -1)
+        fill_from = np.maximum.accumulate(positions) if report.row_count else positions
+        fill_from = np.where(value_bad & ~structural, fill_from, -1)
+        value_bad = value_bad & (fill_from < 0)
+
+    keep = np.ones(report.row_count, dtype=bool)
+    if REPAIR_DROP in requested:
+        keep = ~(structural | value_bad)
+
+    flag_gaps = REPAIR_FLAG_GAPS in requested
+    repaired: list[dict] = []
+    for position in np.flatnonzero(keep).tolist():
+        row = rows[position]
+        source = int(fill_from[position])
+        if source >= 0:
+            close = float(rows[source].get("close"))
+            row = {**row, "open": close, "high": close, "low": close, "close": close, "volume": 0.0}
+        if flag_gaps:
+            row = {**row, GAP_FLAG_KEY: bool(masks[CHECK_GAP][position])}
+        repaired.append(row)
+    return repaired
@@ -0,0 +1,246 @@
+"""
+File-backed market data source that replays recorded candles and tickers with the same interface as
+BingxMarketDataLoader, for load-testing inference and evaluation without Convex or BingX.
+
+Recordings live under root/<pair>/<interval>.parquet (timestamp, OHLCV and optional futures/ctx_*
+columns) and root/<pair>/tickers.parquet. Replay time is shared by every pair: it starts at the
+earliest recorded bar (or `start`) and advances by `speed` seconds per second of the injected clock,
+so a request only sees bars that have opened by then. With speed="max" each candle read of a series
+reveals one more bar instead, so runs do not depend on wall-clock time at all.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Literal
+
+import numpy as np
+
+from data.bar_frame import BAR_COLUMNS, BarFrame, CTX_COLUMN_PREFIX, FUTURES_COLUMNS
+from data.timestamp_index import NANOS_PER_SECOND, nanos_to_iso, timestamp_to_nanos
+from schemas import MarketCandle, MarketSnapshot, TradingPair
+
+REPLAY_SPEED_MAX = "max"
+TICKERS_FILE = "tickers.parquet"
+TICKER_COLUMNS = ("last_price", "volume_24h", "price_change_24h")
+
+ReplaySpeed = float | Literal["max"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except Exception as exc:  # pragma: no cover - optional dependency guard
+        raise RuntimeError("pyarrow is required for replay recordings") from exc
+    return pa, pq
+
+
+def write_replay_candles(root: str | Path, pair: TradingPair | str, interval: str, frame: BarFrame) -> Path:
+    pa, pq = _pyarrow()
+    path = Path(root) / _pair_value(pair) / f"{interval}.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frame = frame.sorted()
+    table = pa.table({name: frame.column(name) for name in frame.columns})
+    pq.write_table(table, path)
+    return path
+
+
+def write_replay_tickers(root: str | Path, pair: TradingPair | str, tickers: list[dict]) -> Path:
+    """Record ticker rows with captured_at plus any of last_price, volume_24h, price_change_24h."""
+    pa, pq = _pyarrow()
+    path = Path(root) / _pair_value(pair) / TICKERS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    captured = [timestamp_to_nanos(row["captured_at"]) for row in tickers]
+    order = np.argsort(np.asarray(captured, dtype=np.int64), kind="stable")
+    columns = {"captured_at": np.asarray(captured, dtype=np.int64)[order]}
+    for name in TICKER_COLUMNS:
+        values = [row.get(name) for row in tickers]
+        columns[name] = np.asarray([np.nan if value is None else float(value) for value in values])[order]
+    pq.write_table(pa.table(columns), path)
+    return path
+
+
+def _pair_value(pair: TradingPair | str) -> str:
+    return pair.value if isinstance(pair, TradingPair) else str(pair)
+
+
+def _read_frame(path: Path) -> BarFrame:
+    _, pq = _pyarrow()
+    table = pq.read_table(path)
+    names = table.column_names
+    missing = [name for name in ("timestamp", *BAR_COLUMNS) if name not in names]
+    if missing:
+        raise ValueError(f"{path} is missing columns: {missing}")
+    extras = [name for name in names if name in FUTURES_COLUMNS or name.startswith(CTX_COLUMN_PREFIX)]
+    return BarFrame(
+        table.column("timestamp").to_numpy().astype(np.int64),
+        *(table.column(name).to_numpy().astype(np.float64) for name in BAR_COLUMNS),
+        extras={name: table.column(name).to_numpy().astype(np.float64) for name in extras},
+    ).sorted()
+
+
+class ReplayMarketDataSource:
+    def __init__(
+        self,
+        root: str | Path,
+        speed: ReplaySpeed = 1.0,
+        start: datetime | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if speed != REPLAY_SPEED_MAX and (isinstance(speed, str) or speed <= 0):
+            raise ValueError(f"speed must be positive or {REPLAY_SPEED_MAX!r}")
+        self._root = Path(root)
+        if not self._root.is_dir():
+            raise ValueError(f"replay root {self._root} does not exist")
+        self._speed = speed
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._frames: dict[tuple[str, str], BarFrame] = {}
+        self._tickers: dict[str, dict[str, np.ndarray] | None] = {}
+        self._steps: dict[tuple[str, str], int] = {}
+        self._pair_now: dict[str, int] = {}
+        self._start_ns = timestamp_to_nanos(start) if start is not None else self._earliest_recorded()
+        self._started_at = clock()
+
+    def close(self) -> None:
+        return None
+
+    def __enter__(self) -> ReplayMarketDataSource:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def replay_time(self) -> datetime | None:
+        """Current shared replay time in timed modes; None with speed="max"."""
+        if self._speed == REPLAY_SPEED_MAX:
+            return None
+        return datetime.fromisoformat(nanos_to_iso(self._timed_now()))
+
+    def fetch_candles(self, pair: TradingPair, interval: str, limit: int = 200) -> list[MarketCandle]:
+        """The most recent `limit` bars visible at the current replay time, like the loader's fetch_candles."""
+        return _to_candles(self._latest(pair, interval, limit))
+
+    def fetch_candle_range(
+        self, pair: TradingPair, interval: str, start: datetime, end: datetime, page_size: int = 0
+    ) -> list[MarketCandle]:
+        return _to_candles(self.fetch_candle_frame(pair, interval, start, end))
+
+    def fetch_candle_frame(
+        self, pair: TradingPair, interval: str, start: datetime, end: datetime, page_size: int = 0
+    ) -> BarFrame:
+        frame = self._visible(pair, interval)
+        return frame[frame.timestamp_index.slice_between(start, end)]
+
+    def fetch_latest_ticker(self, pair: TradingPair) -> dict | None:
+        tickers = self._load_tickers(pair.value)
+        if tickers is None:
+            return None
+        now = self._pair_now.get(pair.value) if self._speed == REPLAY_SPEED_MAX else self._timed_now()
+        if now is None:
+            return None
+        position = int(np.searchsorted(tickers["captured_at"], now, side="right")) - 1
+        if position < 0:
+            return None
+        ticker: dict = {"captured_at": nanos_to_iso(int(tickers["captured_at"][position]))}
+        for name in TICKER_COLUMNS:
+            value = float(tickers[name][position])
+            ticker[name] = value if value == value else None
+        return ticker
+
+    def load_market_snapshot(self, pair: TradingPair, interval: str, limit: int = 200) -> MarketSnapshot:
+        """Snapshot with the recorded ticker row and the last bar's futures/ctx_* columns."""
+        frame = self._latest(pair, interval, limit)
+        ticker = self.fetch_latest_ticker(pair)
+        last_price = ticker.get("last_price") if ticker else None
+        extras: dict[str, float] = {}
+        if len(frame):
+            for name, values in frame.extras.items():
+                value = float(values[-1])
+                if value == value:
+                    extras[name] = value
+        return MarketSnapshot(pair=pair, candles=_to_candles(frame), last_price=last_price, ticker=ticker, extras=extras)
+
+    def _latest(self, pair: TradingPair, interval: str, limit: int) -> BarFrame:
+        frame = self._visible(pair, interval)
+        return frame[max(0, len(frame) - limit) :]
+
+    def _timed_now(self) -> int:
+        elapsed = self._clock() - self._started_at
+        return self._start_ns + int(round(elapsed * float(self._speed) * NANOS_PER_SECOND))
+
+    def _visible(self, pair: TradingPair, interval: str) -> BarFrame:
+        frame = self._load_frame(pair.value, interval)
+        if self._speed != REPLAY_SPEED_MAX:
+            return frame[: int(np.searchsorted(frame.timestamps, self._timed_now(), side="right"))]
+        key = (pair.value, interval)
+        with self._lock:
+            first = int(np.searchsorted(frame.timestamps, self._start_ns, side="right"))
+            end = min(len(frame), max(first, 1) + self._steps.get(key, 0))
+            self._steps[key] = self._steps.get(key, 0) + 1
+            if end:
+                self._pair_now[pair.value] = int(frame.timestamps[end - 1])
+        return frame[:end]
+
+    def _load_frame(self, pair: str, interval: str) -> BarFrame:
+        key = (pair, interval)
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is None:
+                path = self._root / pair / f"{interval}.parquet"
+                if not path.exists():
+                    raise ValueError(f"no recording for {pair} {interval}")
+                frame = _read_frame(path)
+                self._frames[key] = frame
+        return frame
+
+    def _load_tickers(self, pair: str) -> dict[str, np.ndarray] | None:
+        with self._lock:
+            if pair not in self._tickers:
+                path = self._root / pair / TICKERS_FILE
+                tickers = None
+                if path.exists():
+                    _, pq = _pyarrow()
+                    table = pq.read_table(path)
+                    tickers = {name: table.column(name).to_numpy() for name in ("captured_at", *TICKER_COLUMNS)}
+                self._tickers[pair] = tickers
+            return self._tickers[pair]
+
+    def _earliest_recorded(self) -> int:
+        _, pq = _pyarrow()
+        earliest: int | None = None
+        for path in self._root.glob("*/*.parquet"):
+            if path.name == TICKERS_FILE:
+                continue
+            timestamps = pq.read_table(path, columns=["timestamp"]).column("timestamp").to_numpy()
+            if timestamps.size:
+                first = int(timestamps.min())
+                earliest = first if earliest is None else min(earliest, first)
+        if earliest is None:
+            raise ValueError(f"no candle recordings under {self._root}")
+        return earliest
+
+
+def _to_candles(frame: BarFrame) -> list[MarketCandle]:
+    return [
+        MarketCandle.model_construct(
+            timestamp=datetime.fromisoformat(nanos_to_iso(timestamp)),
+            open=open_,
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+        )
+        for timestamp, open_, high, low, close, volume in zip(
+            frame.timestamps.tolist(),
+            frame.open.tolist(),
+            frame.high.tolist(),
+            frame.low.tolist(),
+            frame.close.tolist(),
+            frame.volume.tolist(),
+        )
+    ]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable
+
+import numpy as np
+
+NANOS_PER_SECOND = 1_000_000_000
+
+
+def timestamp_to_nanos(value: object) -> int:
+    """Parse an ISO-8601 string or datetime (naive means UTC) to int64 epoch nanoseconds."""
+    if isinstance(value, str):
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    elif isinstance(value, datetime):
+        parsed = value
+    else:
+        raise ValueError("invalid_timestamp")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    # Integer arithmetic keeps microsecond precision that float timestamps would round.
+    delta = parsed - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * NANOS_PER_SECOND + delta.microseconds * 1_000
+
+
+def nanos_to_iso(value: int) -> str:
+    seconds, nanos = divmod(int(value), NANOS_PER_SECOND)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=nanos // 1_000).isoformat()
+
+
+class TimestampIndex:
+    """
+    Sorted int64 nanosecond timestamps for a dataset. Timestamps are parsed once; period
+    slicing is a binary search and lookup of an exact bar timestamp is a dict hit.
+    """
+
+    def __init__(self, timestamps_ns: np.ndarray) -> None:
+        values = np.asarray(timestamps_ns, dtype=np.int64)
+        if values.ndim != 1:
+            raise ValueError("timestamps must be 1-D")
+        if values.size > 1 and np.any(values[1:] < values[:-1]):
+            raise ValueError("timestamps must be sorted ascending")
+        self._values = values
+        self._positions: dict[int, int] | None = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict], key: str = "timestamp") -> TimestampIndex:
+        return cls(np.fromiter((timestamp_to_nanos(row.get(key)) for row in rows), dtype=np.int64))
+
+    @staticmethod
+    def sort_rows(rows: list[dict], key: str = "timestamp") -> tuple[list[dict], TimestampIndex]:
+        """Stable-sort rows by timestamp, parsing each timestamp once."""
+        values = np.fromiter((timestamp_to_nanos(row.get(key)) for row in rows), dtype=np.int64, count=len(rows))
+        if values.size > 1 and np.any(values[1:] < values[:-1]):
+            order = np.argsort(values, kind="stable")
+            return [rows[position] for position in order.tolist()], TimestampIndex(values[order])
+        return rows, TimestampIndex(values)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    def __len__(self) -> int:
+        return int(self._values.size)
+
+    def __getitem__(self, item: slice) -> TimestampIndex:
+        if not isinstance(item, slice):
+            raise TypeError("TimestampIndex only supports slicing; use .values for scalars")
+        return TimestampIndex(self._values[item])
+
+    def position(self, timestamp: object) -> int | None:
+        """Row position of a bar with exactly this timestamp (first occurrence), or None."""
+        if self._positions is None:
+            positions: dict[int, int] = {}
+            for position, value in enumerate(self._values.tolist()):
+                positions.setdefault(value, position)
+            self._positions = positions
+        key = timestamp if isinstance(timestamp, (int, np.integer)) else timestamp_to_nanos(timestamp)
+        return self._positions.get(int(key))
+
+    def slice_between(self, start: object | None = None, end: object | None = None, warmup: int = 0) -> slice:
+        """
+        Positions with start <= ts <= end; either bound may be omitted. A non-empty range is
+        extended by up to ``warmup`` positions before ``start``.
+        """
+        lower = 0 if start is None else int(np.searchsorted(self._values, _as_nanos(start), side="left"))
+        upper = len(self) if end is None else int(np.searchsorted(self._values, _as_nanos(end), side="right"))
+        if upper > lower:
+            lower = max(0, lower - max(0, int(warmup)))
+        return slice(lower, max(lower, upper))
+
+    def bucket_keys(self, seconds: int) -> np.ndarray:
+        return np.floor_divide(self._values, int(seconds) * NANOS_PER_SECOND)
+
+
+def _as_nanos(value: object) -> int:
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return timestamp_to_nanos(value)
@@ -0,0 +1,317 @@
+"""
+Partitioned, append-only columnar candle lake fed from Convex. One directory per UTC day under
+hive-style keys:
+
+    root/candles/pair=<pair>/interval=<interval>/date=<YYYY-MM-DD>/
+    root/tickers/pair=<pair>/date=<YYYY-MM-DD>/
+
+Writes never touch existing files: each batch lands as a new small part-<ns>-<id>.parquet. Readers
+merge a partition's compacted data.parquet with its parts in write order, later rows winning on
+equal timestamps, so appends are idempotent. Compaction (data_lake.compaction) folds the parts back
+into data.parquet with large row groups. Timestamps are int64 epoch nanoseconds.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from data.bar_frame import BAR_COLUMNS, CTX_COLUMN_PREFIX, FUTURES_COLUMNS, BarFrame
+from data.bingx_loader import interval_to_seconds
+from data.timestamp_index import NANOS_PER_SECOND, timestamp_to_nanos
+from data_lake.manifest import LakeManifest, ManifestFile
+
+CANDLES_DIR = "candles"
+TICKERS_DIR = "tickers"
+COMPACTED_FILE = "data.parquet"
+PART_PREFIX = "part-"
+PARQUET_SUFFIX = ".parquet"
+TICKER_VALUE_COLUMNS = ("last_price", "volume_24h", "price_change_24h")
+NANOS_PER_DAY = 86_400 * NANOS_PER_SECOND
+# Partition sort/dedupe key per table
+TABLE_KEYS = {CANDLES_DIR: "timestamp", TICKERS_DIR: "captured_at"}
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except Exception as exc:  # pragma: no cover - optional dependency guard
+        raise RuntimeError("pyarrow is required for the candle lake") from exc
+    return pa, pq
+
+
+def _day_label(day: int) -> str:
+    return datetime.fromtimestamp(day * 86_400, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def candle_partition_dir(root: str | Path, pair: str, interval: str, day: str) -> Path:
+    return Path(root) / CANDLES_DIR / f"pair={pair}" / f"interval={interval}" / f"date={day}"
+
+
+def ticker_partition_dir(root: str | Path, pair: str, day: str) -> Path:
+    return Path(root) / TICKERS_DIR / f"pair={pair}" / f"date={day}"
+
+
+def partition_keys(path: Path) -> tuple[Path, str, str, str, str]:
+    """(lake root, table, pair, interval, day) of a partition directory; interval is "" for tickers."""
+    keys = {}
+    current = path
+    while "=" in current.name:
+        name, value = current.name.split("=", 1)
+        keys[name] = value
+        current = current.parent
+    if current.name not in TABLE_KEYS or "pair" not in keys or "date" not in keys:
+        raise ValueError(f"{path} is not a lake partition")
+    return current.parent, current.name, keys["pair"], keys.get("interval", ""), keys["date"]
+
+
+def step_nanos(interval: str) -> int | None:
+    seconds = interval_to_seconds(interval) if interval else None
+    return seconds * NANOS_PER_SECOND if seconds else None
+
+
+def describe_file(manifest: LakeManifest, path: Path, keys: np.ndarray) -> ManifestFile:
+    _, table, pair, interval, day = partition_keys(path.parent)
+    return manifest.describe(path, table, pair, interval, day, keys, step_nanos(interval))
+
+
+def partition_files(path: Path) -> list[Path]:
+    """Files of one partition in write order: the compacted file first, then parts by name."""
+    files = [path / COMPACTED_FILE] if (path / COMPACTED_FILE).exists() else []
+    return files + sorted(path.glob(f"{PART_PREFIX}*{PARQUET_SUFFIX}"))
+
+
+def count_rows(files: Iterable[Path]) -> int:
+    """Row count from Parquet footers, without reading column data."""
+    _, pq = _pyarrow()
+    return sum(pq.ParquetFile(file).metadata.num_rows for file in files)
+
+
+def dedupe_last(columns: dict[str, np.ndarray], key: str) -> dict[str, np.ndarray]:
+    """Sort by `key` and keep the last row for each key value."""
+    order = np.argsort(columns[key], kind="stable")
+    keys = columns[key][order]
+    last = np.ones(keys.size, dtype=bool)
+    last[:-1] = keys[1:] != keys[:-1]
+    keep = order[last]
+    return {name: values[keep] for name, values in columns.items()}
+
+
+def concat_columns(parts: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    """Concatenate column sets, filling columns absent from a part with NaN."""
+    names = list(dict.fromkeys(name for part in parts for name in part))
+    counts = [len(next(iter(part.values()))) if part else 0 for part in parts]
+    return {
+        name: np.concatenate(
+            [part[name] if name in part else np.full(count, np.nan) for part, count in zip(parts, counts)]
+        )
+        for name in names
+    }
+
+
+def read_partition(path: Path, key: str) -> dict[str, np.ndarray]:
+    _, pq = _pyarrow()
+    parts = []
+    for file in partition_files(path):
+        table = pq.read_table(file)
+        parts.append({name: table.column(name).to_numpy() for name in table.column_names})
+    if not parts:
+        return {}
+    return dedupe_last(concat_columns(parts), key)
+
+
+def write_parquet_atomic(target: Path, columns: dict[str, np.ndarray], row_group_size: int | None = None) -> None:
+    pa, pq = _pyarrow()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = target.parent / f".{target.name}.{uuid.uuid4().hex}.tmp"
+    pq.write_table(pa.table(columns), staging, row_group_size=row_group_size)
+    os.replace(staging, target)
+
+
+def _append_partition(path: Path, columns: dict[str, np.ndarray], key: str) -> tuple[Path, np.ndarray]:
+    # Zero-padded nanosecond names sort in write order; the random suffix keeps concurrent writers apart.
+    target = path / f"{PART_PREFIX}{time.time_ns():020d}-{uuid.uuid4().hex[:8]}{PARQUET_SUFFIX}"
+    columns = dedupe_last(columns, key)
+    write_parquet_atomic(target, columns)
+    return target, columns[key]
+
+
+def _partition_by_day(timestamps: np.ndarray) -> Iterable[tuple[str, np.ndarray]]:
+    days = np.floor_divide(timestamps, NANOS_PER_DAY)
+    for day in np.unique(days).tolist():
+        yield _day_label(day), np.flatnonzero(days == day)
+
+
+def _record(root: str | Path, written: list[tuple[Path, np.ndarray]]) -> list[Path]:
+    # Files are in place before the manifest transaction; rebuild_manifest recovers a crash in between.
+    if written:
+        with LakeManifest(root) as manifest:
+            manifest.apply([describe_file(manifest, path, keys) for path, keys in written])
+    return [path for path, _ in written]
+
+
+def write_candle_partitions(root: str | Path, pair: str, interval: str, frame: BarFrame) -> list[Path]:
+    """Append `frame` as one part file per day partition; returns the files written."""
+    written = [
+        _append_partition(
+            candle_partition_dir(root, pair, interval, day),
+            {name: frame.column(name)[positions] for name in frame.columns},
+            "timestamp",
+        )
+        for day, positions in _partition_by_day(frame.timestamps)
+    ]
+    return _record(root, written)
+
+
+def write_ticker_partitions(root: str | Path, pair: str, rows: list[dict]) -> list[Path]:
+    """Append raw bingx_tickers rows (captured_at plus values) to their day partitions."""
+    if not rows:
+        return []
+    captured = np.fromiter((timestamp_to_nanos(row.get("captured_at")) for row in rows), dtype=np.int64, count=len(rows))
+    columns = {"captured_at": captured}
+    for name in TICKER_VALUE_COLUMNS:
+        columns[name] = np.fromiter(
+            (np.nan if row.get(name) is None else float(row[name]) for row in rows), dtype=np.float64, count=len(rows)
+        )
+    written = [
+        _append_partition(
+            ticker_partition_dir(root, pair, day),
+            {name: values[positions] for name, values in columns.items()},
+            "captured_at",
+        )
+        for day, positions in _partition_by_day(captured)
+    ]
+    return _record(root, written)
+
+
+def rebuild_manifest(root: str | Path) -> int:
+    """Re-index every data file on disk, e.g. for lakes written before the manifest; returns files indexed."""
+    _, pq = _pyarrow()
+    root = Path(root)
+    with LakeManifest(root) as manifest:
+        entries = []
+        for table, key in TABLE_KEYS.items():
+            for path in sorted((root / table).rglob(f"*{PARQUET_SUFFIX}")) if (root / table).is_dir() else []:
+                if path.name.startswith("."):
+                    continue
+                keys = pq.read_table(path, columns=[key]).column(key).to_numpy()
+                if keys.size:
+                    entries.append(describe_file(manifest, path, keys))
+        manifest.replace_all(entries)
+    return len(entries)
+
+
+def _bound(value: object | None) -> int | None:
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    return timestamp_to_nanos(value)
+
+
+def _day_dirs(base: Path, lower: int | None, upper: int | None) -> list[Path]:
+    # Date keys are ISO days, so partition pruning is a string comparison on directory names.
+    first_day = _day_label(lower // NANOS_PER_DAY) if lower is not None else None
+    last_day = _day_label(upper // NANOS_PER_DAY) if upper is not None else None
+    selected = []
+    for path in sorted(base.glob("date=*")):
+        day = path.name.split("=", 1)[1]
+        if (first_day and day < first_day) or (last_day and day > last_day):
+            continue
+        selected.append(path)
+    return selected
+
+
+def scan_candles(
+    root: str | Path,
+    pair: str,
+    interval: str,
+    start: object | None = None,
+    end: object | None = None,
+    columns: Iterable[str] | None = None,
+):
+    """
+    Arrow table of candles with start <= timestamp <= end, sorted and deduplicated like
+    read_partition. Day directories outside the range are never listed, and the timestamp predicate
+    is pushed into pyarrow.dataset so row groups whose statistics miss the range are not decoded.
+    With a manifest, files are chosen by their recorded bounds instead of listing directories.
+    """
+    pa, pq = _pyarrow()
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    lower, upper = _bound(start), _bound(end)
+    if LakeManifest.exists(root):
+        with LakeManifest(root) as manifest:
+            files = [str(file) for file in manifest.files(CANDLES_DIR, pair, interval, lower, upper)]
+    else:
+        base = Path(root) / CANDLES_DIR / f"pair={pair}" / f"interval={interval}"
+        files = [str(file) for path in _day_dirs(base, lower, upper) for file in partition_files(path)]
+    requested = list(dict.fromkeys(["timestamp", *(columns if columns is not None else [])]))
+    if not files:
+        return pa.table({name: pa.array([], type=pa.int64() if name == "timestamp" else pa.float64()) for name in requested})
+
+    schema = pa.unify_schemas([pq.read_schema(file) for file in files])
+    if columns is None:
+        requested = schema.names
+    missing = [name for name in requested if name not in schema.names]
+    if missing:
+        raise ValueError(f"lake has no columns {missing} for {pair} {interval}")
+    predicate = None
+    if lower is not None:
+        predicate = ds.field("timestamp") >= lower
+    if upper is not None:
+        bound = ds.field("timestamp") <= upper
+        predicate = bound if predicate is None else predicate & bound
+    table = ds.dataset(files, format="parquet", schema=schema).to_table(
+        columns=[*requested, "__filename"], filter=predicate
+    )
+    # Later files win on equal timestamps: data.parquet sorts before part-* within a partition.
+    table = table.take(pc.sort_indices(table, sort_keys=[("timestamp", "ascending"), ("__filename", "ascending")]))
+    timestamps = table.column("timestamp").to_numpy()
+    last = np.ones(timestamps.size, dtype=bool)
+    last[:-1] = timestamps[1:] != timestamps[:-1]
+    return table.filter(pa.array(last)).drop_columns(["__filename"])
+
+
+def read_candle_columns(
+    root: str | Path,
+    pair: str,
+    interval: str,
+    start: object | None = None,
+    end: object | None = None,
+    columns: Iterable[str] | None = None,
+) -> dict[str, np.ndarray]:
+    """scan_candles as NumPy arrays; float columns with nulls (absent in some files) become NaN."""
+    table = scan_candles(root, pair, interval, start, end, columns)
+    result: dict[str, np.ndarray] = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if column.null_count:
+            column = column.cast("float64").fill_null(float("nan"))
+        result[name] = column.to_numpy()
+    return result
+
+
+def read_candle_partitions(
+    root: str | Path,
+    pair: str,
+    interval: str,
+    start: object | None = None,
+    end: object | None = None,
+) -> BarFrame:
+    """Candles with start <= timestamp <= end as a BarFrame, with any futures/ctx_* columns."""
+    columns = read_candle_columns(root, pair, interval, start, end)
+    if "open" not in columns:
+        return BarFrame.empty()
+    extras = [name for name in columns if name in FUTURES_COLUMNS or name.startswith(CTX_COLUMN_PREFIX)]
+    return BarFrame(
+        columns["timestamp"].astype(np.int64),
+        *(columns[name].astype(np.float64) for name in BAR_COLUMNS),
+        extras={name: columns[name].astype(np.float64) for name in extras},
+    )
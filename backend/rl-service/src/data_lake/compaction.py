@@ -0,0 +1,193 @@
+"""
+Background compaction for the append-only candle lake. A partition with enough part files is read
+once, deduplicated on its timestamp key (later writes win), written to a staging file with large
+row groups and swapped in as data.parquet with os.replace; only then are the merged parts removed.
+Readers see either the old or the new compacted file, and a crash before cleanup only leaves parts
+whose rows data.parquet already holds, which readers dedupe and the next pass deletes. The lake
+manifest swaps the merged parts for the compacted file in one transaction before they are removed.
+
+    python -m data_lake.compaction --lake-root ./lake --loop-seconds 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from data_lake.candle_lake import (
+    COMPACTED_FILE,
+    PART_PREFIX,
+    TABLE_KEYS,
+    count_rows,
+    describe_file,
+    partition_files,
+    partition_keys,
+    read_partition,
+    write_parquet_atomic,
+)
+from data_lake.manifest import LakeManifest
+
+try:
+    from prometheus_client import Counter
+except Exception:  # pragma: no cover - optional dependency guard
+    Counter = None
+
+DEFAULT_MIN_PART_FILES = 4
+DEFAULT_ROW_GROUP_ROWS = 1_000_000
+LOCK_FILE = ".compacting"
+
+if Counter is not None:
+    LAKE_COMPACTED_FILES = Counter("rl_lake_compacted_files_total", "Part files merged by lake compaction")
+else:  # pragma: no cover - metrics disabled without prometheus_client
+    LAKE_COMPACTED_FILES = None
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    partition: str
+    files_merged: int
+    rows: int
+    duplicates_dropped: int
+
+
+@dataclass
+class CompactionStats:
+    partitions: list[CompactionResult] = field(default_factory=list)
+
+    @property
+    def files_merged(self) -> int:
+        return sum(result.files_merged for result in self.partitions)
+
+    @property
+    def duplicates_dropped(self) -> int:
+        return sum(result.duplicates_dropped for result in self.partitions)
+
+
+def iter_partitions(root: str | Path):
+    """(partition dir, dedupe key) for every leaf partition in the lake."""
+    root = Path(root)
+    for table, key in TABLE_KEYS.items():
+        base = root / table
+        if base.is_dir():
+            for path in sorted(base.rglob("date=*")):
+                if path.is_dir():
+                    yield path, key
+
+
+def compact_partition(
+    path: Path,
+    key: str,
+    min_part_files: int = DEFAULT_MIN_PART_FILES,
+    row_group_size: int = DEFAULT_ROW_GROUP_ROWS,
+) -> CompactionResult | None:
+    """Merge a partition's part files into data.parquet; None when skipped (too few parts or locked)."""
+    files = partition_files(path)
+    parts = [file for file in files if file.name.startswith(PART_PREFIX)]
+    if len(parts) < max(1, min_part_files):
+        return None
+    lock = path / LOCK_FILE
+    try:
+        descriptor = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return None
+    try:
+        os.close(descriptor)
+        # Re-list under the lock; parts appended after this point are left for the next pass.
+        files = partition_files(path)
+        parts = [file for file in files if file.name.startswith(PART_PREFIX)]
+        total_rows = count_rows(files)
+        columns = read_partition(path, key)
+        rows = len(columns[key]) if columns else 0
+        write_parquet_atomic(path / COMPACTED_FILE, columns, row_group_size=row_group_size)
+        # Swap the manifest entries before deleting parts, so it never lists a file that is gone.
+        if rows:
+            with LakeManifest(partition_keys(path)[0]) as manifest:
+                manifest.apply([describe_file(manifest, path / COMPACTED_FILE, columns[key])], removed=parts)
+        for part in parts:
+            part.unlink(missing_ok=True)
+    finally:
+        lock.unlink(missing_ok=True)
+    if LAKE_COMPACTED_FILES is not None:
+        LAKE_COMPACTED_FILES.inc(len(parts))
+    return CompactionResult(
+        partition=str(path), files_merged=len(parts), rows=rows, duplicates_dropped=total_rows - rows
+    )
+
+
+def compact_lake(
+    root: str | Path,
+    min_part_files: int = DEFAULT_MIN_PART_FILES,
+    row_group_size: int = DEFAULT_ROW_GROUP_ROWS,
+) -> CompactionStats:
+    stats = CompactionStats()
+    for path, key in iter_partitions(root):
+        result = compact_partition(path, key, min_part_files=min_part_files, row_group_size=row_group_size)
+        if result is not None:
+            stats.partitions.append(result)
+    return stats
+
+
+class LakeCompactor:
+    """Runs compact_lake every `interval_seconds` on a daemon thread until stopped."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        interval_seconds: float = 300.0,
+        min_part_files: int = DEFAULT_MIN_PART_FILES,
+        row_group_size: int = DEFAULT_ROW_GROUP_ROWS,
+    ) -> None:
+        self._root = Path(root)
+        self._interval = interval_seconds
+        self._min_part_files = min_part_files
+        self._row_group_size = row_group_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> CompactionStats:
+        return compact_lake(self._root, min_part_files=self._min_part_files, row_group_size=self._row_group_size)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="lake-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self._interval)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compact the append-only candle lake")
+    parser.add_argument("--lake-root", required=True)
+    parser.add_argument("--min-part-files", type=int, default=DEFAULT_MIN_PART_FILES)
+    parser.add_argument("--row-group-rows", type=int, default=DEFAULT_ROW_GROUP_ROWS)
+    parser.add_argument("--loop-seconds", type=float, help="repeat every N seconds instead of running once")
+    args = parser.parse_args(argv)
+
+    while True:
+        stats = compact_lake(args.lake_root, min_part_files=args.min_part_files, row_group_size=args.row_group_rows)
+        print(
+            f"compacted {len(stats.partitions)} partitions, merged {stats.files_merged} files, "
+            f"dropped {stats.duplicates_dropped} duplicate rows"
+        )
+        if not args.loop_seconds:
+            return
+        time.sleep(args.loop_seconds)
+
+
+if __name__ == "__main__":
+    main()
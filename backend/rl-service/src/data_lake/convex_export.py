@@ -0,0 +1,208 @@
+"""
+Bulk export of the Convex bingx_candles / bingx_tickers tables into the partitioned candle lake, so
+backtests and training read local Parquet instead of querying Convex.
+
+A range is exported in chunks; each chunk is pulled through the loader's concurrent paged fetch,
+merged into its day partitions and then recorded in a checkpoint file. A rerun over the same range
+resumes from the checkpoint, and because partition writes merge on timestamp, re-exporting rows
+never duplicates them.
+
+    python -m data_lake.convex_export --lake-root ./lake --pair Gold-USDT --interval 1m --start 2024-01-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from data.bingx_loader import DEFAULT_PAGE_SIZE, BingxMarketDataLoader
+from data.timestamp_index import nanos_to_iso, timestamp_to_nanos
+from data_lake.candle_lake import write_candle_partitions, write_ticker_partitions
+from schemas import TradingPair
+
+try:
+    from prometheus_client import Counter, Gauge
+except Exception:  # pragma: no cover - optional dependency guard
+    Counter = None
+    Gauge = None
+
+CHECKPOINTS_DIR = "_checkpoints"
+DEFAULT_EXPORT_CHUNK = timedelta(days=7)
+EXPORT_TABLE_CANDLES = "candles"
+EXPORT_TABLE_TICKERS = "tickers"
+
+if Counter is not None and Gauge is not None:
+    LAKE_EXPORT_ROWS = Counter("rl_lake_export_rows_total", "Rows exported from Convex into the lake", ["table"])
+    LAKE_EXPORT_THROUGHPUT = Gauge(
+        "rl_lake_export_rows_per_second", "Rows per second of the last lake export run", ["table"]
+    )
+else:  # pragma: no cover - metrics disabled without prometheus_client
+    LAKE_EXPORT_ROWS = LAKE_EXPORT_THROUGHPUT = None
+
+
+@dataclass(frozen=True)
+class ExportStats:
+    table: str
+    pair: str
+    interval: str | None
+    rows: int
+    partitions: int
+    chunks: int
+    seconds: float
+    resumed_from: str | None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class ConvexLakeExporter:
+    def __init__(
+        self,
+        loader: BingxMarketDataLoader,
+        lake_root: str | Path,
+        chunk: timedelta = DEFAULT_EXPORT_CHUNK,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        timer: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if chunk <= timedelta(0):
+            raise ValueError("chunk must be positive")
+        self._loader = loader
+        self._root = Path(lake_root)
+        self._chunk = chunk
+        self._page_size = page_size
+        self._timer = timer
+
+    def checkpoint_path(self, table: str, pair: str, interval: str | None = None) -> Path:
+        name = f"{interval}.json" if interval else "checkpoint.json"
+        return self._root / CHECKPOINTS_DIR / table / pair / name
+
+    def read_checkpoint(self, table: str, pair: str, interval: str | None = None) -> dict | None:
+        path = self.checkpoint_path(table, pair, interval)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def export_candles(self, pair: TradingPair, interval: str, start: datetime, end: datetime) -> ExportStats:
+        def fetch(chunk_start: datetime, chunk_end: datetime) -> tuple[int, int, int | None]:
+            frame = self._loader.fetch_candle_frame(pair, interval, chunk_start, chunk_end, page_size=self._page_size)
+            written = write_candle_partitions(self._root, pair.value, interval, frame)
+            return len(frame), len(written), int(frame.timestamps[-1]) if len(frame) else None
+
+        return self._export(EXPORT_TABLE_CANDLES, pair, interval, start, end, fetch)
+
+    def export_tickers(self, pair: TradingPair, start: datetime, end: datetime) -> ExportStats:
+        def fetch(chunk_start: datetime, chunk_end: datetime) -> tuple[int, int, int | None]:
+            rows = self._loader.fetch_ticker_rows(pair, chunk_start, chunk_end, page_size=self._page_size)
+            written = write_ticker_partitions(self._root, pair.value, rows)
+            last = max((timestamp_to_nanos(row["captured_at"]) for row in rows), default=None)
+            return len(rows), len(written), last
+
+        return self._export(EXPORT_TABLE_TICKERS, pair, None, start, end, fetch)
+
+    def _export(
+        self,
+        table: str,
+        pair: TradingPair,
+        interval: str | None,
+        start: datetime,
+        end: datetime,
+        fetch: Callable[[datetime, datetime], tuple[int, int, int | None]],
+    ) -> ExportStats:
+        start_ns, end_ns = timestamp_to_nanos(start), timestamp_to_nanos(end)
+        if end_ns < start_ns:
+            raise ValueError("end must not be before start")
+        cursor_ns = start_ns
+        checkpoint = self.read_checkpoint(table, pair.value, interval)
+        resumed_from = None
+        # A checkpoint only covers runs that started at or before this one.
+        if checkpoint and checkpoint["start_ns"] <= start_ns < checkpoint["through_ns"]:
+            cursor_ns = checkpoint["through_ns"]
+            resumed_from = nanos_to_iso(cursor_ns)
+
+        started = self._timer()
+        rows = partitions = chunks = 0
+        chunk_ns = int(self._chunk.total_seconds() * 1_000_000_000)
+        while cursor_ns <= end_ns:
+            chunk_end_ns = min(end_ns, cursor_ns + chunk_ns)
+            count, written, last_ns = fetch(_from_nanos(cursor_ns), _from_nanos(chunk_end_ns))
+            rows += count
+            partitions += written
+            chunks += 1
+            # The final chunk may end at "now", where more rows can still arrive: only checkpoint
+            # through its last exported row so the next run picks up the remainder.
+            through_ns = chunk_end_ns if chunk_end_ns < end_ns else last_ns
+            if through_ns is not None:
+                self._write_checkpoint(table, pair.value, interval, start_ns, through_ns)
+            cursor_ns = chunk_end_ns + 1_000_000
+
+        seconds = self._timer() - started
+        stats = ExportStats(
+            table=table,
+            pair=pair.value,
+            interval=interval,
+            rows=rows,
+            partitions=partitions,
+            chunks=chunks,
+            seconds=seconds,
+            resumed_from=resumed_from,
+        )
+        if LAKE_EXPORT_ROWS is not None:
+            LAKE_EXPORT_ROWS.labels(table=table).inc(rows)
+            LAKE_EXPORT_THROUGHPUT.labels(table=table).set(stats.rows_per_second)
+        return stats
+
+    def _write_checkpoint(self, table: str, pair: str, interval: str | None, start_ns: int, through_ns: int) -> None:
+        path = self.checkpoint_path(table, pair, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_suffix(".tmp")
+        payload = {
+            "start_ns": start_ns,
+            "through_ns": through_ns,
+            "through": nanos_to_iso(through_ns),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        staging.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(staging, path)
+
+
+def _from_nanos(value: int) -> datetime:
+    return datetime.fromisoformat(nanos_to_iso(value))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Export Convex candles and tickers into the partitioned lake")
+    parser.add_argument("--convex-url", default=os.environ.get("CONVEX_URL"))
+    parser.add_argument("--lake-root", required=True)
+    parser.add_argument("--pair", action="append", required=True, choices=[pair.value for pair in TradingPair])
+    parser.add_argument("--interval", action="append", default=[])
+    parser.add_argument("--start", required=True, help="ISO-8601 start (UTC if naive)")
+    parser.add_argument("--end", help="ISO-8601 end; defaults to now")
+    parser.add_argument("--tickers", action="store_true", help="also export bingx_tickers")
+    parser.add_argument("--chunk-days", type=float, default=DEFAULT_EXPORT_CHUNK.days)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    start = datetime.fromisoformat(args.start.replace("Z", "+00:00"))
+    end = datetime.fromisoformat(args.end.replace("Z", "+00:00")) if args.end else datetime.now(timezone.utc)
+    with BingxMarketDataLoader(args.convex_url, max_workers=args.workers) as loader:
+        exporter = ConvexLakeExporter(loader, args.lake_root, chunk=timedelta(days=args.chunk_days))
+        for pair in (TradingPair(value) for value in args.pair):
+            results = [exporter.export_candles(pair, interval, start, end) for interval in args.interval]
+            if args.tickers:
+                results.append(exporter.export_tickers(pair, start, end))
+            for stats in results:
+                print(
+                    f"{stats.table} {stats.pair} {stats.interval or '-'}: {stats.rows} rows, "
+                    f"{stats.partitions} partition writes, {stats.rows_per_second:.0f} rows/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
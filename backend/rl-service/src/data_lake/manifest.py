@@ -0,0 +1,230 @@
+"""
+SQLite manifest for the candle lake (root/_manifest.sqlite). Every data file has a row with its
+partition keys, min/max timestamp, row count, SHA-256 and gap count; a coverage table keeps one
+pre-aggregated row per (table, pair, interval). Writers and compaction update both in the same
+transaction, so availability lookups are a single-row read and range reads can pick files by their
+bounds without listing directories or opening Parquet footers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+MANIFEST_FILE = "_manifest.sqlite"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS files (
+        path TEXT PRIMARY KEY,
+        table_name TEXT NOT NULL,
+        pair TEXT NOT NULL,
+        interval TEXT NOT NULL,
+        day TEXT NOT NULL,
+        min_ts INTEGER NOT NULL,
+        max_ts INTEGER NOT NULL,
+        row_count INTEGER NOT NULL,
+        checksum TEXT NOT NULL,
+        gap_count INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS files_series ON files (table_name, pair, interval, min_ts, max_ts)",
+    """
+    CREATE TABLE IF NOT EXISTS coverage (
+        table_name TEXT NOT NULL,
+        pair TEXT NOT NULL,
+        interval TEXT NOT NULL,
+        first_ts INTEGER NOT NULL,
+        last_ts INTEGER NOT NULL,
+        row_count INTEGER NOT NULL,
+        file_count INTEGER NOT NULL,
+        gap_count INTEGER NOT NULL,
+        PRIMARY KEY (table_name, pair, interval)
+    )
+    """,
+)
+
+
+@dataclass(frozen=True)
+class ManifestFile:
+    path: str
+    table: str
+    pair: str
+    interval: str
+    day: str
+    min_ts: int
+    max_ts: int
+    row_count: int
+    checksum: str
+    gap_count: int
+
+
+@dataclass(frozen=True)
+class Coverage:
+    table: str
+    pair: str
+    interval: str
+    first_ts: int
+    last_ts: int
+    row_count: int
+    file_count: int
+    gap_count: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def file_checksum(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_gaps(timestamps: np.ndarray, step_ns: int | None) -> int:
+    """Steps between consecutive sorted timestamps larger than one interval."""
+    if not step_ns or timestamps.size < 2:
+        return 0
+    return int(np.count_nonzero(np.diff(np.sort(timestamps)) > step_ns))
+
+
+class LakeManifest:
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.root / MANIFEST_FILE, timeout=30.0)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    @staticmethod
+    def exists(root: str | Path) -> bool:
+        return (Path(root) / MANIFEST_FILE).exists()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> LakeManifest:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def describe(
+        self, path: Path, table: str, pair: str, interval: str, day: str, keys: np.ndarray, step_ns: int | None
+    ) -> ManifestFile:
+        """Manifest entry for a data file just written, from its in-memory key column."""
+        return ManifestFile(
+            path=self._relative(path),
+            table=table,
+            pair=pair,
+            interval=interval,
+            day=day,
+            min_ts=int(keys.min()),
+            max_ts=int(keys.max()),
+            row_count=int(keys.size),
+            checksum=file_checksum(path),
+            gap_count=count_gaps(keys, step_ns),
+        )
+
+    def replace_all(self, entries: Iterable[ManifestFile]) -> None:
+        """Swap the whole index for `entries` in one transaction (used by rebuild_manifest)."""
+        with self._connection:
+            self._connection.execute("DELETE FROM files")
+            self._connection.execute("DELETE FROM coverage")
+            self._write(list(entries), [])
+
+    def apply(self, added: Iterable[ManifestFile] = (), removed: Iterable[Path] = ()) -> None:
+        """Add/replace and remove file entries and refresh affected coverage rows in one transaction."""
+        removed_paths = [self._relative(path) for path in removed]
+        with self._connection:
+            self._write(list(added), removed_paths)
+
+    def _write(self, added: list[ManifestFile], removed_paths: list[str]) -> None:
+        series = {(entry.table, entry.pair, entry.interval) for entry in added}
+        for path in removed_paths:
+            row = self._connection.execute(
+                "SELECT table_name, pair, interval FROM files WHERE path = ?", (path,)
+            ).fetchone()
+            if row is not None:
+                series.add(tuple(row))
+        self._connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed_paths])
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    entry.path,
+                    entry.table,
+                    entry.pair,
+                    entry.interval,
+                    entry.day,
+                    entry.min_ts,
+                    entry.max_ts,
+                    entry.row_count,
+                    entry.checksum,
+                    entry.gap_count,
+                )
+                for entry in added
+            ],
+        )
+        for key in series:
+            self._refresh_coverage(*key)
+
+    def _refresh_coverage(self, table: str, pair: str, interval: str) -> None:
+        row = self._connection.execute(
+            """
+            SELECT MIN(min_ts), MAX(max_ts), SUM(row_count), COUNT(*), SUM(gap_count)
+            FROM files WHERE table_name = ? AND pair = ? AND interval = ?
+            """,
+            (table, pair, interval),
+        ).fetchone()
+        if not row or row[3] == 0:
+            self._connection.execute(
+                "DELETE FROM coverage WHERE table_name = ? AND pair = ? AND interval = ?", (table, pair, interval)
+            )
+            return
+        self._connection.execute(
+            "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (table, pair, interval, *row)
+        )
+
+    def files(
+        self, table: str, pair: str, interval: str, start: int | None = None, end: int | None = None
+    ) -> list[Path]:
+        """Files whose [min_ts, max_ts] overlaps [start, end], in write order within each partition."""
+        query = "SELECT path FROM files WHERE table_name = ? AND pair = ? AND interval = ?"
+        params: list[object] = [table, pair, interval]
+        if start is not None:
+            query += " AND max_ts >= ?"
+            params.append(int(start))
+        if end is not None:
+            query += " AND min_ts <= ?"
+            params.append(int(end))
+        # data.parquet sorts before part-* in the same partition, matching partition_files().
+        rows = self._connection.execute(query + " ORDER BY path", params).fetchall()
+        return [self.root / path for (path,) in rows]
+
+    def entries(self, table: str, pair: str, interval: str) -> list[ManifestFile]:
+        rows = self._connection.execute(
+            "SELECT * FROM files WHERE table_name = ? AND pair = ? AND interval = ? ORDER BY path",
+            (table, pair, interval),
+        ).fetchall()
+        return [ManifestFile(*row) for row in rows]
+
+    def coverage(self, table: str | None = None, pair: str | None = None, interval: str | None = None) -> list[Coverage]:
+        query = "SELECT * FROM coverage WHERE 1 = 1"
+        params: list[object] = []
+        for column, value in (("table_name", table), ("pair", pair), ("interval", interval)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        rows = self._connection.execute(query + " ORDER BY table_name, pair, interval", params).fetchall()
+        return [Coverage(*row) for row in rows]
+
+    def _relative(self, path: Path | str) -> str:
+        return Path(path).resolve().relative_to(self.root).as_posix()
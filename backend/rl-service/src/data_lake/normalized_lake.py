@@ -6,8 +6,14 @@ compatible with ParquetDataCatalog. Use for Nautilus-ready normalized layer.
 from __future__ import annotations
 
 import os
+import re
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable
+
+import numpy as np
+
+from data.bar_frame import BAR_COLUMNS, BarFrame
+from data.timestamp_index import timestamp_to_nanos
 
 if TYPE_CHECKING:
     from nautilus_trader.model.data import Bar
@@ -84,6 +90,130 @@ def load_bars_from_catalog(
     return out
 
 
+def load_bar_frame_from_catalog(
+    catalog_path: str | Path,
+    instrument_id: str | InstrumentId,
+    bar_type_str: str | None = None,
+) -> BarFrame:
+    """Like load_bars_from_catalog, but returns columns directly without building dict rows."""
+    from nautilus_trader.model.identifiers import InstrumentId
+    from nautilus_trader.persistence.catalog.parquet import ParquetDataCatalog
+
+    path = Path(catalog_path).resolve()
+    if not path.is_dir():
+        return BarFrame.empty()
+    catalog = ParquetDataCatalog(str(path))
+    iid = instrument_id if isinstance(instrument_id, InstrumentId) else InstrumentId.from_str(str(instrument_id))
+    try:
+        data = catalog.bars(instrument_id=iid, bar_type=bar_type_str) if bar_type_str else catalog.bars(instrument_id=iid)
+    except Exception:
+        return BarFrame.empty()
+    count = len(data)
+    return BarFrame(
+        np.fromiter((bar.ts_event for bar in data), dtype=np.int64, count=count),
+        np.fromiter((bar.open.as_double() for bar in data), dtype=np.float64, count=count),
+        np.fromiter((bar.high.as_double() for bar in data), dtype=np.float64, count=count),
+        np.fromiter((bar.low.as_double() for bar in data), dtype=np.float64, count=count),
+        np.fromiter((bar.close.as_double() for bar in data), dtype=np.float64, count=count),
+        np.fromiter((bar.volume.as_double() for bar in data), dtype=np.float64, count=count),
+    )
+
+
+# Catalog file names carry the first/last ts_event: 2024-01-01T00-00-00-000000000Z_2024-01-01T01-39-00-000000000Z
+_CATALOG_FILE_BOUND = re.compile(r"^(\d{4}-\d{2}-\d{2})T(\d{2})-(\d{2})-(\d{2})-(\d{9})Z$")
+
+
+def _catalog_file_bounds(path: Path) -> tuple[int, int] | None:
+    bounds = []
+    for part in path.stem.split("_"):
+        match = _CATALOG_FILE_BOUND.match(part)
+        if match is None:
+            return None
+        day, hours, minutes, seconds, nanos = match.groups()
+        bounds.append(timestamp_to_nanos(f"{day}T{hours}:{minutes}:{seconds}+00:00") + int(nanos))
+    return (bounds[0], bounds[1]) if len(bounds) == 2 else None
+
+
+def _nanos_bound(value: object | None) -> int | None:
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    return timestamp_to_nanos(value)
+
+
+def _decode_fixed_point(column) -> np.ndarray:
+    """Nautilus fixed-point raws (16-byte int128 high-precision or 8-byte int64) to float64."""
+    width = column.type.byte_width
+    # Raw scale follows the build's precision mode, which the value width identifies.
+    scalar = 1e16 if width == 16 else 1e9
+    values = []
+    for chunk in column.chunks:
+        raw = np.frombuffer(chunk.buffers()[1], dtype=np.uint8)[chunk.offset * width : (chunk.offset + len(chunk)) * width]
+        if width == 16:
+            words = raw.view("<u8").reshape(-1, 2)
+            high = words[:, 1].view(np.int64).astype(np.float64)
+            values.append((high * 18446744073709551616.0 + words[:, 0].astype(np.float64)) / scalar)
+        else:
+            values.append(raw.view("<i8").astype(np.float64) / scalar)
+    return np.concatenate(values) if values else np.empty(0, dtype=np.float64)
+
+
+def load_bar_columns_from_catalog(
+    catalog_path: str | Path,
+    instrument_id: str | InstrumentId,
+    bar_type_str: str | None = None,
+    start: object | None = None,
+    end: object | None = None,
+    columns: Iterable[str] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Range read straight from the catalog's bar Parquet files without building Bar objects. Files
+    whose name bounds miss [start, end] are skipped, the ts_event predicate prunes row groups by
+    their statistics, and fixed-point columns are decoded to float64 in bulk. Returns "timestamp"
+    (ts_event, int64 ns) plus the requested OHLCV columns (all by default).
+    """
+    import pyarrow.dataset as ds
+
+    requested = list(columns) if columns is not None else list(BAR_COLUMNS)
+    unknown = [name for name in requested if name not in BAR_COLUMNS]
+    if unknown:
+        raise ValueError(f"unknown bar columns {unknown}; choose from {BAR_COLUMNS}")
+    empty = {"timestamp": np.empty(0, dtype=np.int64), **{name: np.empty(0, dtype=np.float64) for name in requested}}
+
+    bar_root = Path(catalog_path).resolve() / "data" / "bar"
+    if bar_type_str is None:
+        candidates = sorted(bar_root.glob(f"{instrument_id}-*")) if bar_root.is_dir() else []
+        if len(candidates) > 1:
+            raise ValueError(f"{instrument_id} has several bar types; pass bar_type_str")
+        if not candidates:
+            return empty
+        bar_dir = candidates[0]
+    else:
+        bar_dir = bar_root / bar_type_str
+    lower, upper = _nanos_bound(start), _nanos_bound(end)
+
+    files = []
+    for path in sorted(bar_dir.glob("*.parquet")) if bar_dir.is_dir() else []:
+        bounds = _catalog_file_bounds(path)
+        if bounds is not None and ((lower is not None and bounds[1] < lower) or (upper is not None and bounds[0] > upper)):
+            continue
+        files.append(str(path))
+    if not files:
+        return empty
+
+    predicate = None
+    if lower is not None:
+        predicate = ds.field("ts_event") >= lower
+    if upper is not None:
+        bound = ds.field("ts_event") <= upper
+        predicate = bound if predicate is None else predicate & bound
+    table = ds.dataset(files, format="parquet").to_table(columns=["ts_event", *requested], filter=predicate)
+    table = table.sort_by("ts_event")
+    result = {"timestamp": table.column("ts_event").to_numpy().astype(np.int64)}
+    for name in requested:
+        result[name] = _decode_fixed_point(table.column(name))
+    return result
+
+
 def _ts_nanos_to_iso(ts_nanos: int) -> str:
     from datetime import datetime, timezone
     ts_sec = ts_nanos / 1_000_000_000
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from collections.abc import Sequence
 from typing import Iterable
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from features.normalization import NormalizationStats
 from features.technical_pipeline import build_feature_snapshot
 from schemas import MarketSnapshot
 
@@ -29,6 +32,61 @@ class WindowFeatures:
     funding_rate: float
 
 
+@dataclass
+class SeriesFeatures:
+    """Per-bar observations for a contiguous series; row ``i`` ends at bar ``i + window_size - 1``."""
+
+    observations: np.ndarray
+    closes: np.ndarray
+    funding_rates: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.observations.shape[0])
+
+    def normalized(self, normalization: NormalizationStats | None) -> SeriesFeatures:
+        if normalization is None:
+            return self
+        return SeriesFeatures(
+            observations=normalization.apply(self.observations),
+            closes=self.closes,
+            funding_rates=self.funding_rates,
+        )
+
+    def with_history(self, history_length: int) -> SeriesFeatures:
+        """Stack the last ``history_length`` rows per step; bars without a full history are dropped."""
+        if history_length <= 1:
+            return self
+        offset = history_length - 1
+        return SeriesFeatures(
+            observations=stack_history(self.observations, history_length),
+            closes=self.closes[offset:],
+            funding_rates=self.funding_rates[offset:],
+        )
+
+
+def stack_history(observations: np.ndarray, history_length: int) -> np.ndarray:
+    """Read-only strided view of shape (rows - K + 1, K, features); no feature rows are copied."""
+    if history_length <= 0:
+        raise ValueError("history_length must be positive")
+    if observations.shape[0] < history_length:
+        raise ValueError("not enough observation rows for the requested history_length")
+    return sliding_window_view(observations, history_length, axis=0).transpose(0, 2, 1)
+
+
+def pad_history(observations: np.ndarray, history_length: int) -> np.ndarray:
+    """Repeat the first row so every row, including the earliest, has ``history_length`` predecessors."""
+    if history_length <= 1 or observations.shape[0] == 0:
+        return observations
+    padding = np.repeat(observations[:1], history_length - 1, axis=0)
+    return np.concatenate([padding, observations], axis=0)
+
+
+def observation_shape(feature_count: int, history_length: int = 1) -> tuple[int, ...]:
+    if history_length <= 1:
+        return (feature_count,)
+    return (history_length, feature_count)
+
+
 def _safe_float(value: object, default: float = 0.0) -> float:
     try:
         parsed = float(value)
@@ -137,26 +195,140 @@ def _compute_window_features(
     )
 
 
+def build_series_features(
+    rows: list[dict],
+    window_size: int,
+    feature_keys: Iterable[str],
+    technical_config: dict | None = None,
+) -> SeriesFeatures:
+    if window_size <= 0:
+        raise ValueError("window_size must be positive")
+    resolved_keys = list(feature_keys)
+    count = max(0, len(rows) - window_size + 1)
+    observations = np.zeros((count, len(resolved_keys)), dtype=np.float32)
+    closes = np.zeros(count, dtype=np.float64)
+    funding_rates = np.zeros(count, dtype=np.float64)
+    for idx in range(count):
+        features = _compute_window_features(rows[idx : idx + window_size], resolved_keys, technical_config)
+        observations[idx] = features.observation
+        closes[idx] = features.current_close
+        funding_rates[idx] = features.funding_rate
+    return SeriesFeatures(observations=observations, closes=closes, funding_rates=funding_rates)
+
+
+def build_window_observations(
+    windows: Sequence[list[dict]],
+    feature_keys: Iterable[str],
+    technical_config: dict | None = None,
+) -> np.ndarray:
+    resolved_keys = list(feature_keys)
+    observations = np.zeros((len(windows), len(resolved_keys)), dtype=np.float32)
+    for idx, window in enumerate(windows):
+        observations[idx] = _compute_window_features(window, resolved_keys, technical_config).observation
+    return observations
+
+
+def _normalize(observation: np.ndarray, normalization: NormalizationStats | None) -> np.ndarray:
+    if normalization is None:
+        return observation
+    return normalization.apply(observation)
+
+
+def _window_closes(windows: Sequence[list[dict]]) -> np.ndarray:
+    closes = np.zeros(len(windows), dtype=np.float64)
+    previous = 0.0
+    for idx, window in enumerate(windows):
+        previous = _safe_float(window[-1].get("close"), previous) if window else previous
+        closes[idx] = previous
+    return closes
+
+
+def _window_history(
+    windows: Sequence[list[dict]],
+    feature_keys: list[str],
+    history_length: int,
+    normalization: NormalizationStats | None,
+    technical_config: dict | None = None,
+) -> np.ndarray | None:
+    if history_length <= 1:
+        return None
+    observations = _normalize(build_window_observations(windows, feature_keys, technical_config), normalization)
+    return stack_history(pad_history(observations, history_length), history_length)
+
+
+def _settle_span(
+    closes: np.ndarray,
+    funding_rates: np.ndarray,
+    target_position: float,
+    prev_position: float,
+    equity: float,
+    equity_peak: float,
+    leverage: float,
+    cost_rate: float,
+    funding_weight: float,
+    drawdown_penalty: float,
+) -> tuple[float, float, float, float]:
+    """
+    Settle one held action over ``len(funding_rates)`` bars in a single vectorized pass.
+    ``closes`` holds the entry close followed by each held bar's close. The result equals
+    stepping bar by bar with the same action: turnover is only charged on the first bar and
+    bars with a non-positive entry close contribute nothing.
+    Returns (reward, gross_pnl, equity, equity_peak).
+    """
+    entry = closes[:-1]
+    valid = entry > 0
+    moves = np.divide(closes[1:] - entry, entry, out=np.zeros_like(entry), where=valid)
+    gross = target_position * moves * leverage
+    funding = np.where(valid, target_position * funding_rates * funding_weight * leverage, 0.0)
+    costs = np.zeros_like(gross)
+    if valid[0]:
+        costs[0] = abs(target_position - prev_position) * cost_rate
+    step_pnl = gross - costs - funding
+    equity_path = equity + np.cumsum(step_pnl)
+    peak_path = np.maximum(np.maximum.accumulate(equity_path), equity_peak)
+    drawdowns = np.maximum(0.0, peak_path - equity_path)
+    rewards = np.where(valid, step_pnl - drawdown_penalty * drawdowns, 0.0)
+    return float(rewards.sum()), float(gross.sum()), float(equity_path[-1]), float(peak_path[-1])
+
+
 class MarketWindowEnv(gym.Env):
+    """
+    Continuous-action env replaying ``windows`` in order. With ``decision_interval=k`` each
+    action is held for k bars and the rewards, costs and funding over the span are settled at once.
+    """
+
     metadata = {"render_modes": []}
 
     def __init__(
         self,
-        windows: list[list[dict]],
+        windows: Sequence[list[dict]],
         feature_keys: list[str],
         leverage: float = 1.0,
         taker_fee_bps: float = 0.0,
         slippage_bps: float = 0.0,
         funding_weight: float = 1.0,
         drawdown_penalty: float = 0.0,
+        normalization: NormalizationStats | None = None,
+        history_length: int = 1,
+        decision_interval: int = 1,
     ):
         super().__init__()
         if not windows:
             raise ValueError("windows must not be empty")
+        if decision_interval < 1:
+            raise ValueError("decision_interval must be positive")
         self._windows = windows
         self._feature_keys = feature_keys
+        self._normalization = normalization
+        self._history = _window_history(windows, feature_keys, history_length, normalization)
+        self._closes = _window_closes(windows)
+        self._funding_rates = np.array(
+            [_safe_float(window[-1].get("funding_rate"), 0.0) if window else 0.0 for window in windows],
+            dtype=np.float64,
+        )
+        self._decision_interval = int(decision_interval)
         self._index = 0
-        self._last_close = _safe_float(windows[0][-1].get("close"), 0.0)
+        self._last_close = float(self._closes[0])
         self._leverage = max(0.0, float(leverage))
         self._taker_fee_rate = max(0.0, float(taker_fee_bps)) / 10_000.0
         self._slippage_rate = max(0.0, float(slippage_bps)) / 10_000.0
@@ -170,53 +342,154 @@ class MarketWindowEnv(gym.Env):
         self.observation_space = gym.spaces.Box(
             low=-np.inf,
             high=np.inf,
-            shape=(len(feature_keys),),
+            shape=observation_shape(len(feature_keys), history_length),
             dtype=np.float32,
         )
 
+    def _observe(self, index: int) -> np.ndarray:
+        if self._history is not None:
+            return self._history[index]
+        features = _compute_window_features(self._windows[index], self._feature_keys)
+        return _normalize(features.observation, self._normalization)
+
     def reset(self, *, seed: int | None = None, options: dict | None = None):
         super().reset(seed=seed)
         self._index = 0
-        self._last_close = _safe_float(self._windows[0][-1].get("close"), 0.0)
+        self._last_close = float(self._closes[0])
         self._prev_position = 0.0
         self._equity = 1.0
         self._equity_peak = 1.0
-        features = _compute_window_features(self._windows[self._index], self._feature_keys)
-        return features.observation, {}
+        return self._observe(self._index), {}
 
     def step(self, action: np.ndarray):
         score = float(action[0]) if action is not None else 0.0
         target_position = float(np.clip(score, -1.0, 1.0))
-        current_window = self._windows[self._index]
-        features = _compute_window_features(current_window, self._feature_keys)
-        current_close = features.current_close
+        last_index = len(self._windows) - 1
+        if self._index >= last_index:
+            self._index = len(self._windows)
+            return self._observe(last_index), 0.0, True, False, {}
+
+        start = self._index
+        end = min(start + self._decision_interval, last_index)
+        reward, gross_pnl, self._equity, self._equity_peak = _settle_span(
+            self._closes[start : end + 1],
+            self._funding_rates[start:end],
+            target_position,
+            self._prev_position,
+            self._equity,
+            self._equity_peak,
+            self._leverage,
+            self._taker_fee_rate + self._slippage_rate,
+            self._funding_weight,
+            self._drawdown_penalty,
+        )
+        self._prev_position = target_position
+        self._last_close = float(self._closes[end])
+        self._index = end
+        return self._observe(end), reward, False, False, {"gross_pnl": gross_pnl, "bars": end - start}
 
-        self._index += 1
-        done = self._index >= len(self._windows)
-        if done:
-            return features.observation, 0.0, True, False, {}
 
-        next_window = self._windows[self._index]
-        next_close = _safe_float(next_window[-1].get("close"), current_close)
-        if current_close <= 0:
-            reward = 0.0
-            gross_pnl = 0.0
-        else:
-            pct_move = (next_close - current_close) / current_close
-            gross_pnl = target_position * pct_move * self._leverage
-            turnover = abs(target_position - self._prev_position)
-            transaction_cost = turnover * (self._taker_fee_rate + self._slippage_rate)
-            funding_cost = target_position * features.funding_rate * self._funding_weight * self._leverage
-            step_pnl = gross_pnl - transaction_cost - funding_cost
-            self._equity += step_pnl
-            self._equity_peak = max(self._equity_peak, self._equity)
-            drawdown = max(0.0, self._equity_peak - self._equity)
-            reward = step_pnl - self._drawdown_penalty * drawdown
+class MarketSeriesEnv(gym.Env):
+    """
+    Continuous-action env over one contiguous series with random-start episodes.
+    Observations are computed once per bar; each reset samples a start offset and an
+    episode length from the seeded env RNG. Hitting the episode length or the end of
+    the series is reported as ``truncated`` (time limit), never ``terminated``; stepping
+    past that point without ``reset()`` raises.
+    Episode lengths count bars, so ``decision_interval=k`` needs about k× fewer steps.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(
+        self,
+        rows: list[dict],
+        feature_keys: list[str],
+        window_size: int,
+        episode_length: int | None = None,
+        min_episode_length: int | None = None,
+        leverage: float = 1.0,
+        taker_fee_bps: float = 0.0,
+        slippage_bps: float = 0.0,
+        funding_weight: float = 1.0,
+        drawdown_penalty: float = 0.0,
+        technical_config: dict | None = None,
+        normalization: NormalizationStats | None = None,
+        series_features: SeriesFeatures | None = None,
+        history_length: int = 1,
+        decision_interval: int = 1,
+    ):
+        super().__init__()
+        if decision_interval < 1:
+            raise ValueError("decision_interval must be positive")
+        self._feature_keys = list(feature_keys)
+        series = series_features or build_series_features(rows, window_size, self._feature_keys, technical_config)
+        if len(series) < history_length + 1:
+            raise ValueError("series must contain at least window_size + history_length rows")
+        # Normalize the whole matrix once so steps only index precomputed (strided) rows.
+        self._series = series.normalized(normalization).with_history(history_length)
+        max_steps = len(self._series) - 1
+        resolved_length = max_steps if episode_length is None else max(1, min(int(episode_length), max_steps))
+        resolved_min = resolved_length if min_episode_length is None else max(1, int(min_episode_length))
+        self._episode_length = resolved_length
+        self._min_episode_length = min(resolved_min, resolved_length)
+        self._decision_interval = int(decision_interval)
+        self._leverage = max(0.0, float(leverage))
+        self._taker_fee_rate = max(0.0, float(taker_fee_bps)) / 10_000.0
+        self._slippage_rate = max(0.0, float(slippage_bps)) / 10_000.0
+        self._funding_weight = max(0.0, float(funding_weight))
+        self._drawdown_penalty = max(0.0, float(drawdown_penalty))
+        self._index = 0
+        self._end_index = resolved_length
+        self._prev_position = 0.0
+        self._equity = 1.0
+        self._equity_peak = 1.0
+
+        self.action_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(1,), dtype=np.float32)
+        self.observation_space = gym.spaces.Box(
+            low=-np.inf,
+            high=np.inf,
+            shape=observation_shape(len(self._feature_keys), history_length),
+            dtype=np.float32,
+        )
+
+    def reset(self, *, seed: int | None = None, options: dict | None = None):
+        super().reset(seed=seed)
+        max_steps = len(self._series) - 1
+        length = int(self.np_random.integers(self._min_episode_length, self._episode_length + 1))
+        start = int(self.np_random.integers(0, max_steps - length + 1))
+        self._index = start
+        self._end_index = start + length
+        self._prev_position = 0.0
+        self._equity = 1.0
+        self._equity_peak = 1.0
+        return self._series.observations[start], {"start_index": start, "episode_length": length}
+
+    def step(self, action: np.ndarray):
+        if self._index >= self._end_index:
+            raise RuntimeError("episode is truncated; call reset() before step()")
+        score = float(np.ravel(action)[0]) if action is not None else 0.0
+        target_position = float(np.clip(score, -1.0, 1.0))
+        start = self._index
+        end = min(start + self._decision_interval, self._end_index)
+        reward, gross_pnl, self._equity, self._equity_peak = _settle_span(
+            self._series.closes[start : end + 1],
+            self._series.funding_rates[start:end],
+            target_position,
+            self._prev_position,
+            self._equity,
+            self._equity_peak,
+            self._leverage,
+            self._taker_fee_rate + self._slippage_rate,
+            self._funding_weight,
+            self._drawdown_penalty,
+        )
         self._prev_position = target_position
-        self._last_close = next_close
+        self._index = end
 
-        next_features = _compute_window_features(next_window, self._feature_keys)
-        return next_features.observation, float(reward), False, False, {"gross_pnl": gross_pnl}
+        truncated = self._index >= self._end_index
+        observation = self._series.observations[self._index]
+        return observation, reward, False, truncated, {"gross_pnl": gross_pnl, "bars": end - start}
 
 
 def _realized_volatility(closes: list[float], window: int = 20) -> float:
@@ -240,13 +513,14 @@ class MarketWindowDiscreteEnv(gym.Env):
     Gymnasium env with discrete action space: 0=Flat, 1=Long, 2=Short.
     Reward = ΔEquity - fees - funding - risk_penalty - turnover_penalty.
     Execution convention: interpret action as target position; trade at next bar open.
+    With ``decision_interval=k`` each action is held for k windows and the per-bar rewards are summed.
     """
 
     metadata = {"render_modes": []}
 
     def __init__(
         self,
-        windows: list[list[dict]],
+        windows: Sequence[list[dict]],
         feature_keys: list[str],
         leverage: float = 1.0,
         taker_fee_bps: float = 0.0,
@@ -256,13 +530,21 @@ class MarketWindowDiscreteEnv(gym.Env):
         risk_penalty_lambda: float = DEFAULT_RISK_PENALTY_LAMBDA,
         turnover_penalty_kappa: float = DEFAULT_TURNOVER_PENALTY_KAPPA,
         technical_config: dict | None = None,
+        normalization: NormalizationStats | None = None,
+        history_length: int = 1,
+        decision_interval: int = 1,
     ):
         super().__init__()
         if not windows:
             raise ValueError("windows must not be empty")
+        if decision_interval < 1:
+            raise ValueError("decision_interval must be positive")
         self._windows = windows
         self._feature_keys = list(feature_keys)
+        self._decision_interval = int(decision_interval)
         self._technical_config = technical_config
+        self._normalization = normalization
+        self._history = _window_history(windows, self._feature_keys, history_length, normalization, technical_config)
         self._index = 0
         self._leverage = max(0.0, float(leverage))
         self._taker_fee_rate = max(0.0, float(taker_fee_bps)) / 10_000.0
@@ -279,10 +561,15 @@ class MarketWindowDiscreteEnv(gym.Env):
         self.observation_space = gym.spaces.Box(
             low=-np.inf,
             high=np.inf,
-            shape=(len(self._feature_keys),),
+            shape=observation_shape(len(self._feature_keys), history_length),
             dtype=np.float32,
         )
 
+    def _observe(self, index: int, observation: np.ndarray) -> np.ndarray:
+        if self._history is not None:
+            return self._history[index]
+        return _normalize(observation, self._normalization)
+
     def _action_to_position(self, action: int) -> float:
         if action == ACTION_LONG:
             return 1.0
@@ -299,12 +586,37 @@ class MarketWindowDiscreteEnv(gym.Env):
         features = _compute_window_features(
             self._windows[self._index], self._feature_keys, self._technical_config
         )
-        return features.observation, {}
+        return self._observe(self._index, features.observation), {}
 
     def step(self, action: int | np.ndarray):
         if isinstance(action, np.ndarray):
             action = int(np.ravel(action)[0])
         target_position = self._action_to_position(action)
+        last_index = len(self._windows) - 1
+        if self._index >= last_index:
+            features = _compute_window_features(
+                self._windows[last_index], self._feature_keys, self._technical_config
+            )
+            self._index = len(self._windows)
+            return self._observe(last_index, features.observation), 0.0, True, False, {}
+
+        start = self._index
+        end = min(start + self._decision_interval, last_index)
+        reward = 0.0
+        gross_pnl = 0.0
+        while self._index < end:
+            bar_reward, bar_pnl = self._settle_bar(target_position)
+            reward += bar_reward
+            gross_pnl += bar_pnl
+
+        next_features = _compute_window_features(
+            self._windows[self._index], self._feature_keys, self._technical_config
+        )
+        observation = self._observe(self._index, next_features.observation)
+        return observation, float(reward), False, False, {"gross_pnl": gross_pnl, "bars": end - start}
+
+    def _settle_bar(self, target_position: float) -> tuple[float, float]:
+        """Hold ``target_position`` from the current window to the next; returns (reward, gross_pnl)."""
         current_window = self._windows[self._index]
         features = _compute_window_features(
             current_window, self._feature_keys, self._technical_config
@@ -312,10 +624,6 @@ class MarketWindowDiscreteEnv(gym.Env):
         current_close = features.current_close
 
         self._index += 1
-        done = self._index >= len(self._windows)
-        if done:
-            return features.observation, 0.0, True, False, {}
-
         next_window = self._windows[self._index]
         next_close = _safe_float(next_window[-1].get("close"), current_close)
         gross_pnl = 0.0
@@ -336,8 +644,4 @@ class MarketWindowDiscreteEnv(gym.Env):
         drawdown = max(0.0, self._equity_peak - self._equity)
         reward = step_pnl - self._drawdown_penalty * drawdown
         self._prev_position = target_position
-
-        next_features = _compute_window_features(
-            next_window, self._feature_keys, self._technical_config
-        )
-        return next_features.observation, float(reward), False, False, {"gross_pnl": gross_pnl}
+        return float(reward), gross_pnl
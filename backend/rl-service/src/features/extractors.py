@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import Iterable
 
+import numpy as np
+
+from features.normalization import normalization_from_spec
 from features.technical_pipeline import (
     AUX_FEATURE_KEYS,
     BASE_FEATURE_KEYS,
@@ -124,6 +127,83 @@ def extract_features(
     ).features
 
 
+def extract_feature_history(
+    market: MarketSnapshot,
+    ideas: Iterable[AuxiliarySignal],
+    signals: Iterable[AuxiliarySignal],
+    news: Iterable[AuxiliarySignal],
+    ocr: Iterable[AuxiliarySignal],
+    feature_keys: list[str],
+    history_length: int,
+    window_size: int | None = None,
+    technical_config: dict | None = None,
+    stride: int = 1,
+) -> np.ndarray:
+    """
+    Feature vectors for the last ``history_length`` training steps (oldest first), ``stride``
+    bars apart, each computed over its trailing ``window_size`` candles. Missing history
+    repeats the earliest full window, matching the edge padding used by the training envs.
+    """
+    if stride < 1:
+        raise ValueError("stride must be positive")
+    ideas_list, signals_list, news_list, ocr_list = list(ideas), list(signals), list(news), list(ocr)
+    candles = market.candles
+    total = len(candles)
+    earliest_end = min(total, window_size) if window_size else total
+    rows: list[list[float]] = []
+    for offset in range(history_length - 1, -1, -1):
+        end = max(earliest_end, total - offset * stride)
+        start = max(0, end - window_size) if window_size else 0
+        window_market = market.model_copy(
+            update={"candles": candles[start:end], "last_price": market.last_price if offset == 0 else None}
+        )
+        features = build_feature_snapshot(
+            window_market,
+            ideas=ideas_list,
+            signals=signals_list,
+            news=news_list,
+            ocr=ocr_list,
+            technical_config=technical_config,
+        ).features
+        rows.append(vectorize(features, feature_keys))
+    return np.array(rows, dtype=float)
+
+
+def build_policy_observation(
+    market: MarketSnapshot,
+    ideas: Iterable[AuxiliarySignal],
+    signals: Iterable[AuxiliarySignal],
+    news: Iterable[AuxiliarySignal],
+    ocr: Iterable[AuxiliarySignal],
+    features: dict[str, float],
+    observation_spec: dict | None = None,
+    technical_config: dict | None = None,
+) -> np.ndarray:
+    """Shape the live observation exactly like the training env described by the artifact's observation spec."""
+    spec = observation_spec or {}
+    normalization = normalization_from_spec(spec)
+    feature_keys = spec.get("feature_keys") or (normalization.feature_keys if normalization is not None else None)
+    history_length = int(spec.get("history_length") or 1)
+    if history_length > 1:
+        observation = extract_feature_history(
+            market,
+            ideas,
+            signals,
+            news,
+            ocr,
+            feature_keys=feature_keys or FEATURE_KEYS,
+            history_length=history_length,
+            window_size=spec.get("window_size"),
+            technical_config=technical_config,
+            stride=int(spec.get("stride") or 1),
+        )
+    else:
+        observation = np.array(vectorize_features(features, feature_keys), dtype=float)
+    if normalization is not None:
+        observation = normalization.apply(observation)
+    return observation
+
+
 def feature_keys_for(features: dict[str, float]) -> list[str]:
     fixed_keys = BASE_FEATURE_KEYS + FUTURES_FEATURE_KEYS + AUX_FEATURE_KEYS
     indicator_keys = sorted([key for key in features if key not in fixed_keys])
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# Observation normalization methods: none, z-score (mean/std), robust (median/IQR)
+NORMALIZATION_NONE = "none"
+NORMALIZATION_ZSCORE = "zscore"
+NORMALIZATION_ROBUST = "robust"
+NORMALIZATION_METHODS = (NORMALIZATION_NONE, NORMALIZATION_ZSCORE, NORMALIZATION_ROBUST)
+DEFAULT_NORMALIZATION_CLIP = 10.0
+
+
+@dataclass(frozen=True)
+class NormalizationStats:
+    method: str
+    feature_keys: list[str]
+    center: np.ndarray
+    scale: np.ndarray
+    clip: float = DEFAULT_NORMALIZATION_CLIP
+
+    def apply(self, observations: np.ndarray) -> np.ndarray:
+        values = np.asarray(observations, dtype=np.float64)
+        normalized = (values - self.center) / self.scale
+        if self.clip > 0:
+            np.clip(normalized, -self.clip, self.clip, out=normalized)
+        return normalized.astype(np.float32)
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "feature_keys": list(self.feature_keys),
+            "center": [float(value) for value in self.center],
+            "scale": [float(value) for value in self.scale],
+            "clip": float(self.clip),
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> NormalizationStats:
+        feature_keys = [str(key) for key in payload.get("feature_keys") or []]
+        center = np.asarray(payload.get("center") or [], dtype=np.float64)
+        scale = np.asarray(payload.get("scale") or [], dtype=np.float64)
+        if not (len(feature_keys) == center.shape[0] == scale.shape[0]):
+            raise ValueError("normalization stats must have one center/scale per feature key")
+        return cls(
+            method=str(payload.get("method", NORMALIZATION_ZSCORE)),
+            feature_keys=feature_keys,
+            center=center,
+            scale=scale,
+            clip=float(payload.get("clip", DEFAULT_NORMALIZATION_CLIP)),
+        )
+
+
+def compute_normalization_stats(
+    matrix: np.ndarray,
+    feature_keys: list[str],
+    method: str = NORMALIZATION_ZSCORE,
+    clip: float = DEFAULT_NORMALIZATION_CLIP,
+) -> NormalizationStats:
+    values = np.asarray(matrix, dtype=np.float64)
+    if values.ndim != 2 or values.shape[1] != len(feature_keys):
+        raise ValueError("matrix must be 2-D with one column per feature key")
+    if values.shape[0] == 0:
+        raise ValueError("matrix must contain at least one row")
+    if method == NORMALIZATION_ZSCORE:
+        center = values.mean(axis=0)
+        scale = values.std(axis=0)
+    elif method == NORMALIZATION_ROBUST:
+        lower, center, upper = np.quantile(values, [0.25, 0.5, 0.75], axis=0)
+        scale = upper - lower
+    else:
+        raise ValueError(f"normalization method must be one of {NORMALIZATION_METHODS[1:]}, got {method!r}")
+    # Constant features keep their centered value instead of dividing by ~0.
+    scale = np.where(np.isfinite(scale) & (scale > 1e-12), scale, 1.0)
+    return NormalizationStats(method=method, feature_keys=list(feature_keys), center=center, scale=scale, clip=clip)
+
+
+def normalization_from_spec(spec: dict | None) -> NormalizationStats | None:
+    payload = (spec or {}).get("normalization")
+    if not payload:
+        return None
+    return NormalizationStats.from_dict(payload)
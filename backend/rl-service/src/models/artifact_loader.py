@@ -2,10 +2,15 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import io
 import json
+import zipfile
 from dataclasses import dataclass
 from urllib.request import Request, urlopen
 
+# Extra archive entry written next to the SB3 payload; SB3 ignores unknown non-.pth files on load.
+OBSERVATION_SPEC_ENTRY = "rl_observation.json"
+
 
 @dataclass(frozen=True)
 class ArtifactPayload:
@@ -36,3 +41,21 @@ def fetch_artifact(url: str, expected_checksum: str | None = None, timeout_s: in
 
 def serialize_metadata(metadata: dict) -> str:
     return json.dumps(metadata, sort_keys=True)
+
+
+def embed_observation_spec(payload: bytes, spec: dict) -> bytes:
+    buffer = io.BytesIO(payload)
+    with zipfile.ZipFile(buffer, mode="a", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(OBSERVATION_SPEC_ENTRY, json.dumps(spec, sort_keys=True))
+    return buffer.getvalue()
+
+
+def read_observation_spec(source: bytes | str) -> dict | None:
+    handle = io.BytesIO(source) if isinstance(source, bytes) else source
+    try:
+        with zipfile.ZipFile(handle) as archive:
+            if OBSERVATION_SPEC_ENTRY not in archive.namelist():
+                return None
+            return json.loads(archive.read(OBSERVATION_SPEC_ENTRY).decode("utf-8"))
+    except (zipfile.BadZipFile, OSError, ValueError):
+        return None
@@ -7,6 +7,8 @@ from typing import Any
 
 from hashlib import sha256
 
+from models.artifact_loader import read_observation_spec
+
 
 @dataclass
 class ModelMetadata:
@@ -21,6 +23,7 @@ class ModelRegistry:
     def __init__(self) -> None:
         self._models: dict[str, Any] = {}
         self._metadata: dict[str, ModelMetadata] = {}
+        self._observation_specs: dict[str, dict] = {}
 
     def register(self, version_id: str, model: Any, metadata: ModelMetadata | None = None) -> None:
         self._models[version_id] = model
@@ -44,16 +47,27 @@ class ModelRegistry:
     def load_from_bytes(self, version_id: str, payload: bytes, metadata: ModelMetadata | None = None) -> Any:
         model = load_sb3_model_from_bytes(payload)
         self.register(version_id, model, metadata=metadata)
+        self._register_observation_spec(version_id, read_observation_spec(payload))
         return model
 
     def load_from_file(self, version_id: str, file_path: str, metadata: ModelMetadata | None = None) -> Any:
         model = load_sb3_model(file_path)
         self.register(version_id, model, metadata=metadata)
+        self._register_observation_spec(version_id, read_observation_spec(file_path))
         return model
 
     def metadata(self, version_id: str) -> ModelMetadata | None:
         return self._metadata.get(version_id)
 
+    def observation_spec(self, version_id: str) -> dict | None:
+        return self._observation_specs.get(version_id)
+
+    def _register_observation_spec(self, version_id: str, spec: dict | None) -> None:
+        if spec:
+            self._observation_specs[version_id] = spec
+        else:
+            self._observation_specs.pop(version_id, None)
+
     def ensure_loaded(
         self,
         version_id: str,
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Literal
+from typing import Any, ClassVar, Literal
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+from data.bar_frame import BAR_COLUMNS, BarFrame
+from data.timestamp_index import timestamp_to_nanos
 
 
 class TradingPair(str, Enum):
@@ -28,11 +32,123 @@ class MarketCandle(BaseModel):
     volume: float
 
 
+TIMESTAMP_UNIT_NANOS = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+
+
+def check_candle_frame(frame: BarFrame) -> BarFrame:
+    if len(frame) > 1 and not np.all(np.diff(frame.timestamps) > 0):
+        raise ValueError("timestamps must be strictly increasing")
+    if not all(np.isfinite(frame.column(name)).all() for name in BAR_COLUMNS):
+        raise ValueError("open/high/low/close/volume must be finite")
+    return frame
+
+
+class CandleBatch(BaseModel):
+    """
+    Columnar candles: parallel arrays instead of one object per candle. Checks (equal lengths,
+    finite prices, strictly increasing time) run as NumPy expressions over whole columns.
+    Numeric timestamps are epoch values in `timestamp_unit`; strings are ISO-8601.
+    """
+
+    timestamp: list[int] | list[str]
+    open: list[float]
+    high: list[float]
+    low: list[float]
+    close: list[float]
+    volume: list[float]
+    timestamp_unit: Literal["s", "ms", "us", "ns"] = "ms"
+    extras: dict[str, list[float | None]] = Field(default_factory=dict)
+
+    # Strict finite/increasing checks; UncheckedCandleBatch turns them off.
+    check_values: ClassVar[bool] = True
+
+    _frame: BarFrame | None = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _validate_columns(self) -> CandleBatch:
+        if self._frame is not None:
+            # After-validators also run when an existing batch is passed into a parent model.
+            return self
+        count = len(self.timestamp)
+        for name in (*BAR_COLUMNS, *self.extras):
+            values = getattr(self, name) if name in BAR_COLUMNS else self.extras[name]
+            if len(values) != count:
+                raise ValueError(f"column {name!r} has {len(values)} values, expected {count}")
+        if self.timestamp and isinstance(self.timestamp[0], str):
+            timestamps = np.fromiter((timestamp_to_nanos(value) for value in self.timestamp), dtype=np.int64, count=count)
+        else:
+            timestamps = np.asarray(self.timestamp, dtype=np.int64) * TIMESTAMP_UNIT_NANOS[self.timestamp_unit]
+        columns = [np.asarray(getattr(self, name), dtype=np.float64) for name in BAR_COLUMNS]
+        extras = {name: np.array(values, dtype=np.float64) for name, values in self.extras.items()}
+        frame = BarFrame(timestamps, *columns, extras=extras)
+        self._frame = check_candle_frame(frame) if self.check_values else frame
+        return self
+
+    @classmethod
+    def from_bar_frame(cls, frame: BarFrame) -> CandleBatch:
+        """Wrap already-columnar data (binary uploads) without copying it into Python lists."""
+        batch = cls.model_construct(timestamp=[], open=[], high=[], low=[], close=[], volume=[])
+        batch._frame = check_candle_frame(frame) if cls.check_values else frame
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    def to_bar_frame(self) -> BarFrame:
+        return self._frame
+
+    def to_rows(self) -> list[dict]:
+        return self._frame.to_rows()
+
+    def to_market_candles(self) -> list[MarketCandle]:
+        frame = self._frame
+        return [
+            MarketCandle.model_construct(
+                timestamp=datetime.fromtimestamp(ts // 1_000_000_000, tz=timezone.utc).replace(
+                    microsecond=(ts % 1_000_000_000) // 1_000
+                ),
+                open=open_,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+            )
+            for ts, open_, high, low, close, volume in zip(
+                frame.timestamps.tolist(),
+                frame.open.tolist(),
+                frame.high.tolist(),
+                frame.low.tolist(),
+                frame.close.tolist(),
+                frame.volume.tolist(),
+            )
+        ]
+
+
+class UncheckedCandleBatch(CandleBatch):
+    """
+    Columnar candles that may be unsorted, duplicated or contain NaN/inf; only column lengths are
+    checked. Used where those defects are the input (data-quality reports), never for trading.
+    """
+
+    check_values: ClassVar[bool] = False
+
+
 class MarketSnapshot(BaseModel):
     pair: TradingPair
-    candles: list[MarketCandle]
+    candles: list[MarketCandle] | CandleBatch
     last_price: float | None = None
     spread: float | None = None
+    # Latest ticker row (last_price, volume_24h, price_change_24h, captured_at) when a source has one
+    ticker: dict[str, Any] | None = None
+    # Futures/ctx_* columns of the last candle, for sources that record them
+    extras: dict[str, float] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def _expand_candle_batch(self) -> MarketSnapshot:
+        # Feature code indexes candles by attribute; build them unvalidated from the checked columns.
+        if isinstance(self.candles, CandleBatch):
+            self.candles = self.candles.to_market_candles()
+        return self
 
 
 class AuxiliarySignal(BaseModel):
@@ -101,6 +217,7 @@ class WalkForwardConfig(BaseModel):
     embargo_bars: int = Field(default=0, ge=0)
     min_train_bars: int | None = Field(default=None, ge=1)
     strict: bool = True
+    split_by: Literal["bars", "time"] = "bars"
 
 
 class BacktestMode(str, Enum):
@@ -123,7 +240,8 @@ class EvaluationRequest(BaseModel):
     artifact_checksum: str | None = None
     artifact_download_url: str | None = None
     artifact_base64: str | None = None
-    dataset_features: list[dict] | None = None
+    dataset_features: list[dict] | CandleBatch | None = None
+    dataset_ref: str | None = None
     decision_threshold: float | None = None
     window_size: int = 30
     stride: int = 1
@@ -139,6 +257,7 @@ class EvaluationRequest(BaseModel):
     walk_forward: WalkForwardConfig | None = None
     feature_schema_fingerprint: str | None = None
     feature_key_extras: list[str] | None = None
+    dataset_hash_mode: Literal["merkle", "legacy"] = "merkle"
 
 
 class EvaluationReport(BaseModel):
@@ -177,6 +296,9 @@ class DatasetRequest(BaseModel):
     feature_set_version_id: str | None = None
     feature_schema_fingerprint: str | None = None
     features: list[dict] | None = None
+    hash_mode: Literal["merkle", "legacy"] = "merkle"
+    quality_check: bool = False
+    quality_repairs: list[Literal["forward_fill", "drop", "flag_gaps"]] = Field(default_factory=list)
 
 
 class DatasetVersionPayload(BaseModel):
@@ -189,14 +311,58 @@ class DatasetVersionPayload(BaseModel):
     dataset_hash: str | None = None
     window_size: int | None = None
     stride: int | None = None
+    hash_mode: str | None = None
     feature_set_version_id: str | None = None
     feature_schema_fingerprint: str | None = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class DatasetCacheRequest(BaseModel):
+    rows: list[dict] | CandleBatch
+    # Append `rows` to this cached dataset instead of storing them on their own.
+    base_ref: str | None = None
+
+
+class DatasetCacheResponse(BaseModel):
+    dataset_ref: str
+    row_count: int
+    columns: list[str]
+
+
+class DatasetCoverage(BaseModel):
+    table: Literal["candles", "tickers"]
+    pair: str
+    interval: str | None = None
+    first_at: datetime
+    last_at: datetime
+    row_count: int
+    file_count: int
+    gap_count: int
+
+
+class DatasetAvailabilityResponse(BaseModel):
+    series: list[DatasetCoverage]
+
+
 class DatasetPreviewResponse(BaseModel):
     version: DatasetVersionPayload
     window_count: int
+    quality: dict[str, Any] | None = None
+
+
+class DatasetValidateRequest(BaseModel):
+    rows: list[dict] | UncheckedCandleBatch
+    interval: str | None = None
+    outlier_zscore: float = Field(default=12.0, gt=0)
+    repairs: list[Literal["forward_fill", "drop", "flag_gaps"]] = Field(default_factory=list)
+    issue_row_limit: int = Field(default=100, ge=0)
+    return_rows: bool = False
+
+
+class DatasetValidateResponse(BaseModel):
+    summary: dict[str, Any]
+    issue_rows: dict[str, list[int]]
+    rows: list[dict] | None = None
 
 
 class DriftCheckRequest(BaseModel):
@@ -222,7 +388,8 @@ class TrainingRequest(BaseModel):
     interval: str = "1m"
     context_intervals: list[str] = Field(default_factory=list)
     dataset_hash: str | None = None
-    dataset_features: list[dict] | None = None
+    dataset_features: list[dict] | CandleBatch | None = None
+    dataset_ref: str | None = None
     window_size: int = 30
     stride: int = 1
     leverage: float = 1.0
@@ -237,6 +404,12 @@ class TrainingRequest(BaseModel):
     seed: int | None = None
     feature_schema_fingerprint: str | None = None
     feature_key_extras: list[str] | None = None
+    episode_mode: Literal["windows", "random_start"] = "windows"
+    episode_length: int | None = Field(default=None, ge=1)
+    min_episode_length: int | None = Field(default=None, ge=1)
+    observation_normalization: Literal["none", "zscore", "robust"] = "none"
+    history_length: int = Field(default=1, ge=1, le=256)
+    decision_interval: int = Field(default=1, ge=1)
 
 
 class TrainingResponse(BaseModel):
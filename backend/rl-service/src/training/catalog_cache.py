@@ -0,0 +1,159 @@
+"""
+Persistent, content-addressed Nautilus catalogs for backtests. A catalog holding one instrument and
+its bars is keyed by (pair, venue, interval, resolved instrument meta, bar data hash) and written
+once under root/<key[:2]>/<key>; repeated evaluations over the same data (walk-forward folds,
+interval matrices, re-runs) reuse it instead of rebuilding and rewriting every bar. Entries are
+published with os.replace from a staging directory, and the least recently used ones are evicted
+once the cache grows past `max_bytes`. Catalogs in use by this process are never evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+
+from config import load_config
+from data.bar_frame import BarFrame
+
+ENTRY_FILE = "entry.json"
+DEFAULT_CATALOG_CACHE_BYTES = 2 * 1024**3
+
+_CATALOG_FORMAT_VERSION = 1
+
+
+def bar_data_hash(frame: BarFrame) -> str:
+    """SHA-256 over the timestamp and OHLCV arrays, i.e. exactly what gets written as bars."""
+    digest = hashlib.sha256()
+    for values in (frame.timestamps, frame.open, frame.high, frame.low, frame.close, frame.volume):
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def catalog_key(pair: str, venue: str, interval: str, instrument_meta: object, bars_hash: str) -> str:
+    payload = {
+        "version": _CATALOG_FORMAT_VERSION,
+        "pair": pair,
+        "venue": venue,
+        "interval": interval,
+        "instrument_meta": instrument_meta,
+        "bars": bars_hash,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _directory_size(path: Path) -> int:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+
+class CatalogCache:
+    def __init__(self, root: str | Path, max_bytes: int = DEFAULT_CATALOG_CACHE_BYTES) -> None:
+        self._root = Path(root).resolve()
+        self._max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._pinned: Counter[str] = Counter()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._root / key[:2] / key
+
+    def contains(self, key: str) -> bool:
+        return (self._entry_dir(key) / ENTRY_FILE).is_file()
+
+    @contextmanager
+    def catalog(self, key: str, build: Callable[[Path], None]) -> Iterator[Path]:
+        """Yield the catalog directory for `key`, calling build(staging_dir) first if it is not cached."""
+        with self._lock:
+            self._pinned[key] += 1
+        try:
+            target = self._entry_dir(key)
+            if self.contains(key):
+                # The entry file's mtime is the LRU clock.
+                os.utime(target / ENTRY_FILE)
+            else:
+                self._publish(key, target, build)
+                self.evict()
+            yield target
+        finally:
+            with self._lock:
+                self._pinned[key] -= 1
+                if not self._pinned[key]:
+                    del self._pinned[key]
+
+    def _publish(self, key: str, target: Path, build: Callable[[Path], None]) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=target.parent))
+        try:
+            build(staging)
+            entry = {"key": key, "size_bytes": _directory_size(staging), "created_at": time.time()}
+            (staging / ENTRY_FILE).write_text(json.dumps(entry))
+            try:
+                os.replace(staging, target)
+            except OSError:
+                # Another writer published the same catalog first.
+                if not self.contains(key):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def entries(self) -> list[tuple[str, int, float]]:
+        """(key, size in bytes, last used time) for every published catalog."""
+        found = []
+        for path in self._root.glob(f"*/*/{ENTRY_FILE}"):
+            try:
+                entry = json.loads(path.read_text())
+                found.append((entry["key"], int(entry["size_bytes"]), path.stat().st_mtime))
+            except (OSError, ValueError, KeyError):
+                continue
+        return found
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> list[str]:
+        """Remove least recently used catalogs until the cache fits in max_bytes; returns evicted keys."""
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for key, size, _ in entries:
+            if total <= self._max_bytes:
+                break
+            with self._lock:
+                if self._pinned[key]:
+                    continue
+                # Move aside first so readers never see a half-deleted catalog.
+                doomed = self._entry_dir(key).with_name(f".evicted-{key}")
+                try:
+                    os.replace(self._entry_dir(key), doomed)
+                except OSError:
+                    continue
+            shutil.rmtree(doomed, ignore_errors=True)
+            total -= size
+            evicted.append(key)
+        return evicted
+
+
+_caches: dict[str, CatalogCache] = {}
+
+
+def get_catalog_cache() -> CatalogCache:
+    config = load_config()
+    key = f"{config.backtest_catalog_path}|{config.backtest_catalog_max_bytes}"
+    cache = _caches.get(key)
+    if cache is None:
+        cache = CatalogCache(config.backtest_catalog_path, max_bytes=config.backtest_catalog_max_bytes)
+        _caches[key] = cache
+    return cache
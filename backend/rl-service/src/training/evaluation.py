@@ -2,20 +2,29 @@ from __future__ import annotations
 
 from collections.abc import Mapping
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 import logging
 import math
 import os
 import tempfile
 
 from config import load_config
-from data.dataset_builder import build_dataset
-from models.artifact_loader import decode_base64, fetch_artifact
+from data.bar_frame import BarFrame
+from data.dataset_builder import (
+    DATASET_HASH_MERKLE,
+    IncrementalDatasetHasher,
+    WindowedDataset,
+    build_dataset,
+    period_warmup_rows,
+    select_period,
+)
+from data.timestamp_index import nanos_to_iso
+from models.artifact_loader import decode_base64, fetch_artifact, read_observation_spec
 from reports.evaluation_report import build_evaluation_report
 from schemas import EvaluationReport, TradingPair, WalkForwardConfig
 from training.nautilus_backtest import DEFAULT_STRATEGY_IDS, MatrixBacktestResult, run_backtest
 from training.promotion import EvaluationMetrics, PromotionCriteria, evaluate_promotion
-from training.walk_forward import build_walk_forward_folds
+from training.walk_forward import WALK_FORWARD_SPLIT_TIME, build_time_walk_forward_folds, build_walk_forward_folds
 
 logger = logging.getLogger(__name__)
 
@@ -259,15 +268,6 @@ def _resolve_window_stride(total_rows: int, window_size: int, stride: int) -> di
     }
 
 
-def _parse_timestamp(value: object) -> datetime:
-    if not isinstance(value, str):
-        raise ValueError("invalid_timestamp")
-    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    return parsed
-
-
 def _interval_to_seconds(interval: str) -> int | None:
     interval = interval.strip()
     if len(interval) < 2 or not interval[:-1].isdigit():
@@ -317,60 +317,23 @@ def _interval_reason(reason_code: str, interval: str, base_interval: str, rows:
     )
 
 
-def _resample_interval_features(features: list[dict], base_interval: str, target_interval: str) -> tuple[list[dict], str | None]:
+def _resample_interval_features(
+    features: BarFrame,
+    base_interval: str,
+    target_interval: str,
+) -> tuple[BarFrame, str | None]:
     if target_interval == base_interval:
         return features, None
 
     base_seconds = _interval_to_seconds(base_interval)
     target_seconds = _interval_to_seconds(target_interval)
     if base_seconds is None or target_seconds is None:
-        return [], "unsupported_interval"
+        return BarFrame.empty(), "unsupported_interval"
     if target_seconds < base_seconds:
-        return [], "interval_shorter_than_base"
+        return BarFrame.empty(), "interval_shorter_than_base"
     if target_seconds % base_seconds != 0:
-        return [], "interval_not_multiple_of_base"
-
-    rows = sorted(features, key=lambda item: _parse_timestamp(item.get("timestamp")).timestamp())
-    if not rows:
-        return [], None
-
-    aggregated: list[dict] = []
-    bucket_rows: list[dict] = []
-    bucket_key: int | None = None
-
-    def flush_bucket() -> None:
-        if not bucket_rows:
-            return
-        opens = float(bucket_rows[0].get("open", 0.0))
-        closes = float(bucket_rows[-1].get("close", 0.0))
-        highs = max(float(row.get("high", 0.0)) for row in bucket_rows)
-        lows = min(float(row.get("low", 0.0)) for row in bucket_rows)
-        volume = sum(float(row.get("volume", 0.0)) for row in bucket_rows)
-        ts = _parse_timestamp(bucket_rows[0].get("timestamp")).isoformat()
-        aggregated.append(
-            {
-                "timestamp": ts,
-                "open": opens,
-                "high": highs,
-                "low": lows,
-                "close": closes,
-                "volume": volume,
-            }
-        )
-
-    for row in rows:
-        ts = _parse_timestamp(row.get("timestamp"))
-        key = int(ts.timestamp()) // target_seconds
-        if bucket_key is None:
-            bucket_key = key
-        if key != bucket_key:
-            flush_bucket()
-            bucket_rows = []
-            bucket_key = key
-        bucket_rows.append(row)
-
-    flush_bucket()
-    return aggregated, None
+        return BarFrame.empty(), "interval_not_multiple_of_base"
+    return features.sorted().resample(target_seconds), None
 
 
 def _build_interval_list(base_interval: str, context_intervals: list[str] | None) -> list[str]:
@@ -426,7 +389,7 @@ def _run_interval_matrix(
     pair: TradingPair,
     base_interval: str,
     intervals: list[str],
-    features: list[dict],
+    features: BarFrame,
     model_path: str | None,
     window_size: int,
     decision_threshold: float,
@@ -582,7 +545,7 @@ def run_evaluation(
     pair: TradingPair,
     period_start: datetime,
     period_end: datetime,
-    dataset_features: list[dict] | None = None,
+    dataset_features: list[dict] | WindowedDataset | BarFrame | None = None,
     artifact_base64: str | None = None,
     artifact_download_url: str | None = None,
     artifact_checksum: str | None = None,
@@ -605,12 +568,41 @@ def run_evaluation(
     criteria: PromotionCriteria | None = None,
     walk_forward: WalkForwardConfig | None = None,
     feature_schema_fingerprint: str | None = None,
+    dataset_hash_mode: str = DATASET_HASH_MERKLE,
+    dataset_hasher: IncrementalDatasetHasher | None = None,
 ) -> EvaluationReport:
     config = load_config()
     window = EvaluationWindow(pair=pair, period_start=period_start, period_end=period_end)
     _validate_window(window)
     if not dataset_features:
         raise ValueError("dataset_features are required for evaluation")
+    artifact = None
+    if artifact_base64:
+        artifact = decode_base64(artifact_base64)
+    elif artifact_download_url:
+        artifact = fetch_artifact(artifact_download_url, expected_checksum=artifact_checksum)
+    observation_spec = read_observation_spec(artifact.data) if artifact is not None else None
+    history_length = int((observation_spec or {}).get("history_length") or 1)
+
+    bar_frame = None
+    # Bars inside [period_start, period_end] are evaluated, preceded by a warm-up prefix that gives the
+    # first in-period decisions a full window and history; selection is a binary search on the
+    # dataset's timestamp index.
+    warmup = period_warmup_rows(window_size, history_length)
+    if isinstance(dataset_features, BarFrame):
+        # Columnar payloads skip the row parse below; rows are only rebuilt for hashing/windowing.
+        bar_frame = dataset_features.sorted()
+        bar_frame = bar_frame[bar_frame.timestamp_index.slice_between(period_start, period_end, warmup)]
+        source_dataset = WindowedDataset(bar_frame.to_rows(), 1, timestamp_index=bar_frame.timestamp_index)
+    else:
+        rows = dataset_features.rows if isinstance(dataset_features, WindowedDataset) else dataset_features
+        source_dataset = select_period(dataset_features, period_start, period_end, warmup)
+        if source_dataset.rows is not rows:
+            # Cached chunk digests describe the rows before sorting/selection.
+            dataset_hasher = None
+    dataset_features = source_dataset.rows
+    if not dataset_features:
+        raise ValueError("No dataset rows between period_start and period_end")
 
     requested_strategy_ids = strategy_ids or list(DEFAULT_STRATEGY_IDS)
     requires_sb3_artifact = "rl_sb3_market" in requested_strategy_ids
@@ -619,18 +611,12 @@ def run_evaluation(
     if requires_sb3_artifact and not feature_schema_fingerprint:
         raise ValueError("feature_schema_fingerprint is required when strategy_ids include rl_sb3_market")
 
-    artifact = None
-    if artifact_base64:
-        artifact = decode_base64(artifact_base64)
-    elif artifact_download_url:
-        artifact = fetch_artifact(artifact_download_url, expected_checksum=artifact_checksum)
-
     window_stride = _resolve_window_stride(len(dataset_features), window_size, stride)
     effective_window_size = int(window_stride["window_size"])
     effective_stride = int(window_stride["stride"])
 
     dataset = build_dataset(
-        dataset_features,
+        source_dataset,
         window_size=effective_window_size,
         stride=effective_stride,
         metadata={
@@ -640,6 +626,8 @@ def run_evaluation(
             "end_at": period_end,
             "feature_schema_fingerprint": feature_schema_fingerprint,
         },
+        hash_mode=dataset_hash_mode,
+        hasher=dataset_hasher,
     )
     if not dataset["windows"]:
         raise ValueError(
@@ -648,6 +636,10 @@ def run_evaluation(
             f"resolved_window={effective_window_size}, resolved_stride={effective_stride})"
         )
 
+    # Convert rows once; folds, resampling and bar construction all slice this frame.
+    if bar_frame is None:
+        bar_frame = BarFrame.from_rows(dataset_features).sorted()
+
     requested_walk_forward = walk_forward or WalkForwardConfig()
     promotion_criteria = criteria or PromotionCriteria()
     walk_forward_enabled = walk_forward is not None and requested_walk_forward.folds > 1
@@ -657,14 +649,17 @@ def run_evaluation(
     if walk_forward_enabled:
         min_train_default = max(effective_window_size * 2, 100)
         min_train_bars = requested_walk_forward.min_train_bars or min_train_default
-        folds = build_walk_forward_folds(
-            total_windows=len(dataset_features),
-            folds=requested_walk_forward.folds,
-            purge_bars=requested_walk_forward.purge_bars,
-            embargo_bars=requested_walk_forward.embargo_bars,
-            min_train_bars=min_train_bars,
-            strict=requested_walk_forward.strict,
-        )
+        fold_options = {
+            "folds": requested_walk_forward.folds,
+            "purge_bars": requested_walk_forward.purge_bars,
+            "embargo_bars": requested_walk_forward.embargo_bars,
+            "min_train_bars": min_train_bars,
+            "strict": requested_walk_forward.strict,
+        }
+        if requested_walk_forward.split_by == WALK_FORWARD_SPLIT_TIME:
+            folds = build_time_walk_forward_folds(bar_frame.timestamps, **fold_options)
+        else:
+            folds = build_walk_forward_folds(total_windows=len(bar_frame), **fold_options)
         fold_specs = [
             {
                 "fold": item.fold,
@@ -700,7 +695,7 @@ def run_evaluation(
                 fold_number = int(spec["fold"])
                 start_idx = int(spec["test_start"])
                 end_idx = int(spec["test_end"])
-                fold_features = dataset_features[start_idx:end_idx]
+                fold_features = bar_frame[start_idx:end_idx]
                 minimum_rows = max(effective_window_size, 10)
                 if len(fold_features) < minimum_rows:
                     reason_codes = ["insufficient_rows"]
@@ -747,8 +742,8 @@ def run_evaluation(
                         "train_end_index": spec["train_end"],
                         "start_index": start_idx,
                         "end_index": end_idx,
-                        "period_start": str(fold_features[0].get("timestamp")) if fold_features else None,
-                        "period_end": str(fold_features[-1].get("timestamp")) if fold_features else None,
+                        "period_start": nanos_to_iso(fold_features.timestamps[0]) if len(fold_features) else None,
+                        "period_end": nanos_to_iso(fold_features.timestamps[-1]) if len(fold_features) else None,
                         "status": "pass" if fold_decision.promote else "fail",
                         "reason_codes": fold_decision.reasons,
                         "recommended_actions": _recommend_for_promotion_reasons(fold_decision.reasons),
@@ -858,7 +853,7 @@ def run_evaluation(
                     pair=pair,
                     base_interval=interval,
                     intervals=interval_set,
-                    features=dataset_features,
+                    features=bar_frame,
                     model_path=model_path,
                     window_size=effective_window_size,
                     decision_threshold=decision_threshold,
@@ -963,6 +958,7 @@ def run_evaluation(
                     "embargo_bars": requested_walk_forward.embargo_bars,
                     "min_train_bars": requested_walk_forward.min_train_bars,
                     "strict": requested_walk_forward.strict,
+                    "split_by": requested_walk_forward.split_by,
                 },
             },
             "reward_config": {
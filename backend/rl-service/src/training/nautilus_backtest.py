@@ -1,20 +1,36 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-import tempfile
-from datetime import datetime, timezone
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from pathlib import Path
 from typing import Any, Iterable, Mapping
 
-from nautilus_trader.backtest.node import BacktestNode
+import numpy as np
+from nautilus_trader.backtest.engine import BacktestEngine
+from nautilus_trader.backtest.node import (
+    BacktestNode,
+    get_account_type,
+    get_base_currency,
+    get_book_type,
+    get_oms_type,
+    get_oto_trigger_mode,
+    get_price_protection_points,
+    get_starting_balances,
+)
+from nautilus_trader.backtest.results import BacktestResult
 from nautilus_trader.config import BacktestDataConfig, BacktestEngineConfig, BacktestRunConfig, BacktestVenueConfig
 from nautilus_trader.config import ImportableStrategyConfig
 from nautilus_trader.model.data import Bar, BarAggregation, BarSpecification, BarType
 from nautilus_trader.model.enums import AccountType, OmsType, PriceType
-from nautilus_trader.model.identifiers import InstrumentId, Symbol, Venue
+from nautilus_trader.model.identifiers import InstrumentId, StrategyId, Symbol, Venue
 from nautilus_trader.model.instruments.crypto_perpetual import CryptoPerpetual
 from nautilus_trader.model.objects import Currency, Price, Quantity
 from nautilus_trader.persistence.catalog.parquet import ParquetDataCatalog
 
+from config import load_config
+from data.bar_frame import BarFrame
+from training.catalog_cache import bar_data_hash, catalog_key, get_catalog_cache
+
 
 @dataclass(frozen=True)
 class MatrixBacktestResult:
@@ -30,6 +46,15 @@ BACKTEST_MODE_L2 = "l2"
 BACKTEST_MODE_L3 = "l3"
 BACKTEST_MODES = (BACKTEST_MODE_L1, BACKTEST_MODE_L2, BACKTEST_MODE_L3)
 
+# Execution paths: "node" runs BacktestNode over a (cached) Parquet catalog; "engine" feeds a
+# low-level BacktestEngine the instrument and bars in memory, skipping the catalog round trip;
+# "matrix" loads every (strategy, venue) leg into a single engine and runs them in one pass, with one
+# instrument and bar stream per venue shared by that venue's strategies.
+BACKTEST_EXECUTION_NODE = "node"
+BACKTEST_EXECUTION_ENGINE = "engine"
+BACKTEST_EXECUTION_MATRIX = "matrix"
+BACKTEST_EXECUTIONS = (BACKTEST_EXECUTION_NODE, BACKTEST_EXECUTION_ENGINE, BACKTEST_EXECUTION_MATRIX)
+
 
 STRATEGY_REGISTRY: dict[str, dict[str, Any]] = {
     "rl_sb3_market": {
@@ -193,40 +218,60 @@ def _build_instrument(pair: str, instrument_meta: dict | None = None, venue: str
     )
 
 
-def _to_ts_nanos(timestamp: str) -> int:
-    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    return int(parsed.timestamp() * 1_000_000_000)
-
-
 def _format_decimal(value: float, precision: int) -> str:
     return f"{value:.{precision}f}"
 
 
+@dataclass(frozen=True)
+class BarArrays:
+    """Contiguous OHLCV/ts arrays in the dtypes Bar.from_raw_arrays_to_list takes, prepared once per data set."""
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    ts_event: np.ndarray
+
+    @classmethod
+    def from_frame(cls, frame: BarFrame) -> BarArrays:
+        def prices(values: np.ndarray) -> np.ndarray:
+            return np.ascontiguousarray(values, dtype=np.float64)
+
+        return cls(
+            open=prices(frame.open),
+            high=prices(frame.high),
+            low=prices(frame.low),
+            close=prices(frame.close),
+            volume=prices(frame.volume),
+            ts_event=np.ascontiguousarray(frame.timestamps, dtype=np.uint64),
+        )
+
+
 def _build_bars(
     instrument_id: InstrumentId,
     bar_type: BarType,
-    features: Iterable[dict],
+    features: BarArrays | BarFrame | Iterable[dict],
     price_precision: int,
     size_precision: int,
 ) -> list[Bar]:
-    bars: list[Bar] = []
-    for item in features:
-        ts_event = _to_ts_nanos(str(item.get("timestamp")))
-        bars.append(
-            Bar(
-                bar_type=bar_type,
-                open=Price.from_str(_format_decimal(float(item.get("open", 0.0)), price_precision)),
-                high=Price.from_str(_format_decimal(float(item.get("high", 0.0)), price_precision)),
-                low=Price.from_str(_format_decimal(float(item.get("low", 0.0)), price_precision)),
-                close=Price.from_str(_format_decimal(float(item.get("close", 0.0)), price_precision)),
-                volume=Quantity.from_str(_format_decimal(float(item.get("volume", 0.0)), size_precision)),
-                ts_event=ts_event,
-                ts_init=ts_event,
-            )
-        )
-    return bars
+    # Bars embed their bar_type, so each venue needs its own list; with arrays prepared once this is a
+    # single vectorized call that rounds to the instrument precisions, instead of a Price.from_str per field.
+    if not isinstance(features, BarArrays):
+        frame = features if isinstance(features, BarFrame) else BarFrame.from_rows(list(features))
+        features = BarArrays.from_frame(frame)
+    return Bar.from_raw_arrays_to_list(
+        bar_type,
+        price_precision,
+        size_precision,
+        features.open,
+        features.high,
+        features.low,
+        features.close,
+        features.volume,
+        features.ts_event,
+        features.ts_event,
+    )
 
 
 def _resolve_requested_ids(
@@ -269,10 +314,190 @@ def _resolve_bar_spec(interval: str) -> BarSpecification:
     return BarSpecification(1, BarAggregation.MINUTE, PriceType.LAST)
 
 
+def _strategy_config(
+    strategy_id: str,
+    instrument_id: InstrumentId,
+    bar_type: BarType,
+    size_precision: int,
+    *,
+    model_path: str | None,
+    window_size: int,
+    decision_threshold: float,
+    order_id_tag: str | None = None,
+) -> ImportableStrategyConfig:
+    strategy_spec = STRATEGY_REGISTRY[strategy_id]
+    base_config: dict[str, Any] = {
+        "instrument_id": instrument_id,
+        "bar_type": str(bar_type),
+        "trade_size": _format_decimal(1.0, size_precision),
+        **(strategy_spec.get("config", {}) or {}),
+    }
+    if order_id_tag is not None:
+        # Strategy ids are class name + tag; the tag keeps repeated strategies distinct in one engine.
+        base_config["order_id_tag"] = order_id_tag
+    if strategy_id == "rl_sb3_market":
+        if not model_path:
+            raise ValueError("model_path is required when strategy_id includes rl_sb3_market")
+        base_config["model_path"] = model_path
+        base_config["decision_threshold"] = decision_threshold
+        base_config["window_size"] = window_size
+    return ImportableStrategyConfig(
+        strategy_path=str(strategy_spec["strategy_path"]),
+        config_path=str(strategy_spec["config_path"]),
+        config=base_config,
+    )
+
+
+def _run_node(
+    venue_config: BacktestVenueConfig,
+    data_config: BacktestDataConfig,
+    strategy_config: ImportableStrategyConfig,
+) -> object:
+    run_config = BacktestRunConfig(
+        venues=[venue_config],
+        data=[data_config],
+        engine=BacktestEngineConfig(strategies=[strategy_config]),
+        raise_exception=True,
+    )
+    node = BacktestNode([run_config])
+    try:
+        results = node.run()
+    except Exception as exc:
+        raise RuntimeError("Nautilus backtest failed") from exc
+    if not results:
+        raise RuntimeError("Nautilus backtest produced no results")
+    return results[0]
+
+
+def _run_engine(
+    venue_config: BacktestVenueConfig,
+    instrument: CryptoPerpetual,
+    bars: list[Bar],
+    strategy_config: ImportableStrategyConfig,
+) -> object:
+    """Same run as _run_node, but with the instrument and bars handed to a BacktestEngine in memory."""
+    engine = BacktestEngine(config=BacktestEngineConfig(strategies=[strategy_config]))
+    try:
+        _add_venue(engine, venue_config)
+        engine.add_instrument(instrument)
+        engine.add_data(bars)
+        engine.run()
+    except Exception as exc:
+        engine.dispose()
+        raise RuntimeError("Nautilus backtest failed") from exc
+    # BacktestNode disposes before reading the result; do the same so both paths report identical metrics.
+    engine.dispose()
+    result = engine.get_result()
+    if result is None:
+        raise RuntimeError("Nautilus backtest produced no results")
+    return result
+
+
+@dataclass(frozen=True)
+class _MatrixLeg:
+    """One (venue, strategy) leg of a matrix run, on a venue, instrument and bar stream of its own."""
+
+    venue_id: str
+    strategy_id: str
+    venue_config: BacktestVenueConfig
+    instrument: CryptoPerpetual
+    bars: list[Bar]
+    strategy_config: ImportableStrategyConfig
+
+
+def _venue_config(venue_spec: Mapping[str, Any], name: str | None = None) -> BacktestVenueConfig:
+    return BacktestVenueConfig(
+        name=name or str(venue_spec["name"]),
+        oms_type=venue_spec["oms_type"],
+        account_type=venue_spec["account_type"],
+        starting_balances=list(venue_spec["starting_balances"]),
+    )
+
+
+def _add_venue(engine: BacktestEngine, venue_config: BacktestVenueConfig) -> None:
+    # Mirror the venue arguments BacktestNode derives from the same config.
+    engine.add_venue(
+        venue=Venue(venue_config.name),
+        oms_type=get_oms_type(venue_config),
+        account_type=get_account_type(venue_config),
+        base_currency=get_base_currency(venue_config),
+        starting_balances=get_starting_balances(venue_config),
+        default_leverage=Decimal(venue_config.default_leverage),
+        book_type=get_book_type(venue_config),
+        oto_trigger_mode=get_oto_trigger_mode(venue_config),
+        price_protection_points=get_price_protection_points(venue_config),
+    )
+
+
+def _leg_result(engine: BacktestEngine, combined: BacktestResult, strategy_id: StrategyId, venue: Venue) -> BacktestResult:
+    """The combined run's result restricted to one leg: its strategy's orders and positions, its venue's account."""
+    cache = engine.cache
+    orders = cache.orders(strategy_id=strategy_id)
+    # Same position selection BacktestEngine uses for its end-of-run report, narrowed to the strategy.
+    positions = cache.positions(strategy_id=strategy_id)
+    snapshots = [snapshot for snapshot in cache.position_snapshots() if snapshot.strategy_id == strategy_id]
+    # Reuse the portfolio's analyzer for its registered statistics; reset() drops the trades it recorded
+    # live across every leg, so only this leg's positions and account feed the stats.
+    analyzer = engine.portfolio.analyzer
+    analyzer.reset()
+    analyzer.calculate_statistics(cache.account_for_venue(venue), positions + snapshots)
+    open_positions = sum(1 for position in positions if position.is_open)
+    return replace(
+        combined,
+        total_orders=len(orders),
+        total_positions=len(positions) + len(snapshots),
+        summary={
+            **combined.summary,
+            "orders.total": str(len(orders)),
+            "orders.open": str(sum(1 for order in orders if order.is_open)),
+            "orders.closed": str(sum(1 for order in orders if order.is_closed)),
+            "positions.total": str(len(positions)),
+            "positions.open": str(open_positions),
+            "positions.closed": str(len(positions) - open_positions),
+            "positions.snapshots": str(len(snapshots)),
+            "positions.total_with_snapshots": str(len(positions) + len(snapshots)),
+        },
+        stats_pnls={currency.code: analyzer.get_performance_stats_pnls(currency) for currency in analyzer.currencies},
+        stats_returns=analyzer.get_performance_stats_returns(),
+    )
+
+
+def _run_matrix(legs: list[_MatrixLeg]) -> list[BacktestResult]:
+    """
+    Run every (venue, strategy) leg in one engine pass. Each leg trades on its own venue account funded
+    with the registry balances, so its balances, returns and drawdowns match a solo run.
+    """
+    # run_analysis=False skips the engine's own per-venue report; _leg_result computes per-leg stats once.
+    engine = BacktestEngine(
+        config=BacktestEngineConfig(strategies=[leg.strategy_config for leg in legs], run_analysis=False)
+    )
+    try:
+        for leg in legs:
+            _add_venue(engine, leg.venue_config)
+            engine.add_instrument(leg.instrument)
+            engine.add_data(leg.bars, sort=False)
+        engine.sort_data()
+        engine.run()
+        combined = engine.get_result()
+        if combined is None:
+            raise RuntimeError("Nautilus backtest produced no results")
+        # Strategies are registered in config order, i.e. leg by leg.
+        return [
+            _leg_result(engine, combined, strategy.id, Venue(leg.venue_config.name))
+            for leg, strategy in zip(legs, engine.trader.strategies())
+        ]
+    except RuntimeError:
+        raise
+    except Exception as exc:
+        raise RuntimeError("Nautilus backtest failed") from exc
+    finally:
+        engine.dispose()
+
+
 def run_backtest(
     pair: str,
     interval: str,
-    features: list[dict],
+    features: BarFrame | list[dict],
     model_path: str | None,
     window_size: int,
     decision_threshold: float,
@@ -280,9 +505,13 @@ def run_backtest(
     strategy_ids: list[str] | None = None,
     venue_ids: list[str] | None = None,
     backtest_mode: str = BACKTEST_MODE_L1,
+    execution: str | None = None,
 ) -> list[MatrixBacktestResult]:
     if backtest_mode not in BACKTEST_MODES:
         raise ValueError(f"backtest_mode must be one of {BACKTEST_MODES}, got {backtest_mode!r}")
+    execution = execution or load_config().backtest_execution
+    if execution not in BACKTEST_EXECUTIONS:
+        raise ValueError(f"execution must be one of {BACKTEST_EXECUTIONS}, got {execution!r}")
     # L2/L3 require continuous order book capture; currently we run L1 only
     resolved_strategy_ids = _resolve_requested_ids(
         strategy_ids,
@@ -291,81 +520,128 @@ def run_backtest(
         default_ids=list(DEFAULT_STRATEGY_IDS),
     )
     resolved_venue_ids = _resolve_requested_ids(venue_ids, VENUE_REGISTRY, kind="venue")
-    price_precision, size_precision, _, _ = _resolve_instrument_meta(instrument_meta)
+    resolved_meta = _resolve_instrument_meta(instrument_meta)
+    price_precision, size_precision, _, _ = resolved_meta
     bar_spec = _resolve_bar_spec(interval)
+    if not isinstance(features, BarFrame):
+        features = BarFrame.from_rows(features)
+    bars_hash = bar_data_hash(features)
+    bar_arrays = BarArrays.from_frame(features)
     matrix_results: list[MatrixBacktestResult] = []
 
+    if execution == BACKTEST_EXECUTION_MATRIX:
+        matrix_legs: list[_MatrixLeg] = []
+        for venue_id in resolved_venue_ids:
+            venue_spec = VENUE_REGISTRY[venue_id]
+            for strategy_id in resolved_strategy_ids:
+                tag = f"{len(matrix_legs):03d}"
+                # Registry venue name plus the leg tag: a separate account per leg, same venue settings.
+                venue_config = _venue_config(venue_spec, name=f"{venue_spec['name']}{tag}")
+                instrument = _build_instrument(pair, instrument_meta=instrument_meta, venue=venue_config.name)
+                bar_type = BarType(instrument.id, bar_spec)
+                matrix_legs.append(
+                    _MatrixLeg(
+                        venue_id=venue_id,
+                        strategy_id=strategy_id,
+                        venue_config=venue_config,
+                        instrument=instrument,
+                        bars=_build_bars(
+                            instrument.id,
+                            bar_type,
+                            bar_arrays,
+                            price_precision=price_precision,
+                            size_precision=size_precision,
+                        ),
+                        strategy_config=_strategy_config(
+                            strategy_id,
+                            instrument.id,
+                            bar_type,
+                            size_precision,
+                            model_path=model_path,
+                            window_size=window_size,
+                            decision_threshold=decision_threshold,
+                            order_id_tag=tag,
+                        ),
+                    )
+                )
+        return [
+            MatrixBacktestResult(
+                strategy_id=leg.strategy_id,
+                venue_id=leg.venue_id,
+                venue_name=str(VENUE_REGISTRY[leg.venue_id]["name"]),
+                result=result,
+            )
+            for leg, result in zip(matrix_legs, _run_matrix(matrix_legs))
+        ]
+
     for venue_id in resolved_venue_ids:
         venue_spec = VENUE_REGISTRY[venue_id]
         instrument = _build_instrument(pair, instrument_meta=instrument_meta, venue=str(venue_spec["name"]))
         bar_type = BarType(instrument.id, bar_spec)
+        venue_config = _venue_config(venue_spec)
+        strategy_configs = [
+            (
+                strategy_id,
+                _strategy_config(
+                    strategy_id,
+                    instrument.id,
+                    bar_type,
+                    size_precision,
+                    model_path=model_path,
+                    window_size=window_size,
+                    decision_threshold=decision_threshold,
+                ),
+            )
+            for strategy_id in resolved_strategy_ids
+        ]
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            catalog = ParquetDataCatalog(tmpdir)
-            catalog.write_data([instrument])
+        if execution == BACKTEST_EXECUTION_ENGINE:
             bars = _build_bars(
                 instrument.id,
                 bar_type,
-                features,
+                bar_arrays,
                 price_precision=price_precision,
                 size_precision=size_precision,
             )
-            catalog.write_data(bars)
-
-            venue_config = BacktestVenueConfig(
-                name=str(venue_spec["name"]),
-                oms_type=venue_spec["oms_type"],
-                account_type=venue_spec["account_type"],
-                starting_balances=list(venue_spec["starting_balances"]),
-            )
-            data_config = BacktestDataConfig(
-                catalog_path=tmpdir,
-                data_cls="nautilus_trader.model.data:Bar",
-                instrument_id=instrument.id,
-                bar_spec=str(bar_spec),
-            )
-
-            for strategy_id in resolved_strategy_ids:
-                strategy_spec = STRATEGY_REGISTRY[strategy_id]
-                base_config: dict[str, Any] = {
-                    "instrument_id": instrument.id,
-                    "bar_type": str(bar_type),
-                    "trade_size": _format_decimal(1.0, size_precision),
-                    **(strategy_spec.get("config", {}) or {}),
-                }
-                if strategy_id == "rl_sb3_market":
-                    if not model_path:
-                        raise ValueError("model_path is required when strategy_id includes rl_sb3_market")
-                    base_config["model_path"] = model_path
-                    base_config["decision_threshold"] = decision_threshold
-                    base_config["window_size"] = window_size
-                strategy_config = ImportableStrategyConfig(
-                    strategy_path=str(strategy_spec["strategy_path"]),
-                    config_path=str(strategy_spec["config_path"]),
-                    config=base_config,
+            results = [
+                (strategy_id, _run_engine(venue_config, instrument, bars, strategy_config))
+                for strategy_id, strategy_config in strategy_configs
+            ]
+        else:
+
+            def _write_catalog(path: Path) -> None:
+                catalog = ParquetDataCatalog(str(path))
+                catalog.write_data([instrument])
+                bars = _build_bars(
+                    instrument.id,
+                    bar_type,
+                    bar_arrays,
+                    price_precision=price_precision,
+                    size_precision=size_precision,
                 )
-
-                run_config = BacktestRunConfig(
-                    venues=[venue_config],
-                    data=[data_config],
-                    engine=BacktestEngineConfig(strategies=[strategy_config]),
-                    raise_exception=True,
-                )
-                node = BacktestNode([run_config])
-                try:
-                    results = node.run()
-                except Exception as exc:
-                    raise RuntimeError("Nautilus backtest failed") from exc
-                if not results:
-                    raise RuntimeError("Nautilus backtest produced no results")
-
-                matrix_results.append(
-                    MatrixBacktestResult(
-                        strategy_id=strategy_id,
-                        venue_id=venue_id,
-                        venue_name=str(venue_spec["name"]),
-                        result=results[0],
-                    )
+                catalog.write_data(bars)
+
+            key = catalog_key(pair, str(venue_spec["name"]), interval, resolved_meta, bars_hash)
+            with get_catalog_cache().catalog(key, _write_catalog) as catalog_path:
+                data_config = BacktestDataConfig(
+                    catalog_path=str(catalog_path),
+                    data_cls="nautilus_trader.model.data:Bar",
+                    instrument_id=instrument.id,
+                    bar_spec=str(bar_spec),
                 )
+                results = [
+                    (strategy_id, _run_node(venue_config, data_config, strategy_config))
+                    for strategy_id, strategy_config in strategy_configs
+                ]
+
+        matrix_results.extend(
+            MatrixBacktestResult(
+                strategy_id=strategy_id,
+                venue_id=venue_id,
+                venue_name=str(venue_spec["name"]),
+                result=result,
+            )
+            for strategy_id, result in results
+        )
 
     return matrix_results
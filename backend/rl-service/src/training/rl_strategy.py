@@ -6,7 +6,8 @@ from decimal import Decimal
 
 import numpy as np
 
-from features.extractors import extract_features, vectorize_features
+from features.extractors import build_policy_observation, extract_features
+from models.artifact_loader import read_observation_spec
 from nautilus_trader.config import StrategyConfig
 from nautilus_trader.model.data import Bar, BarType
 from nautilus_trader.model.enums import OrderSide, TimeInForce
@@ -31,6 +32,9 @@ class RLSb3Strategy(Strategy):
         super().__init__(config)
         self._bars: deque[Bar] = deque(maxlen=config.window_size)
         self._model = None
+        self._observation_spec: dict | None = None
+        self._decision_interval = 1
+        self._bars_since_decision = 0
         self._bar_type = BarType.from_str(config.bar_type)
         if isinstance(config.instrument_id, InstrumentId):
             self._instrument_id = config.instrument_id
@@ -43,12 +47,27 @@ class RLSb3Strategy(Strategy):
         except Exception as exc:  # pragma: no cover - optional dependency guard
             raise RuntimeError("stable-baselines3 is required for RL backtests") from exc
         self._model = PPO.load(self.config.model_path)
+        self._observation_spec = read_observation_spec(self.config.model_path)
+        spec = self._observation_spec or {}
+        history_length = int(spec.get("history_length") or 1)
+        # Training steps advance by `stride` bars, so history offsets and action holds scale with it.
+        stride = max(1, int(spec.get("stride") or 1))
+        self._decision_interval = max(1, int(spec.get("decision_interval") or 1)) * stride
+        self._bars_since_decision = 0
+        if history_length > 1:
+            history_window = max(self.config.window_size, int(spec.get("window_size") or 0))
+            self._bars = deque(self._bars, maxlen=history_window + (history_length - 1) * stride)
         self.subscribe_bars(self._bar_type)
 
     def on_bar(self, bar: Bar) -> None:
         self._bars.append(bar)
         if len(self._bars) < self.config.window_size:
             return
+        # The policy was trained to hold each action for decision_interval steps of `stride` bars.
+        if self._bars_since_decision % self._decision_interval != 0:
+            self._bars_since_decision += 1
+            return
+        self._bars_since_decision = 1
 
         snapshot = MarketSnapshot(
             pair=self._resolve_pair(),
@@ -56,7 +75,16 @@ class RLSb3Strategy(Strategy):
             last_price=float(bar.close),
         )
         features = extract_features(snapshot, [], [], [], [], technical_config=self.config.technical_config)
-        observation = np.array(vectorize_features(features), dtype=float)
+        observation = build_policy_observation(
+            snapshot,
+            [],
+            [],
+            [],
+            [],
+            features,
+            observation_spec=self._observation_spec,
+            technical_config=self.config.technical_config,
+        )
         action, _ = self._model.predict(observation, deterministic=True)
         try:
             score = float(action)
@@ -2,13 +2,33 @@ from __future__ import annotations
 
 import base64
 import tempfile
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
 from hashlib import sha256
 
 import numpy as np
 
-from envs.market_env import MarketWindowEnv
+from data.dataset_builder import WindowedDataset
+from envs.market_env import (
+    MarketSeriesEnv,
+    MarketWindowEnv,
+    SeriesFeatures,
+    build_series_features,
+    build_window_observations,
+)
 from features.extractors import resolve_feature_keys
+from features.normalization import (
+    NORMALIZATION_METHODS,
+    NORMALIZATION_NONE,
+    NormalizationStats,
+    compute_normalization_stats,
+)
+from models.artifact_loader import embed_observation_spec
+
+# Episode modes: replay every window from index 0, or sample random starts over the contiguous series
+EPISODE_MODE_WINDOWS = "windows"
+EPISODE_MODE_RANDOM_START = "random_start"
+EPISODE_MODES = (EPISODE_MODE_WINDOWS, EPISODE_MODE_RANDOM_START)
 
 
 @dataclass(frozen=True)
@@ -24,6 +44,13 @@ class TrainingConfig:
     feedback_timesteps: int = 256
     feedback_hard_ratio: float = 0.3
     feature_key_extras: list[str] | None = None
+    episode_mode: str = EPISODE_MODE_WINDOWS
+    window_size: int | None = None
+    episode_length: int | None = None
+    min_episode_length: int | None = None
+    observation_normalization: str = NORMALIZATION_NONE
+    history_length: int = 1
+    decision_interval: int = 1
 
 
 @dataclass(frozen=True)
@@ -35,7 +62,11 @@ class TrainingResult:
     hyperparameter_summary: str
 
 
-def _build_env(windows: list[list[dict]], config: TrainingConfig) -> MarketWindowEnv:
+def _build_env(
+    windows: Sequence[list[dict]],
+    config: TrainingConfig,
+    normalization: NormalizationStats | None = None,
+) -> MarketWindowEnv:
     feature_keys = resolve_feature_keys(config.feature_key_extras)
     return MarketWindowEnv(
         windows=windows,
@@ -45,16 +76,58 @@ def _build_env(windows: list[list[dict]], config: TrainingConfig) -> MarketWindo
         slippage_bps=config.slippage_bps,
         funding_weight=config.funding_weight,
         drawdown_penalty=config.drawdown_penalty,
+        normalization=normalization,
+        history_length=config.history_length,
+        decision_interval=config.decision_interval,
     )
 
 
-def _select_hard_windows(model, windows: list[list[dict]], config: TrainingConfig) -> list[list[dict]]:
-    if len(windows) < 3:
-        return windows
-    eval_env = _build_env(windows, config)
+def _build_series_env(
+    series: list[dict],
+    series_features: SeriesFeatures,
+    config: TrainingConfig,
+    normalization: NormalizationStats | None = None,
+) -> MarketSeriesEnv:
+    feature_keys = resolve_feature_keys(config.feature_key_extras)
+    return MarketSeriesEnv(
+        rows=series,
+        feature_keys=feature_keys,
+        window_size=config.window_size,
+        series_features=series_features,
+        normalization=normalization,
+        history_length=config.history_length,
+        decision_interval=config.decision_interval,
+        episode_length=config.episode_length,
+        min_episode_length=config.min_episode_length,
+        leverage=config.leverage,
+        taker_fee_bps=config.taker_fee_bps,
+        slippage_bps=config.slippage_bps,
+        funding_weight=config.funding_weight,
+        drawdown_penalty=config.drawdown_penalty,
+    )
+
+
+def _build_episode_env(
+    windows: Sequence[list[dict]],
+    series: list[dict] | None,
+    series_features: SeriesFeatures | None,
+    config: TrainingConfig,
+    normalization: NormalizationStats | None = None,
+):
+    """Env for ``config.episode_mode``: random-start episodes when series features are given."""
+    if series_features is not None:
+        return _build_series_env(series, series_features, config, normalization)
+    return _build_env(windows, config, normalization)
+
+
+def _hard_step_indices(model, eval_env, steps: int, span: int, limit: int, config: TrainingConfig) -> list[int]:
+    """
+    Replay ``eval_env`` once with the current policy and return the lowest-reward steps, each
+    extended by the ``span`` indices after it (clipped to ``limit``), in order.
+    """
     observation, _ = eval_env.reset()
     rewards: list[tuple[int, float]] = []
-    for idx in range(len(windows) - 1):
+    for idx in range(steps):
         action, _ = model.predict(observation, deterministic=True)
         action_arr = np.array(action, dtype=np.float32).reshape(-1)
         observation, reward, terminated, truncated, _ = eval_env.step(action_arr)
@@ -62,38 +135,128 @@ def _select_hard_windows(model, windows: list[list[dict]], config: TrainingConfi
         if terminated or truncated:
             break
     if not rewards:
-        return windows
+        return []
 
     hard_ratio = min(1.0, max(0.0, float(config.feedback_hard_ratio)))
     hard_count = max(1, int(np.ceil(len(rewards) * hard_ratio)))
     hardest_indices = [idx for idx, _ in sorted(rewards, key=lambda item: item[1])[:hard_count]]
     include_indices = set()
     for idx in hardest_indices:
-        include_indices.add(idx)
-        if idx + 1 < len(windows):
-            include_indices.add(idx + 1)
-    ordered = sorted(include_indices)
+        include_indices.update(range(idx, min(idx + span + 1, limit)))
+    return sorted(include_indices)
+
+
+def _select_hard_windows(
+    model,
+    windows: Sequence[list[dict]],
+    config: TrainingConfig,
+    normalization: NormalizationStats | None = None,
+) -> Sequence[list[dict]]:
+    if len(windows) < 3:
+        return windows
+    # Score every window individually, even when training holds actions for several bars.
+    eval_env = _build_env(windows, replace(config, decision_interval=1), normalization)
+    ordered = _hard_step_indices(model, eval_env, len(windows) - 1, 1, len(windows), config)
     selected = [windows[idx] for idx in ordered]
     return selected if len(selected) >= 2 else windows
 
 
-def train_policy(windows: list[list[dict]], config: TrainingConfig) -> TrainingResult:
+def _select_hard_series(
+    model,
+    series: list[dict],
+    series_features: SeriesFeatures,
+    config: TrainingConfig,
+    normalization: NormalizationStats | None = None,
+) -> SeriesFeatures:
+    """
+    Random-start counterpart of ``_select_hard_windows``: score every bar of the full series and
+    keep the hardest ones with their history rows and next bar, so feedback episodes start there.
+    """
+    history_length = config.history_length
+    if len(series_features) < history_length + 2:
+        return series_features
+    # One deterministic episode over the whole series, one bar per step.
+    eval_env = _build_series_env(
+        series,
+        series_features,
+        replace(config, decision_interval=1, episode_length=None, min_episode_length=None),
+        normalization,
+    )
+    steps = len(series_features) - history_length
+    ordered = _hard_step_indices(model, eval_env, steps, history_length, len(series_features), config)
+    if len(ordered) < history_length + 1:
+        return series_features
+    return SeriesFeatures(
+        observations=series_features.observations[ordered],
+        closes=series_features.closes[ordered],
+        funding_rates=series_features.funding_rates[ordered],
+    )
+
+
+def _step_stride(windows: Sequence[list[dict]] | WindowedDataset, config: TrainingConfig) -> int:
+    """Bars between consecutive env steps: random-start episodes step every bar, window envs every stride."""
+    if config.episode_mode == EPISODE_MODE_RANDOM_START:
+        return 1
+    return windows.stride if isinstance(windows, WindowedDataset) else 1
+
+
+def train_policy(
+    windows: Sequence[list[dict]] | WindowedDataset,
+    config: TrainingConfig,
+    series: list[dict] | None = None,
+) -> TrainingResult:
+    if series is None and isinstance(windows, WindowedDataset):
+        series = windows.rows
+    if config.episode_mode not in EPISODE_MODES:
+        raise ValueError(f"episode_mode must be one of {EPISODE_MODES}, got {config.episode_mode!r}")
+    if config.episode_mode == EPISODE_MODE_RANDOM_START and not series:
+        raise ValueError("series rows are required for random_start episodes")
+    if config.episode_mode == EPISODE_MODE_RANDOM_START and not config.window_size and not len(windows):
+        raise ValueError("window_size is required for random_start episodes")
+    if config.history_length < 1:
+        raise ValueError("history_length must be positive")
+    if config.decision_interval < 1:
+        raise ValueError("decision_interval must be positive")
+    if config.observation_normalization not in NORMALIZATION_METHODS:
+        raise ValueError(
+            f"observation_normalization must be one of {NORMALIZATION_METHODS}, got {config.observation_normalization!r}"
+        )
+
     try:
         from stable_baselines3 import PPO
     except Exception as exc:  # pragma: no cover - optional dependency guard
         raise RuntimeError("stable-baselines3 is required for training") from exc
 
-    env = _build_env(windows, config)
+    feature_keys = resolve_feature_keys(config.feature_key_extras)
+    config = replace(config, window_size=config.window_size or len(windows[0]))
+    series_features = None
+    if config.episode_mode == EPISODE_MODE_RANDOM_START:
+        series_features = build_series_features(series, config.window_size, feature_keys)
+
+    normalization = None
+    if config.observation_normalization != NORMALIZATION_NONE:
+        matrix = (
+            series_features.observations
+            if series_features is not None
+            else build_window_observations(windows, feature_keys)
+        )
+        normalization = compute_normalization_stats(matrix, feature_keys, method=config.observation_normalization)
+
+    env = _build_episode_env(windows, series, series_features, config, normalization)
     model = PPO("MlpPolicy", env, verbose=0, seed=config.seed)
     model.learn(total_timesteps=max(1, int(config.timesteps)))
 
     feedback_rounds = max(0, int(config.feedback_rounds))
     feedback_timesteps = max(1, int(config.feedback_timesteps))
     for _ in range(feedback_rounds):
-        hard_windows = _select_hard_windows(model, windows, config)
-        if len(hard_windows) < 2:
-            break
-        hard_env = _build_env(hard_windows, config)
+        if series_features is not None:
+            hard_features = _select_hard_series(model, series, series_features, config, normalization)
+            hard_env = _build_episode_env(windows, series, hard_features, config, normalization)
+        else:
+            hard_windows = _select_hard_windows(model, windows, config, normalization)
+            if len(hard_windows) < 2:
+                break
+            hard_env = _build_episode_env(hard_windows, series, None, config, normalization)
         model.set_env(hard_env)
         model.learn(total_timesteps=feedback_timesteps, reset_num_timesteps=False)
 
@@ -103,6 +266,17 @@ def train_policy(windows: list[list[dict]], config: TrainingConfig) -> TrainingR
         model.save(handle.name)
         handle.seek(0)
         payload = handle.read()
+    payload = embed_observation_spec(
+        payload,
+        {
+            "feature_keys": feature_keys,
+            "window_size": config.window_size,
+            "stride": _step_stride(windows, config),
+            "history_length": config.history_length,
+            "decision_interval": config.decision_interval,
+            "normalization": normalization.to_dict() if normalization is not None else None,
+        },
+    )
 
     checksum = sha256(payload).hexdigest()
     encoded = base64.b64encode(payload).decode("utf-8")
@@ -120,6 +294,11 @@ def train_policy(windows: list[list[dict]], config: TrainingConfig) -> TrainingR
             f"drawdown_penalty={config.drawdown_penalty},"
             f"feedback_rounds={feedback_rounds},"
             f"feedback_timesteps={feedback_timesteps},"
-            f"feedback_hard_ratio={config.feedback_hard_ratio}"
+            f"feedback_hard_ratio={config.feedback_hard_ratio},"
+            f"episode_mode={config.episode_mode},"
+            f"episode_length={config.episode_length},"
+            f"observation_normalization={config.observation_normalization},"
+            f"history_length={config.history_length},"
+            f"decision_interval={config.decision_interval}"
         ),
     )
@@ -2,6 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
+# Fold boundary modes: equal bar counts, or equal wall-clock spans over a timestamp index
+WALK_FORWARD_SPLIT_BARS = "bars"
+WALK_FORWARD_SPLIT_TIME = "time"
+WALK_FORWARD_SPLIT_MODES = (WALK_FORWARD_SPLIT_BARS, WALK_FORWARD_SPLIT_TIME)
+
 
 @dataclass(frozen=True)
 class WalkForwardFold:
@@ -60,3 +67,59 @@ def build_walk_forward_folds(
     if strict and len(result) < folds:
         raise ValueError("Unable to construct requested walk-forward folds")
     return result
+
+
+def build_time_walk_forward_folds(
+    timestamps_ns: np.ndarray,
+    folds: int,
+    purge_bars: int = 0,
+    embargo_bars: int = 0,
+    min_train_bars: int | None = None,
+    strict: bool = True,
+) -> list[WalkForwardFold]:
+    """Like build_walk_forward_folds, but test folds cover equal time spans instead of equal bar counts."""
+    timestamps = np.asarray(timestamps_ns, dtype=np.int64)
+    total_windows = int(timestamps.size)
+    if total_windows <= 1:
+        if strict:
+            raise ValueError("Not enough windows for walk-forward evaluation")
+        return []
+    if folds <= 0:
+        raise ValueError("folds must be positive")
+    purge = max(0, purge_bars)
+    embargo = max(0, embargo_bars)
+    train_min = max(1, min_train_bars or total_windows // (folds + 1))
+
+    if total_windows - train_min <= 0:
+        if strict:
+            raise ValueError("Insufficient windows for requested min_train_bars")
+        return []
+
+    first_test_ts = int(timestamps[train_min])
+    span = (int(timestamps[-1]) - first_test_ts) / folds
+    boundaries = [first_test_ts + round(span * fold) for fold in range(1, folds)]
+    fold_ends = [*np.searchsorted(timestamps, boundaries, side="left").tolist(), total_windows]
+
+    result: list[WalkForwardFold] = []
+    train_end = train_min
+    for fold, boundary_end in enumerate(fold_ends, start=1):
+        test_start = train_end + purge
+        test_end = min(total_windows, int(boundary_end))
+        if test_start >= test_end:
+            break
+        result.append(
+            WalkForwardFold(
+                fold=fold,
+                train_start=0,
+                train_end=train_end,
+                test_start=test_start,
+                test_end=test_end,
+            )
+        )
+        train_end = min(total_windows, test_end + embargo)
+        if train_end >= total_windows:
+            break
+
+    if strict and len(result) < folds:
+        raise ValueError("Unable to construct requested walk-forward folds")
+    return result
@@ -5,8 +5,9 @@ from server import create_app
 
 
 @pytest.fixture(autouse=True)
-def _rl_service_env(monkeypatch):
+def _rl_service_env(monkeypatch, tmp_path):
     monkeypatch.setenv("RL_ENV", "test")
+    monkeypatch.setenv("RL_BACKTEST_CATALOG_PATH", str(tmp_path / "backtest_catalogs"))
     monkeypatch.setenv("RL_SERVICE_PORT", "9102")
     monkeypatch.setenv("RL_SERVICE_LOG_LEVEL", "warning")
 
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+
+
+class FakeConvexClient:
+    """Evaluates data:query payloads over in-memory tables with the Convex function's filter semantics."""
+
+    def __init__(self, tables: dict[str, list[dict]], failures: int = 0) -> None:
+        self.tables = tables
+        self.failures = failures
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    def query(self, name: str, args: dict):
+        assert name == "data:query"
+        with self._lock:
+            self.calls.append(args)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("transient")
+        rows = [row for row in self.tables.get(args["table"], []) if all(_matches(row, f) for f in args["filters"])]
+        order = args.get("order")
+        if order:
+            rows.sort(key=lambda row: row[order["field"]], reverse=order["direction"] == "desc")
+        return {"data": rows[: args.get("limit", len(rows))]}
+
+
+def _matches(row: dict, condition: dict) -> bool:
+    value = row.get(condition["field"])
+    if condition["op"] == "eq":
+        return value == condition["value"]
+    if condition["op"] == "gte":
+        return value >= condition["value"]
+    if condition["op"] == "lte":
+        return value <= condition["value"]
+    raise AssertionError(condition["op"])
+
+
+def build_convex_candle_rows(count: int, start: datetime, interval: timedelta, pair: str = "Gold-USDT") -> list[dict]:
+    """Candle rows as stored by the ingest jobs: open_time in JavaScript toISOString() format."""
+    rows = []
+    for index in range(count):
+        opened = start + interval * index
+        rows.append(
+            {
+                "pair": pair,
+                "interval": "1m",
+                "open_time": opened.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "open": 100.0 + index,
+                "high": 101.0 + index,
+                "low": 99.0 + index,
+                "close": 100.5 + index,
+                "volume": 10.0,
+            }
+        )
+    return rows
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta, timezone
 
+import pytest
+
 
 def test_dataset_preview_returns_version(client):
     now = datetime.now(tz=timezone.utc)
@@ -21,3 +23,172 @@ def test_dataset_preview_returns_version(client):
     assert body["version"]["window_size"] == 5
     assert body["version"]["stride"] == 1
     assert body["window_count"] > 0
+
+
+def test_dataset_validate_reports_and_repairs_rows(client):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "timestamp": (start + timedelta(minutes=idx)).isoformat(),
+            "open": 2000 + idx,
+            "high": 2001 + idx,
+            "low": 1999 + idx,
+            "close": 2000.5 + idx,
+            "volume": 10,
+        }
+        for idx in range(6)
+    ]
+    rows[2]["close"] = -1
+
+    response = client.post(
+        "/datasets/validate",
+        json={"rows": rows, "interval": "1m", "repairs": ["drop"], "return_rows": True},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["summary"]["valid"] is False
+    assert body["issue_rows"]["non_positive_price"] == [2]
+    assert len(body["rows"]) == 5
+
+
+def _candles(count: int) -> list[dict]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "timestamp": (start + timedelta(minutes=idx)).isoformat(),
+            "open": 2000.0 + idx,
+            "high": 2001.0 + idx,
+            "low": 1999.0 + idx,
+            "close": 2000.5 + idx,
+            "volume": 10.0,
+        }
+        for idx in range(count)
+    ]
+
+
+def test_dataset_validate_accepts_ndjson_stream(client):
+    import json
+
+    columns = ["timestamp", "open", "high", "low", "close", "volume"]
+    lines = [json.dumps({"interval": "1m", "columns": columns})]
+    lines += [json.dumps([row[name] for name in columns]) for row in _candles(5)]
+
+    response = client.post(
+        "/datasets/validate",
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["summary"]["row_count"] == 5
+    assert response.json()["summary"]["valid"] is True
+
+
+def test_dataset_validate_accepts_msgpack_stream(client):
+    msgpack = pytest.importorskip("msgpack")
+
+    body = msgpack.packb({"interval": "1m"}) + b"".join(msgpack.packb(row) for row in _candles(4))
+    response = client.post("/datasets/validate", content=body, headers={"Content-Type": "application/msgpack"})
+
+    assert response.status_code == 200
+    assert response.json()["summary"]["row_count"] == 4
+
+
+def test_dataset_cache_accepts_arrow_ipc_stream(client, monkeypatch, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    monkeypatch.setenv("RL_DATASET_CACHE_PATH", str(tmp_path))
+
+    rows = _candles(6)
+    table = pa.table(
+        {
+            "timestamp": pa.array(
+                [datetime.fromisoformat(row["timestamp"]) for row in rows], type=pa.timestamp("ms", tz="UTC")
+            ),
+            **{name: [row[name] for row in rows] for name in ("open", "high", "low", "close", "volume")},
+        }
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    response = client.post(
+        "/datasets/cache",
+        content=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["row_count"] == 6
+
+
+def test_dataset_endpoints_reject_unknown_content_type(client):
+    response = client.post("/datasets/validate", content=b"rows", headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 415
+
+
+def test_dataset_availability_reads_lake_manifest(client, monkeypatch, tmp_path):
+    pytest.importorskip("pyarrow")
+    import numpy as np
+
+    from data.bar_frame import BarFrame
+    from data_lake.candle_lake import write_candle_partitions
+
+    monkeypatch.setenv("RL_DATA_LAKE_PATH", str(tmp_path))
+    assert client.get("/datasets/availability").json() == {"series": []}
+    assert not (tmp_path / "_manifest.sqlite").exists()
+
+    start_ns = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+    timestamps = start_ns + np.arange(3, dtype=np.int64) * 60_000_000_000
+    close = np.array([1.0, 2.0, 3.0])
+    write_candle_partitions(tmp_path, "Gold-USDT", "1m", BarFrame(timestamps, close, close, close, close, close))
+
+    response = client.get("/datasets/availability", params={"pair": "Gold-USDT", "interval": "1m"})
+
+    assert response.status_code == 200
+    [series] = response.json()["series"]
+    assert series["table"] == "candles"
+    assert series["row_count"] == 3
+    assert series["first_at"].startswith("2024-01-01T00:00:00")
+    assert series["last_at"].startswith("2024-01-01T00:02:00")
+    assert client.get("/datasets/availability", params={"table": "tickers"}).json() == {"series": []}
+
+
+def test_dataset_validate_reports_defects_in_columnar_bodies(client):
+    import json
+
+    rows = _candles(5)
+    rows.insert(2, dict(rows[1]))
+    batch = {name: [row[name] for row in rows] for name in ("timestamp", "open", "high", "low", "close", "volume")}
+
+    response = client.post("/datasets/validate", json={"rows": batch, "interval": "1m"})
+
+    assert response.status_code == 200
+    assert response.json()["issue_rows"]["duplicate_timestamp"] == [2]
+
+    rows = _candles(4)
+    rows[1]["close"] = None
+    lines = [json.dumps({"interval": "1m"}), *(json.dumps(row) for row in rows)]
+    response = client.post(
+        "/datasets/validate", content="\n".join(lines).encode(), headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["issue_rows"]["missing_value"] == [1]
+    # Trading endpoints keep rejecting the same defects.
+    assert client.post("/datasets/cache", json={"rows": batch}).status_code == 422
+
+
+def test_openapi_documents_negotiated_request_bodies(client):
+    paths = client.get("/openapi.json").json()["paths"]
+
+    for path, field in (
+        ("/training/run", "dataset_features"),
+        ("/evaluations", "dataset_features"),
+        ("/datasets/validate", "rows"),
+        ("/datasets/cache", "rows"),
+    ):
+        content = paths[path]["post"]["requestBody"]["content"]
+        assert field in content["application/json"]["schema"]["properties"]
+        assert {"application/x-ndjson", "application/msgpack", "application/vnd.apache.arrow.stream"} <= set(content)
@@ -163,3 +163,53 @@ def test_evaluations_endpoint_rejects_empty_window(client):
     response = client.post("/evaluations", json=payload)
 
     assert response.status_code == 400
+
+
+def test_evaluations_endpoint_passes_columnar_features_as_bar_frame(client, monkeypatch):
+    import training.evaluation as evaluation_module
+    from data.bar_frame import BarFrame
+    from training.nautilus_backtest import MatrixBacktestResult
+
+    class _FakeBacktestResult:
+        run_id = "run-nautilus-columnar"
+        total_positions = 3
+        stats_pnls = {"PnL (total)": 120.0, "Win Rate": 66.0, "Total Positions": 3}
+        stats_returns = {"Max Drawdown": 0.08}
+
+    received = []
+
+    def _fake_backtest(**kwargs):
+        received.append(kwargs["features"])
+        return [
+            MatrixBacktestResult(
+                strategy_id="ema_trend",
+                venue_id="bingx_margin",
+                venue_name="BINGX",
+                result=_FakeBacktestResult(),
+            )
+        ]
+
+    monkeypatch.setattr(evaluation_module, "run_backtest", _fake_backtest)
+
+    now = datetime.now(tz=timezone.utc).replace(microsecond=0)
+    start = now - timedelta(minutes=25)
+    rows = _features(start, 25)
+    batch = {key: [row[key] for row in rows] for key in ("timestamp", "open", "high", "low", "close", "volume")}
+
+    response = client.post(
+        "/evaluations",
+        json={
+            "pair": "Gold-USDT",
+            "period_start": start.isoformat(),
+            "period_end": now.isoformat(),
+            "window_size": 3,
+            "strategy_ids": ["ema_trend"],
+            "dataset_features": batch,
+            "decision_threshold": 0.01,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["backtest_run_id"] == "run-nautilus-columnar"
+    assert isinstance(received[0], BarFrame)
+    assert len(received[0]) == 25
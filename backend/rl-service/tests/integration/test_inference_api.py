@@ -101,3 +101,84 @@ def test_inference_endpoint_uses_sb3_model_with_artifact(client, monkeypatch):
     assert body["decision"]["action"] in {"long", "short", "hold", "close"}
     assert "model_unavailable" not in body["warnings"]
     assert body["model_version"] == "test-model-v1"
+
+
+def test_inference_endpoint_applies_artifact_normalization(client, monkeypatch):
+    monkeypatch.setenv("RL_STRICT_MODEL_INFERENCE", "true")
+    start = datetime.now(tz=timezone.utc) - timedelta(minutes=20)
+
+    training_response = client.post(
+        "/training/run",
+        json={
+            "pair": "Gold-USDT",
+            "period_start": start.isoformat(),
+            "period_end": datetime.now(tz=timezone.utc).isoformat(),
+            "window_size": 3,
+            "stride": 1,
+            "timesteps": 25,
+            "observation_normalization": "zscore",
+            "dataset_features": _training_features(start, 20),
+        },
+    )
+    assert training_response.status_code == 200
+    assert "observation_normalization=zscore" in training_response.json()["hyperparameter_summary"]
+
+    response = client.post(
+        "/inference",
+        json={
+            "pair": "Gold-USDT",
+            "policy_version": "test-model-normalized",
+            "artifact_base64": training_response.json()["artifact_base64"],
+            "market": {
+                "pair": "Gold-USDT",
+                "candles": _market_candles(start, 15),
+                "last_price": 2060.0,
+                "spread": 0.1,
+            },
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["model_version"] == "test-model-normalized"
+
+    from api.inference import registry
+
+    assert registry.observation_spec("test-model-normalized")["normalization"]["method"] == "zscore"
+
+
+def test_inference_endpoint_stacks_feature_history(client, monkeypatch):
+    monkeypatch.setenv("RL_STRICT_MODEL_INFERENCE", "true")
+    start = datetime.now(tz=timezone.utc) - timedelta(minutes=20)
+
+    training_response = client.post(
+        "/training/run",
+        json={
+            "pair": "Gold-USDT",
+            "period_start": start.isoformat(),
+            "period_end": datetime.now(tz=timezone.utc).isoformat(),
+            "window_size": 3,
+            "stride": 1,
+            "timesteps": 25,
+            "history_length": 4,
+            "dataset_features": _training_features(start, 20),
+        },
+    )
+    assert training_response.status_code == 200
+
+    response = client.post(
+        "/inference",
+        json={
+            "pair": "Gold-USDT",
+            "policy_version": "test-model-history",
+            "artifact_base64": training_response.json()["artifact_base64"],
+            "market": {
+                "pair": "Gold-USDT",
+                "candles": _market_candles(start, 15),
+                "last_price": 2060.0,
+                "spread": 0.1,
+            },
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["model_version"] == "test-model-history"
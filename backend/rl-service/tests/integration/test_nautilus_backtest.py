@@ -1,17 +1,60 @@
 import base64
+import math
 import tempfile
 from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 
 import pytest
+from nautilus_trader.config import StrategyConfig
+from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.enums import OrderSide, TimeInForce
+from nautilus_trader.model.identifiers import InstrumentId
+from nautilus_trader.model.objects import Quantity
+from nautilus_trader.trading.strategy import Strategy
 
-from training.nautilus_backtest import run_backtest
+from training.evaluation import _extract_single_backtest_metrics
+from training.nautilus_backtest import STRATEGY_REGISTRY, run_backtest
 from training.sb3_trainer import TrainingConfig, train_policy
 
 
-def _features(start: datetime, count: int) -> list[dict]:
+class RoundTripStrategyConfig(StrategyConfig, frozen=True):
+    instrument_id: InstrumentId
+    bar_type: str
+    trade_size: Decimal
+    hold_bars: int = 5
+
+
+class RoundTripStrategy(Strategy):
+    """Test strategy: alternately opens a long and closes it every `hold_bars` bars, so balances move daily."""
+
+    def __init__(self, config: RoundTripStrategyConfig) -> None:
+        super().__init__(config)
+        self._instrument_id = InstrumentId.from_str(str(config.instrument_id))
+        self._bar_count = 0
+
+    def on_start(self) -> None:
+        self.subscribe_bars(BarType.from_str(self.config.bar_type))
+
+    def on_bar(self, bar: Bar) -> None:
+        self._bar_count += 1
+        if self._bar_count % self.config.hold_bars:
+            return
+        if self.cache.positions_open(instrument_id=self._instrument_id, strategy_id=self.id):
+            self.close_all_positions(self._instrument_id)
+            return
+        order = self.order_factory.market(
+            instrument_id=self._instrument_id,
+            order_side=OrderSide.BUY,
+            quantity=Quantity.from_str(str(self.config.trade_size)),
+            time_in_force=TimeInForce.GTC,
+        )
+        self.submit_order(order)
+
+
+def _features(start: datetime, count: int, step: timedelta = timedelta(minutes=1)) -> list[dict]:
     rows: list[dict] = []
     for idx in range(count):
-        ts = start + timedelta(minutes=idx)
+        ts = start + step * idx
         price = 2000 + idx * 0.2
         rows.append(
             {
@@ -63,3 +106,167 @@ def test_nautilus_backtest_returns_result():
     assert getattr(result, "run_id", None)
     assert hasattr(result, "stats_returns")
     assert hasattr(result, "stats_pnls")
+
+
+def test_backtest_reuses_persistent_catalog_across_runs(monkeypatch, tmp_path):
+    pytest.importorskip("nautilus_trader")
+    import training.nautilus_backtest as nautilus_backtest
+
+    catalog_paths: list[str] = []
+    built: list[int] = []
+
+    class _RecordingNode:
+        def __init__(self, configs):
+            catalog_paths.append(configs[0].data[0].catalog_path)
+
+        def run(self):
+            return [object()]
+
+    build_bars = nautilus_backtest._build_bars
+
+    def _counting_build_bars(*args, **kwargs):
+        bars = build_bars(*args, **kwargs)
+        built.append(len(bars))
+        return bars
+
+    monkeypatch.setenv("RL_BACKTEST_CATALOG_PATH", str(tmp_path))
+    monkeypatch.setattr(nautilus_backtest, "BacktestNode", _RecordingNode)
+    monkeypatch.setattr(nautilus_backtest, "_build_bars", _counting_build_bars)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    for _ in range(2):
+        nautilus_backtest.run_backtest(
+            pair="Gold-USDT",
+            interval="1m",
+            features=_features(start, 30),
+            model_path=None,
+            window_size=5,
+            decision_threshold=0.5,
+            strategy_ids=["ema_trend"],
+            venue_ids=["bingx_margin", "okx_margin"],
+        )
+
+    assert built == [30, 30]
+    assert len(set(catalog_paths)) == 2
+    assert catalog_paths[:2] == catalog_paths[2:]
+    assert all(path.startswith(str(tmp_path)) for path in catalog_paths)
+
+
+def test_engine_execution_matches_node_results():
+    pytest.importorskip("nautilus_trader")
+
+    runs = {
+        execution: run_backtest(
+            pair="Gold-USDT",
+            interval="1m",
+            features=_features(datetime(2024, 1, 1, tzinfo=timezone.utc), 150),
+            model_path=None,
+            window_size=5,
+            decision_threshold=0.5,
+            strategy_ids=["ema_trend"],
+            venue_ids=["bingx_margin"],
+            execution=execution,
+        )
+        for execution in ("node", "engine")
+    }
+
+    [node], [engine] = runs["node"], runs["engine"]
+    assert (engine.strategy_id, engine.venue_id, engine.venue_name) == (node.strategy_id, node.venue_id, node.venue_name)
+    assert engine.result.iterations == node.result.iterations == 150
+    assert engine.result.total_orders == node.result.total_orders
+    assert str(engine.result.stats_pnls) == str(node.result.stats_pnls)
+    with pytest.raises(ValueError, match="execution must be one of"):
+        run_backtest(
+            pair="Gold-USDT",
+            interval="1m",
+            features=_features(datetime(2024, 1, 1, tzinfo=timezone.utc), 10),
+            model_path=None,
+            window_size=5,
+            decision_threshold=0.5,
+            execution="threads",
+        )
+
+
+def test_matrix_execution_isolates_each_leg():
+    pytest.importorskip("nautilus_trader")
+
+    features = _features(datetime(2024, 1, 1, tzinfo=timezone.utc), 150)
+
+    def run(strategy_ids, venue_ids=("bingx_margin",)):
+        return run_backtest(
+            pair="Gold-USDT",
+            interval="1m",
+            features=features,
+            model_path=None,
+            window_size=5,
+            decision_threshold=0.5,
+            strategy_ids=strategy_ids,
+            venue_ids=list(venue_ids),
+            execution="matrix",
+        )
+
+    combined = run(["ema_trend", "bollinger_mean_rev"], venue_ids=("bingx_margin", "okx_margin"))
+    [alone] = run(["ema_trend"])
+
+    assert [(item.strategy_id, item.venue_id, item.venue_name) for item in combined] == [
+        ("ema_trend", "bingx_margin", "BINGX"),
+        ("bollinger_mean_rev", "bingx_margin", "BINGX"),
+        ("ema_trend", "okx_margin", "OKX"),
+        ("bollinger_mean_rev", "okx_margin", "OKX"),
+    ]
+    # Every leg replays its own bar stream on its own venue account.
+    assert combined[0].result.iterations == 600
+    for ema in (combined[0], combined[2]):
+        assert ema.result.total_orders == alone.result.total_orders > 0
+        assert str(ema.result.stats_pnls) == str(alone.result.stats_pnls)
+    for item in combined:
+        summary = item.result.summary
+        assert item.result.total_positions == int(summary["positions.total_with_snapshots"])
+        assert int(summary["positions.total"]) == int(summary["positions.open"]) + int(summary["positions.closed"])
+
+
+def test_matrix_execution_matches_solo_returns_and_drawdown(monkeypatch):
+    pytest.importorskip("nautilus_trader")
+
+    for strategy_id, hold_bars in (("round_trip_fast", 3), ("round_trip_slow", 7)):
+        monkeypatch.setitem(
+            STRATEGY_REGISTRY,
+            strategy_id,
+            {
+                "strategy_path": f"{__name__}:RoundTripStrategy",
+                "config_path": f"{__name__}:RoundTripStrategyConfig",
+                "config": {"hold_bars": hold_bars},
+            },
+        )
+    # Hourly bars over several days, so returns come from daily account balances, not per-position returns.
+    features = _features(datetime(2024, 1, 1, tzinfo=timezone.utc), 240, step=timedelta(hours=1))
+    for idx, row in enumerate(features):
+        swing = 20.0 * math.sin(2 * math.pi * idx / 31)
+        for key in ("open", "high", "low", "close"):
+            row[key] += swing
+
+    def run(strategy_ids, execution):
+        return run_backtest(
+            pair="Gold-USDT",
+            interval="1h",
+            features=features,
+            model_path=None,
+            window_size=5,
+            decision_threshold=0.5,
+            strategy_ids=strategy_ids,
+            venue_ids=["bingx_margin", "okx_margin"],
+            execution=execution,
+        )
+
+    combined = run(["round_trip_fast", "round_trip_slow"], "matrix")
+    solo = {(item.strategy_id, item.venue_id): item.result for item in run(["round_trip_fast", "round_trip_slow"], "engine")}
+    assert len(combined) == len(solo) == 4
+    for leg in combined:
+        expected = solo[(leg.strategy_id, leg.venue_id)]
+        assert leg.result.stats_returns["Returns Volatility (252 days)"] > 0
+        assert str(leg.result.stats_returns) == str(expected.stats_returns)
+        assert str(leg.result.stats_pnls) == str(expected.stats_pnls)
+        leg_metrics, _, _ = _extract_single_backtest_metrics(leg.result, drawdown_penalty=1.0)
+        solo_metrics, _, _ = _extract_single_backtest_metrics(expected, drawdown_penalty=1.0)
+        assert leg_metrics.max_drawdown == solo_metrics.max_drawdown
+        assert leg_metrics.net_pnl_after_fees == solo_metrics.net_pnl_after_fees
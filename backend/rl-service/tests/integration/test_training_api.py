@@ -57,3 +57,123 @@ def test_training_endpoint_requires_features(client):
     )
 
     assert response.status_code == 400
+
+
+def test_training_endpoint_accepts_cached_dataset_ref(client, monkeypatch, tmp_path):
+    monkeypatch.setenv("RL_DATASET_CACHE_PATH", str(tmp_path))
+    start = datetime.now(tz=timezone.utc) - timedelta(minutes=10)
+
+    cached = client.post("/datasets/cache", json={"rows": _features(start, 12)})
+    assert cached.status_code == 200
+    dataset_ref = cached.json()["dataset_ref"]
+    assert cached.json()["row_count"] == 12
+    assert client.get(f"/datasets/cache/{dataset_ref}").status_code == 200
+
+    response = client.post(
+        "/training/run",
+        json={
+            "pair": "Gold-USDT",
+            "period_start": start.isoformat(),
+            "period_end": datetime.now(tz=timezone.utc).isoformat(),
+            "window_size": 3,
+            "timesteps": 25,
+            "dataset_ref": dataset_ref,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["artifact_base64"]
+
+
+def test_training_endpoint_rejects_unknown_dataset_ref(client, monkeypatch, tmp_path):
+    monkeypatch.setenv("RL_DATASET_CACHE_PATH", str(tmp_path))
+    response = client.post(
+        "/training/run",
+        json={
+            "pair": "Gold-USDT",
+            "period_start": datetime.now(tz=timezone.utc).isoformat(),
+            "period_end": datetime.now(tz=timezone.utc).isoformat(),
+            "dataset_ref": "0" * 64,
+        },
+    )
+
+    assert response.status_code == 404
+
+
+def test_training_endpoint_accepts_columnar_dataset_features(client):
+    start = datetime.now(tz=timezone.utc).replace(microsecond=0) - timedelta(minutes=10)
+    rows = _features(start, 12)
+    batch = {key: [row[key] for row in rows] for key in ("timestamp", "open", "high", "low", "close", "volume")}
+
+    response = client.post(
+        "/training/run",
+        json={
+            "pair": "Gold-USDT",
+            "period_start": start.isoformat(),
+            "period_end": datetime.now(tz=timezone.utc).isoformat(),
+            "window_size": 3,
+            "timesteps": 25,
+            "dataset_features": batch,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["artifact_base64"]
+
+
+def test_training_endpoint_rejects_ragged_columnar_features(client):
+    response = client.post(
+        "/training/run",
+        json={
+            "pair": "Gold-USDT",
+            "period_start": datetime.now(tz=timezone.utc).isoformat(),
+            "period_end": datetime.now(tz=timezone.utc).isoformat(),
+            "dataset_features": {
+                "timestamp": [1, 2],
+                "open": [1.0],
+                "high": [1.0, 1.0],
+                "low": [1.0, 1.0],
+                "close": [1.0, 1.0],
+                "volume": [1.0, 1.0],
+            },
+        },
+    )
+
+    assert response.status_code == 422
+
+
+def test_training_endpoint_accepts_ndjson_stream(client):
+    import json
+
+    start = datetime.now(tz=timezone.utc).replace(microsecond=0) - timedelta(minutes=10)
+    header = {
+        "pair": "Gold-USDT",
+        "period_start": start.isoformat(),
+        "period_end": datetime.now(tz=timezone.utc).isoformat(),
+        "window_size": 3,
+        "timesteps": 25,
+    }
+    body = "\n".join([json.dumps(header), *(json.dumps(row) for row in _features(start, 12))])
+
+    response = client.post("/training/run", content=body.encode(), headers={"Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    assert response.json()["artifact_base64"]
+
+
+def test_training_endpoint_rejects_period_without_rows(client):
+    start = datetime.now(tz=timezone.utc) - timedelta(minutes=10)
+    response = client.post(
+        "/training/run",
+        json={
+            "pair": "Gold-USDT",
+            "period_start": (start - timedelta(days=2)).isoformat(),
+            "period_end": (start - timedelta(days=1)).isoformat(),
+            "window_size": 3,
+            "timesteps": 25,
+            "dataset_features": _features(start, 12),
+        },
+    )
+
+    assert response.status_code == 400
+    assert "period_start" in response.json()["detail"]
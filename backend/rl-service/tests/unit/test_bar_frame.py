@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from data.bar_frame import BarFrame
+
+
+def _rows(count: int) -> list[dict]:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "timestamp": (base + timedelta(minutes=idx)).isoformat(),
+            "open": 2000.0 + idx,
+            "high": 2001.0 + idx,
+            "low": 1999.0 + idx,
+            "close": 2000.5 + idx,
+            "volume": 10.0 + idx,
+            "funding_rate": 0.0001,
+            "pair": "Gold-USDT",
+        }
+        for idx in range(count)
+    ]
+
+
+def test_bar_frame_round_trips_rows_and_keeps_numeric_extras():
+    frame = BarFrame.from_rows(_rows(3))
+
+    assert frame.columns == ("timestamp", "open", "high", "low", "close", "volume", "funding_rate")
+    assert frame.timestamps.dtype == np.int64
+    rows = frame.to_rows()
+    assert rows[0]["timestamp"] == "2024-01-01T00:00:00+00:00"
+    assert rows[2]["close"] == 2002.5
+    assert rows[1]["funding_rate"] == 0.0001
+    assert "pair" not in rows[0]
+
+
+def test_bar_frame_slices_are_views_and_sorting_is_stable():
+    frame = BarFrame.from_rows(_rows(6))
+
+    window = frame[2:5]
+    assert len(window) == 3
+    assert np.shares_memory(window.close, frame.close)
+
+    shuffled = frame[np.array([3, 0, 5, 1, 4, 2])]
+    assert not shuffled.is_sorted()
+    assert shuffled.sorted().close.tolist() == frame.close.tolist()
+    with pytest.raises(TypeError):
+        frame[0]
+
+
+def test_bar_frame_resample_aggregates_buckets():
+    resampled = BarFrame.from_rows(_rows(5)).resample(120)
+
+    assert len(resampled) == 3
+    assert resampled.open.tolist() == [2000.0, 2002.0, 2004.0]
+    assert resampled.high.tolist() == [2002.0, 2004.0, 2005.0]
+    assert resampled.close.tolist() == [2001.5, 2003.5, 2004.5]
+    assert resampled.volume.tolist() == [21.0, 25.0, 14.0]
+
+
+def test_bar_frame_is_much_smaller_than_dict_rows():
+    import sys
+
+    rows = _rows(1000)
+    frame = BarFrame.from_rows(rows)
+    row_bytes = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values()) for row in rows)
+
+    assert frame.nbytes * 8 < row_bytes
+
+
+def test_bar_frame_timestamp_index_is_built_once():
+    frame = BarFrame.from_rows(_rows(5))
+
+    assert frame.timestamp_index is frame.timestamp_index
+    assert frame[1:3].timestamp_index.values.tolist() == frame.timestamps[1:3].tolist()
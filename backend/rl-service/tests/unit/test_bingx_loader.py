@@ -0,0 +1,196 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from data.bingx_loader import BingxMarketDataLoader, interval_to_seconds, parse_candle_frame, parse_candle_rows
+from data.candle_store import CandleStore
+from schemas import TradingPair
+from tests.fixtures.convex_client import FakeConvexClient, build_convex_candle_rows
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_fetch_candle_range_paginates_spans():
+    client = FakeConvexClient({"bingx_candles": build_convex_candle_rows(250, START, timedelta(minutes=1))})
+    with BingxMarketDataLoader(client=client, max_workers=3) as loader:
+        candles = loader.fetch_candle_range(
+            TradingPair.GOLD_USDT, "1m", START + timedelta(minutes=10), START + timedelta(minutes=209), page_size=40
+        )
+
+    assert len(candles) == 200
+    assert candles[0].timestamp == START + timedelta(minutes=10)
+    assert candles[-1].timestamp == START + timedelta(minutes=209)
+    assert all(left.timestamp < right.timestamp for left, right in zip(candles, candles[1:]))
+    assert len(client.calls) >= 5
+
+
+def test_fetch_candle_range_follows_cursor_when_span_overflows():
+    # 30s bars under a 1m interval label: each one-page span holds two pages of rows.
+    client = FakeConvexClient({"bingx_candles": build_convex_candle_rows(120, START, timedelta(seconds=30))})
+    loader = BingxMarketDataLoader(client=client, max_workers=2)
+    candles = loader.fetch_candle_range(TradingPair.GOLD_USDT, "1m", START, START + timedelta(minutes=60), page_size=20)
+    loader.close()
+
+    assert len(candles) == 120
+    assert len({candle.timestamp for candle in candles}) == 120
+
+
+def test_query_retries_with_backoff():
+    delays: list[float] = []
+    client = FakeConvexClient({"bingx_candles": build_convex_candle_rows(5, START, timedelta(minutes=1))}, failures=2)
+    with BingxMarketDataLoader(client=client, backoff_seconds=0.1, sleep=delays.append) as loader:
+        candles = loader.fetch_candles(TradingPair.GOLD_USDT, "1m")
+
+    assert len(candles) == 5
+    assert delays == [0.1, 0.2]
+
+
+def test_query_gives_up_after_max_retries():
+    client = FakeConvexClient({}, failures=5)
+    with BingxMarketDataLoader(client=client, max_retries=1, sleep=lambda _: None) as loader:
+        with pytest.raises(ConnectionError):
+            loader.fetch_candles(TradingPair.GOLD_USDT, "1m")
+    assert len(client.calls) == 2
+
+
+def test_load_market_snapshot_uses_latest_ticker():
+    tickers = [
+        {"pair": "Gold-USDT", "last_price": 101.0, "captured_at": "2024-01-01T00:00:00.000Z"},
+        {"pair": "Gold-USDT", "last_price": 105.0, "captured_at": "2024-01-01T00:05:00.000Z"},
+    ]
+    client = FakeConvexClient({"bingx_candles": build_convex_candle_rows(3, START, timedelta(minutes=1)), "bingx_tickers": tickers})
+    with BingxMarketDataLoader(client=client) as loader:
+        snapshot = loader.load_market_snapshot(TradingPair.GOLD_USDT, "1m")
+        latest = loader.load_market_snapshot(TradingPair.GOLD_USDT, "1m", limit=2)
+
+    assert len(snapshot.candles) == 3
+    assert snapshot.last_price == 105.0
+    assert snapshot.ticker["captured_at"] == "2024-01-01T00:05:00.000Z"
+    assert [candle.timestamp for candle in latest.candles] == [START + timedelta(minutes=1), START + timedelta(minutes=2)]
+
+
+def test_interval_to_seconds():
+    assert interval_to_seconds("5m") == 300
+    assert interval_to_seconds("4h") == 14400
+    assert interval_to_seconds("1w") == 604800
+    assert interval_to_seconds("bad") is None
+
+
+def test_cached_loader_fetches_only_new_bars():
+    start = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=60)
+    table = build_convex_candle_rows(50, start, timedelta(minutes=1))
+    client = FakeConvexClient({"bingx_candles": table})
+    with BingxMarketDataLoader(client=client, cache=CandleStore(":memory:"), overlap_bars=2) as loader:
+        first = loader.fetch_candles(TradingPair.GOLD_USDT, "1m", limit=500)
+        table.extend(build_convex_candle_rows(55, start, timedelta(minutes=1))[50:])
+        sync = loader.sync_candles(TradingPair.GOLD_USDT, "1m")
+        cached = loader.fetch_candles(TradingPair.GOLD_USDT, "1m", limit=500)
+
+    assert len(first) == 50
+    # Five new bars plus the two-bar overlap, then only the overlap on the next read.
+    assert (sync.fetched, sync.new) == (7, 5)
+    assert sync.high_water_mark == start + timedelta(minutes=54)
+    assert len(cached) == 55
+    lower_bounds = [f["value"] for f in client.calls[-1]["filters"] if f["op"] == "gte"]
+    assert lower_bounds == [(start + timedelta(minutes=53)).strftime("%Y-%m-%dT%H:%M:%S.000Z")]
+
+
+def test_cold_cache_sync_is_bounded_by_the_read():
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    start = now - timedelta(minutes=300)
+    client = FakeConvexClient({"bingx_candles": build_convex_candle_rows(300, start, timedelta(minutes=1))})
+    store = CandleStore(":memory:")
+    with BingxMarketDataLoader(client=client, cache=store) as loader:
+        latest = loader.fetch_candles(TradingPair.GOLD_USDT, "1m", limit=20)
+        assert store.count("Gold-USDT", "1m") <= 21
+        assert latest[-1].timestamp == now - timedelta(minutes=1)
+
+        range_start = start + timedelta(minutes=200)
+        candles = loader.fetch_candle_range(TradingPair.GOLD_USDT, "1m", range_start, now)
+        sync = loader.sync_candles(TradingPair.GOLD_USDT, "1m")
+
+    # The range read backfilled only the head it needed, and only those bars count as new.
+    assert len(candles) == 100
+    assert store.low_water_mark("Gold-USDT", "1m") == range_start
+    assert (sync.fetched, sync.new) == (2, 0)
+
+
+def test_cached_loader_repairs_revised_last_bar():
+    table = build_convex_candle_rows(10, START, timedelta(minutes=1))
+    client = FakeConvexClient({"bingx_candles": table})
+    store = CandleStore(":memory:")
+    with BingxMarketDataLoader(client=client, cache=store) as loader:
+        loader.sync_candles(TradingPair.GOLD_USDT, "1m")
+        table[-1] = {**table[-1], "close": 250.0, "high": 251.0}
+        candles = loader.fetch_candle_range(TradingPair.GOLD_USDT, "1m", START, START + timedelta(minutes=9))
+
+    assert len(candles) == 10
+    assert candles[-1].close == 250.0
+    assert store.count("Gold-USDT", "1m") == 10
+
+
+@pytest.mark.parametrize("lag", [timedelta(hours=1), timedelta(hours=10)])
+def test_cached_fetch_candles_returns_full_window_from_lagging_mirror(lag):
+    end = datetime.now(timezone.utc).replace(second=0, microsecond=0) - lag
+    table = build_convex_candle_rows(300, end - timedelta(minutes=299), timedelta(minutes=1))
+
+    with BingxMarketDataLoader(client=FakeConvexClient({"bingx_candles": table})) as loader:
+        uncached = loader.fetch_candles(TradingPair.GOLD_USDT, "1m", limit=200)
+    with BingxMarketDataLoader(client=FakeConvexClient({"bingx_candles": table}), cache=CandleStore(":memory:")) as loader:
+        cold = loader.fetch_candles(TradingPair.GOLD_USDT, "1m", limit=200)
+    store = CandleStore(":memory:")
+    with BingxMarketDataLoader(client=FakeConvexClient({"bingx_candles": table}), cache=store) as loader:
+        # A short range read warms the cache with the last 30 bars only.
+        loader.fetch_candle_range(TradingPair.GOLD_USDT, "1m", end - timedelta(minutes=29), end)
+        warm = loader.fetch_candles(TradingPair.GOLD_USDT, "1m", limit=200)
+
+    expected = [end - timedelta(minutes=199 - index) for index in range(200)]
+    for candles in (uncached, cold, warm):
+        assert [candle.timestamp for candle in candles] == expected
+    assert store.count("Gold-USDT", "1m") == 200
+
+
+def test_candle_store_persists_between_instances(tmp_path):
+    path = tmp_path / "candles.sqlite"
+    client = FakeConvexClient({"bingx_candles": build_convex_candle_rows(5, START, timedelta(minutes=1))})
+    with BingxMarketDataLoader(client=client, cache=CandleStore(path)) as loader:
+        loader.sync_candles(TradingPair.GOLD_USDT, "1m")
+
+    reopened = CandleStore(path)
+    assert reopened.high_water_mark("Gold-USDT", "1m") == START + timedelta(minutes=4)
+    assert [c.close for c in reopened.read("Gold-USDT", "1m", start=START + timedelta(minutes=3))] == [103.5, 104.5]
+
+
+def test_parse_candle_frame_matches_object_parser():
+    rows = [
+        {"open_time": "2024-01-01T00:00:00.000Z", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 3},
+        {"open_time": 1704067260000, "open": 1.1, "close": 1.2},
+        {"timestamp": 1704067320, "close": 2.0},
+        {"open_time": "not-a-time", "close": 9.0},
+        {"open_time": None, "close": 9.0},
+        {"open_time": "2024-01-01T01:04:00+01:00", "close": 3.0},
+        {"open_time": 1704067500123.456, "close": 4.0},
+    ]
+    frame = parse_candle_frame(rows)
+    candles = parse_candle_rows(rows)
+
+    expected_ns = [int(candle.timestamp.timestamp() * 1_000_000) * 1_000 for candle in candles]
+    assert frame.timestamps.tolist() == expected_ns
+    assert frame.close.tolist() == [candle.close for candle in candles]
+    assert frame.open.tolist() == [candle.open for candle in candles]
+    assert frame.timestamps[-1] == 1_704_067_500_123_456_000
+    assert len(parse_candle_frame([])) == 0
+
+
+def test_fetch_candle_frame_with_and_without_cache():
+    table = build_convex_candle_rows(90, START, timedelta(minutes=1))
+    start, end = START + timedelta(minutes=5), START + timedelta(minutes=84)
+    with BingxMarketDataLoader(client=FakeConvexClient({"bingx_candles": table})) as loader:
+        direct = loader.fetch_candle_frame(TradingPair.GOLD_USDT, "1m", start, end, page_size=25)
+    with BingxMarketDataLoader(client=FakeConvexClient({"bingx_candles": table}), cache=CandleStore(":memory:")) as loader:
+        cached = loader.fetch_candle_frame(TradingPair.GOLD_USDT, "1m", start, end, page_size=25)
+
+    assert len(direct) == 80
+    np.testing.assert_array_equal(direct.timestamps, cached.timestamps)
+    np.testing.assert_array_equal(direct.close, cached.close)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from data.candle_codec import decode_columns, detect_precision, encode_columns, read_encoded, read_header, write_encoded
+
+MINUTE_NS = 60 * 1_000_000_000
+
+
+def _columns(rows: int = 5000) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(7)
+    timestamps = 1_704_067_200 * 1_000_000_000 + np.arange(rows, dtype=np.int64) * MINUTE_NS
+    timestamps[rows // 2 :] += 5 * MINUTE_NS
+    close = np.round(2000.0 + np.cumsum(rng.normal(0.0, 0.3, rows)), 2)
+    return {
+        "timestamp": timestamps,
+        "open": close,
+        "high": np.round(close + 0.45, 2),
+        "low": np.round(close - 0.45, 2),
+        "close": close,
+        "volume": np.round(rng.gamma(2.0, 50.0, rows), 3),
+    }
+
+
+@pytest.mark.parametrize("compressor", ["zlib", "zstd"])
+def test_codec_round_trips_exactly_and_is_smaller_than_float64(compressor):
+    if compressor == "zstd":
+        pytest.importorskip("pyarrow")
+    columns = _columns()
+
+    data = encode_columns(columns, compressor=compressor)
+    decoded = decode_columns(data)
+
+    for name, values in columns.items():
+        assert decoded[name].dtype == values.dtype
+        assert np.array_equal(decoded[name], values)
+    header, _ = read_header(data)
+    encodings = {entry["name"]: (entry["encoding"], entry.get("precision")) for entry in header["columns"]}
+    assert encodings["timestamp"] == ("dod", None)
+    assert encodings["close"] == ("scaled", 2)
+    assert encodings["volume"] == ("scaled", 3)
+    assert len(data) * 4 < sum(values.nbytes for values in columns.values())
+
+
+def test_codec_falls_back_to_raw_floats_and_handles_edge_sizes(tmp_path):
+    noisy = np.array([0.1, np.nan, 1 / 3])
+    path = write_encoded(tmp_path / "bars.rlc", {"timestamp": np.array([5], dtype=np.int64).repeat(3), "x": noisy})
+
+    decoded = read_encoded(path, ["x"])
+
+    assert list(decoded) == ["x"]
+    assert np.array_equal(decoded["x"], noisy, equal_nan=True)
+    assert detect_precision(np.array([2000.25, 1999.5])) == 2
+    assert detect_precision(noisy) is None
+    assert decode_columns(encode_columns({"t": np.array([], dtype=np.int64)}))["t"].size == 0
+    assert decode_columns(encode_columns({"t": np.array([42], dtype=np.int64)}))["t"].tolist() == [42]
+    pinned = encode_columns({"p": np.array([1.5, 1.25])}, precisions={"p": 4})
+    assert read_header(pinned)[0]["columns"][0]["precision"] == 4
+    assert decode_columns(pinned)["p"].tolist() == [1.5, 1.25]
+    with pytest.raises(ValueError):
+        encode_columns({"a": np.zeros(2), "b": np.zeros(3)})
+    with pytest.raises(ValueError):
+        decode_columns(b"not a candle file")
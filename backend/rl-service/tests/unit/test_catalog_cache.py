@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+
+from data.bar_frame import BarFrame
+from training.catalog_cache import CatalogCache, bar_data_hash, catalog_key
+
+
+def _build(calls: list[str], size: int = 1000):
+    def build(path):
+        calls.append(path.name)
+        (path / "bars.parquet").write_bytes(b"x" * size)
+
+    return build
+
+
+def test_catalog_cache_reuses_published_catalogs(tmp_path):
+    cache = CatalogCache(tmp_path)
+    calls: list[str] = []
+
+    with cache.catalog("ab" * 32, _build(calls)) as first:
+        assert (first / "bars.parquet").exists()
+    with cache.catalog("ab" * 32, _build(calls)) as second:
+        assert second == first
+
+    assert len(calls) == 1
+    assert cache.size_bytes() == 1000
+    assert not [path for path in first.parent.iterdir() if path.name.startswith(".")]
+
+
+def test_catalog_cache_evicts_least_recently_used_but_not_pinned(tmp_path):
+    cache = CatalogCache(tmp_path, max_bytes=2500)
+    calls: list[str] = []
+    keys = [f"{index:02d}" * 32 for index in range(3)]
+    for offset, key in enumerate(keys[:2]):
+        with cache.catalog(key, _build(calls)) as path:
+            os.utime(path / "entry.json", (1_000_000 + offset, 1_000_000 + offset))
+
+    with cache.catalog(keys[0], _build(calls)):
+        with cache.catalog(keys[2], _build(calls)):
+            pass
+
+    assert not cache.contains(keys[1])
+    assert cache.contains(keys[0]) and cache.contains(keys[2])
+    assert len(calls) == 3
+
+    pinned = CatalogCache(tmp_path, max_bytes=0)
+    with pinned.catalog(keys[0], _build(calls)):
+        assert pinned.evict() == [keys[2]]
+        assert pinned.contains(keys[0])
+
+
+def test_catalog_key_changes_with_bar_data_and_instrument_meta():
+    timestamps = np.arange(3, dtype=np.int64) * 60_000_000_000
+    close = np.array([1.0, 2.0, 3.0])
+    frame = BarFrame(timestamps, close, close, close, close, close)
+    changed = BarFrame(timestamps, close, close, close, close + 0.01, close)
+
+    key = catalog_key("Gold-USDT", "BINGX", "1m", (2, 3, "0.01", "0.001"), bar_data_hash(frame))
+
+    assert key == catalog_key("Gold-USDT", "BINGX", "1m", (2, 3, "0.01", "0.001"), bar_data_hash(frame))
+    assert key != catalog_key("Gold-USDT", "BINGX", "1m", (2, 3, "0.01", "0.001"), bar_data_hash(changed))
+    assert key != catalog_key("Gold-USDT", "OKX", "1m", (2, 3, "0.01", "0.001"), bar_data_hash(frame))
+    assert key != catalog_key("Gold-USDT", "BINGX", "1m", (3, 3, "0.001", "0.001"), bar_data_hash(frame))
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data.bingx_loader import BingxMarketDataLoader
+from data_lake.candle_lake import read_candle_partitions
+from data_lake.convex_export import EXPORT_TABLE_CANDLES, ConvexLakeExporter
+from schemas import TradingPair
+from tests.fixtures.convex_client import FakeConvexClient, build_convex_candle_rows
+
+START = datetime(2024, 1, 1, 22, tzinfo=timezone.utc)
+
+
+class FailingAfter:
+    """Wraps a client and fails every query after `calls` successful ones."""
+
+    def __init__(self, client: FakeConvexClient, calls: int) -> None:
+        self.client = client
+        self.remaining = calls
+
+    def query(self, name: str, args: dict):
+        if self.remaining <= 0:
+            raise ConnectionError("convex unavailable")
+        self.remaining -= 1
+        return self.client.query(name, args)
+
+
+def test_export_candles_partitions_by_day_and_is_idempotent(tmp_path):
+    rows = build_convex_candle_rows(240, START, timedelta(minutes=1))
+    end = START + timedelta(minutes=239)
+    with BingxMarketDataLoader(client=FakeConvexClient({"bingx_candles": rows}), max_workers=3) as loader:
+        exporter = ConvexLakeExporter(loader, tmp_path, chunk=timedelta(minutes=50), page_size=30)
+        first = exporter.export_candles(TradingPair.GOLD_USDT, "1m", START, end)
+        again = ConvexLakeExporter(loader, tmp_path / "other").export_candles(TradingPair.GOLD_USDT, "1m", START, end)
+
+    assert first.rows == 240
+    assert first.chunks == 5
+    assert again.rows == 240
+    days = sorted(path.name for path in (tmp_path / "candles" / "pair=Gold-USDT" / "interval=1m").iterdir())
+    assert days == ["date=2024-01-01", "date=2024-01-02"]
+
+    frame = read_candle_partitions(tmp_path, "Gold-USDT", "1m")
+    assert len(frame) == 240
+    assert frame.close[0] == 100.5
+    assert exporter.read_checkpoint(EXPORT_TABLE_CANDLES, "Gold-USDT", "1m")["through"].startswith("2024-01-02T01:59")
+
+    # Re-exporting an overlapping range does not duplicate rows.
+    with BingxMarketDataLoader(client=FakeConvexClient({"bingx_candles": rows})) as loader:
+        ConvexLakeExporter(loader, tmp_path / "fresh").export_candles(TradingPair.GOLD_USDT, "1m", START, end)
+        ConvexLakeExporter(loader, tmp_path / "fresh").export_candles(
+            TradingPair.GOLD_USDT, "1m", START - timedelta(hours=1), end
+        )
+    assert len(read_candle_partitions(tmp_path / "fresh", "Gold-USDT", "1m")) == 240
+
+
+def test_export_resumes_from_checkpoint(tmp_path):
+    rows = build_convex_candle_rows(200, START, timedelta(minutes=1))
+    end = START + timedelta(minutes=199)
+    flaky = FailingAfter(FakeConvexClient({"bingx_candles": rows}), calls=2)
+    with BingxMarketDataLoader(client=flaky, max_workers=1, max_retries=0) as loader:
+        exporter = ConvexLakeExporter(loader, tmp_path, chunk=timedelta(minutes=59), page_size=100)
+        with pytest.raises(ConnectionError):
+            exporter.export_candles(TradingPair.GOLD_USDT, "1m", START, end)
+
+    healthy = FakeConvexClient({"bingx_candles": rows})
+    with BingxMarketDataLoader(client=healthy) as loader:
+        resumed = ConvexLakeExporter(loader, tmp_path, chunk=timedelta(minutes=59), page_size=100).export_candles(
+            TradingPair.GOLD_USDT, "1m", START, end
+        )
+
+    assert resumed.resumed_from is not None
+    assert resumed.rows < 200
+    assert len(read_candle_partitions(tmp_path, "Gold-USDT", "1m")) == 200
+
+
+def test_export_tickers(tmp_path):
+    tickers = [
+        {
+            "pair": "Gold-USDT",
+            "captured_at": (START + timedelta(minutes=15 * index)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "last_price": 2000.0 + index,
+            "volume_24h": None,
+            "price_change_24h": 0.5,
+        }
+        for index in range(16)
+    ]
+    with BingxMarketDataLoader(client=FakeConvexClient({"bingx_tickers": tickers})) as loader:
+        stats = ConvexLakeExporter(loader, tmp_path).export_tickers(
+            TradingPair.GOLD_USDT, START, START + timedelta(hours=4)
+        )
+
+    assert stats.rows == 16
+    assert stats.partitions == 2
+    assert list((tmp_path / "tickers" / "pair=Gold-USDT" / "date=2024-01-02").glob("part-*.parquet"))
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from data.dataset_builder import build_dataset
+from data.quality import repair_candles, validate_candles
+
+
+def _rows(count: int = 8) -> list[dict]:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for idx in range(count):
+        price = 2000 + idx * 0.5
+        rows.append(
+            {
+                "timestamp": (base + timedelta(minutes=idx)).isoformat(),
+                "open": price,
+                "high": price + 1,
+                "low": price - 1,
+                "close": price + 0.5,
+                "volume": 100 + idx,
+            }
+        )
+    return rows
+
+
+def test_validate_candles_clean_series_is_valid():
+    summary = validate_candles(_rows()).summary()
+
+    assert summary["valid"] is True
+    assert summary["expected_interval_seconds"] == 60
+    assert summary["gap_count"] == 0
+
+
+def test_validate_candles_flags_each_issue_type():
+    rows = _rows(10)
+    rows[1]["high"] = rows[1]["low"] - 5
+    rows[2]["close"] = None
+    rows[3]["low"] = -1
+    rows[4]["timestamp"] = rows[3]["timestamp"]
+    rows[6]["timestamp"] = "not-a-time"
+    del rows[7]
+    rows[8]["close"] = rows[8]["high"] = 9000
+
+    report = validate_candles(rows)
+
+    assert np.flatnonzero(report.masks["ohlc_inconsistent"]).tolist() == [1]
+    assert np.flatnonzero(report.masks["missing_value"]).tolist() == [2]
+    assert np.flatnonzero(report.masks["non_positive_price"]).tolist() == [3]
+    assert np.flatnonzero(report.masks["duplicate_timestamp"]).tolist() == [4]
+    assert np.flatnonzero(report.masks["invalid_timestamp"]).tolist() == [6]
+    assert np.flatnonzero(report.masks["gap"]).tolist() == [5, 7]
+    assert report.masks["outlier_return"][8]
+    assert report.summary()["valid"] is False
+    assert report.summary()["missing_bars"] == 3
+
+
+def test_repair_candles_forward_fills_drops_and_flags_gaps():
+    rows = _rows(6)
+    rows[2]["close"] = None
+    rows[4]["timestamp"] = rows[3]["timestamp"]
+    del rows[5]
+    rows.append({**_rows(8)[7]})
+
+    report = validate_candles(rows)
+    repaired = repair_candles(rows, report, ["forward_fill", "drop", "flag_gaps"])
+
+    assert len(repaired) == 5
+    assert repaired[2]["close"] == rows[1]["close"]
+    assert repaired[2]["high"] == repaired[2]["low"] == rows[1]["close"]
+    assert [row["quality_gap"] for row in repaired] == [False, False, False, False, True]
+    assert validate_candles(repaired).summary()["invalid_rows"] == 0
+    with pytest.raises(ValueError):
+        repair_candles(rows, report, ["interpolate"])
+
+
+def test_build_dataset_runs_quality_check_behind_flag():
+    rows = _rows(6)
+    rows[3]["low"] = rows[3]["high"] + 1
+
+    plain = build_dataset(rows, window_size=3)
+    checked = build_dataset(rows, window_size=3, quality_check=True, quality_repairs=["drop"])
+
+    assert plain["quality"] is None
+    assert checked["quality"]["issue_counts"]["ohlc_inconsistent"] == 1
+    assert checked["quality"]["repaired_row_count"] == 5
+    assert len(checked["windows"]) == 3
@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+
+from data.dataset_builder import build_dataset
+from data.dataset_cache import DatasetCache, compute_dataset_ref
+
+
+def _rows():
+    return [
+        {"timestamp": "2024-01-01T00:00:00Z", "close": 2000.5, "volume": 100, "funding_rate": None},
+        {"timestamp": "2024-01-01T00:01:00Z", "close": 2001.0, "volume": 101},
+        {"timestamp": "2024-01-01T00:02:00Z", "close": 2001.5, "volume": 102, "funding_rate": 0.0001},
+    ]
+
+
+def test_dataset_cache_round_trips_rows_and_hash(tmp_path):
+    cache = DatasetCache(tmp_path)
+    manifest = cache.put(_rows())
+
+    assert manifest["dataset_ref"] == compute_dataset_ref(_rows())
+    assert DatasetCache(tmp_path).load_rows(manifest["dataset_ref"]) == _rows()
+
+    metadata = {"pair": "Gold-USDT", "interval": "1m"}
+    reloaded = DatasetCache(tmp_path).load_rows(manifest["dataset_ref"])
+    assert (
+        build_dataset(reloaded, 2, metadata=metadata)["dataset_version"]["dataset_hash"]
+        == build_dataset(_rows(), 2, metadata=metadata)["dataset_version"]["dataset_hash"]
+    )
+
+
+def test_dataset_cache_columns_are_memory_mapped_and_put_is_idempotent(tmp_path):
+    cache = DatasetCache(tmp_path)
+    first = cache.put(_rows())
+    second = cache.put(_rows())
+
+    assert first == second
+    columns = cache.columns(first["dataset_ref"])
+    assert isinstance(columns["close"], np.memmap)
+    assert columns["volume"].dtype == np.int64
+    assert columns["close"].tolist() == [2000.5, 2001.0, 2001.5]
+
+
+def test_dataset_cache_rejects_unknown_or_invalid_refs(tmp_path):
+    cache = DatasetCache(tmp_path)
+
+    with pytest.raises(KeyError):
+        cache.load_rows("0" * 64)
+    with pytest.raises(ValueError):
+        cache.manifest("../escape")
+
+
+def test_dataset_cache_delta_codec_reads_back_identical_rows(tmp_path):
+    cache = DatasetCache(tmp_path, codec="delta")
+    manifest = cache.put(_rows())
+
+    directory = cache.root / manifest["dataset_ref"][:2] / manifest["dataset_ref"]
+    assert sorted(path.name for path in directory.iterdir() if path.suffix == ".npy") == ["c0.npy", "c3.presence.npy"]
+    assert DatasetCache(tmp_path).load_rows(manifest["dataset_ref"]) == _rows()
+    assert cache.columns(manifest["dataset_ref"])["volume"].dtype == np.int64
+    with pytest.raises(ValueError):
+        DatasetCache(tmp_path, codec="lz4")
+
+
+def test_dataset_cache_append_resumes_stored_chunk_digests(tmp_path, monkeypatch):
+    import data.dataset_builder as dataset_builder
+
+    rows = [{"timestamp": index, "close": 2000.0 + index} for index in range(2500)]
+    cache = DatasetCache(tmp_path)
+    base = cache.put(rows[:2100])
+    assert len(base["hash"]["chunks"]) == 2
+
+    serialized = []
+    original = dataset_builder._serialize_payload
+    monkeypatch.setattr(
+        dataset_builder, "_serialize_payload", lambda payload: serialized.append(payload) or original(payload)
+    )
+    appended = cache.put(rows[2100:], base_ref=base["dataset_ref"])
+    hasher = cache.hasher(appended["dataset_ref"])
+    monkeypatch.undo()
+
+    # Only the new rows were serialized; both tails were restored from their stored bytes.
+    assert len(serialized) == 400
+    assert appended["dataset_ref"] == compute_dataset_ref(rows)
+    assert cache.load_rows(appended["dataset_ref"]) == rows
+
+    metadata = {"pair": "Gold-USDT", "interval": "1m"}
+    assert (
+        build_dataset(rows, 30, metadata=metadata, hasher=hasher)["dataset_version"]["dataset_hash"]
+        == build_dataset(rows, 30, metadata=metadata)["dataset_version"]["dataset_hash"]
+    )
+    with pytest.raises(KeyError):
+        cache.put(rows, base_ref="0" * 64)
+
+
+def test_dataset_cache_load_rows_isolates_callers(tmp_path):
+    cache = DatasetCache(tmp_path)
+    dataset_ref = cache.put(_rows())["dataset_ref"]
+
+    first = cache.load_rows(dataset_ref)
+    first[0]["close"] = -1.0
+    first.append({"timestamp": "2024-01-01T00:03:00Z"})
+
+    assert cache.load_rows(dataset_ref) == _rows()
+
+
+@pytest.mark.parametrize("codec", ["npy", "delta"])
+def test_dataset_cache_round_trip_keeps_value_types(tmp_path, codec):
+    rows = [
+        {
+            "timestamp": f"2024-01-01T00:{index:02d}:00Z",
+            "close": 2000 + index,
+            "volume": 5 if index % 2 else 5.5,
+            "label": index if index % 3 else "flat",
+            "meta": {"source": "bingx", "depth": [index, index + 0.5]},
+            "big": 2**60 + index,
+        }
+        for index in range(10)
+    ]
+    cache = DatasetCache(tmp_path, codec=codec)
+    dataset_ref = cache.put(rows)["dataset_ref"]
+
+    reloaded = DatasetCache(tmp_path, codec=codec).load_rows(dataset_ref)
+
+    assert reloaded == rows
+    assert [type(row["volume"]) for row in reloaded] == [type(row["volume"]) for row in rows]
+    metadata = {"pair": "Gold-USDT", "interval": "1m"}
+    assert (
+        build_dataset(reloaded, 3, metadata=metadata)["dataset_version"]["dataset_hash"]
+        == build_dataset(rows, 3, metadata=metadata)["dataset_version"]["dataset_hash"]
+    )
+
+
+def test_dataset_cache_restored_hasher_matches_fresh_and_inline_hash(tmp_path):
+    rows = [
+        {"timestamp": index, "close": 2000.0 + index, "volume": 5 if index % 2 else 5.5, "tag": {"i": index}}
+        for index in range(1500)
+    ]
+    cache = DatasetCache(tmp_path)
+    dataset_ref = cache.put(rows)["dataset_ref"]
+    restored = DatasetCache(tmp_path).hasher(dataset_ref)
+    loaded = DatasetCache(tmp_path).load_rows(dataset_ref)
+
+    metadata = {"pair": "Gold-USDT", "interval": "1m"}
+
+    def dataset_hash(source, hasher=None):
+        return build_dataset(source, 30, metadata=metadata, hasher=hasher)["dataset_version"]["dataset_hash"]
+
+    assert restored.root() == dataset_ref
+    assert dataset_hash(loaded, hasher=restored) == dataset_hash(loaded) == dataset_hash(rows)
+
+
+def test_resolve_dataset_decodes_a_cached_dataset_once(tmp_path, monkeypatch):
+    import data.dataset_cache as dataset_cache
+
+    cache = DatasetCache(tmp_path, max_loaded=0)
+    dataset_ref = cache.put(_rows())["dataset_ref"]
+    reads = []
+    original = dataset_cache._read_columns
+    monkeypatch.setattr(dataset_cache, "_read_columns", lambda *args: reads.append(args) or original(*args))
+    monkeypatch.setattr(dataset_cache, "get_dataset_cache", lambda: cache)
+
+    rows, hasher = dataset_cache.resolve_dataset(None, dataset_ref)
+
+    assert rows == _rows()
+    assert hasher.root() == dataset_ref
+    assert len(reads) == 1
+    assert dataset_cache.resolve_dataset(_rows(), dataset_ref) == (_rows(), None)
@@ -1,6 +1,11 @@
 from datetime import datetime, timezone
 
-from data.dataset_builder import build_dataset
+from data.dataset_builder import (
+    IncrementalDatasetHasher,
+    build_dataset,
+    build_feature_windows,
+    compute_dataset_checksum,
+)
 
 
 def _features():
@@ -31,3 +36,46 @@ def test_dataset_hash_changes_with_metadata():
     second = build_dataset(_features(), window_size=3, stride=1, metadata={"pair": "XAUTUSDT", "interval": "1m"})
 
     assert first["dataset_version"]["dataset_hash"] != second["dataset_version"]["dataset_hash"]
+
+
+def test_dataset_hash_legacy_mode_reproduces_window_json_digest():
+    metadata = {"pair": "Gold-USDT", "interval": "1m"}
+    features = _features()
+    legacy = build_dataset(features, window_size=3, stride=1, metadata=metadata, hash_mode="legacy")
+
+    expected = compute_dataset_checksum(build_feature_windows(features, 3, 1), metadata)
+    assert legacy["dataset_version"]["dataset_hash"] == expected
+    assert legacy["dataset_version"]["hash_mode"] == "legacy"
+
+
+def test_dataset_hash_merkle_tracks_rows_and_window_shape():
+    metadata = {"pair": "Gold-USDT", "interval": "1m"}
+    base = build_dataset(_features(), window_size=3, stride=1, metadata=metadata)
+    changed_rows = _features()
+    changed_rows[4]["close"] += 1
+    changed = build_dataset(changed_rows, window_size=3, stride=1, metadata=metadata)
+    reshaped = build_dataset(_features(), window_size=2, stride=1, metadata=metadata)
+
+    assert base["dataset_version"]["hash_mode"] == "merkle"
+    assert base["dataset_version"]["dataset_hash"] != changed["dataset_version"]["dataset_hash"]
+    assert base["dataset_version"]["dataset_hash"] != reshaped["dataset_version"]["dataset_hash"]
+
+
+def test_incremental_hasher_append_matches_one_shot_and_reuses_chunks():
+    rows = [{"idx": idx, "close": 2000 + idx} for idx in range(11)]
+    one_shot = IncrementalDatasetHasher(chunk_rows=4)
+    one_shot.append(rows)
+
+    prefix = IncrementalDatasetHasher(chunk_rows=4)
+    prefix.append(rows[:9])
+    sealed_before = prefix.sealed_chunk_digests()
+    extended = prefix.copy()
+    extended.append(rows[9:])
+
+    assert extended.root() == one_shot.root()
+    assert extended.sealed_chunk_digests() == sealed_before
+    assert extended.row_count == 11
+
+    restored = IncrementalDatasetHasher(chunk_rows=4, chunk_digests=sealed_before, tail_rows=rows[8:])
+    assert restored.root() == one_shot.root()
+    assert restored.dataset_hash({}, 3, 1) == one_shot.dataset_hash({}, 3, 1)
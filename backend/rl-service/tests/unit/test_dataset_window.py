@@ -1,4 +1,7 @@
-from data.dataset_builder import build_feature_windows
+import numpy as np
+import pytest
+
+from data.dataset_builder import WindowedDataset, build_dataset, build_feature_windows, compute_dataset_checksum
 
 
 def test_build_feature_windows_returns_overlapping_windows():
@@ -16,3 +19,43 @@ def test_build_feature_windows_empty_for_short_series():
     windows = build_feature_windows(features, window_size=3, stride=1)
 
     assert windows == []
+
+
+def test_windowed_dataset_is_lazy_and_matches_list_windows():
+    features = [{"idx": i, "close": float(i)} for i in range(10)]
+    expected = build_feature_windows(features, window_size=4, stride=2)
+    dataset = WindowedDataset(features, window_size=4, stride=2)
+
+    assert len(dataset) == len(expected)
+    assert list(dataset) == expected
+    assert dataset[-1] == expected[-1]
+    assert dataset[1:3] == expected[1:3]
+    assert dataset.window_bounds(1) == (2, 6)
+    with pytest.raises(IndexError):
+        dataset[len(expected)]
+
+
+def test_windowed_dataset_window_view_shares_column_memory():
+    features = [{"close": float(i)} for i in range(8)]
+    dataset = WindowedDataset(features, window_size=3, stride=2)
+
+    view = dataset.window_view("close")
+
+    assert view.shape == (3, 3)
+    assert np.shares_memory(view, dataset.column("close"))
+    assert view[2].tolist() == [4.0, 5.0, 6.0]
+
+
+def test_build_dataset_hash_unchanged_for_windowed_input():
+    features = [{"idx": i} for i in range(6)]
+    metadata = {"pair": "Gold-USDT"}
+    expected = compute_dataset_checksum(build_feature_windows(features, 3, 1), metadata)
+
+    from_rows = build_dataset(features, window_size=3, stride=1, metadata=metadata, hash_mode="legacy")
+    from_dataset = build_dataset(
+        WindowedDataset(features, 5), window_size=3, stride=1, metadata=metadata, hash_mode="legacy"
+    )
+
+    assert isinstance(from_rows["windows"], WindowedDataset)
+    assert from_rows["dataset_version"]["dataset_hash"] == expected
+    assert from_dataset["dataset_version"]["dataset_hash"] == expected
@@ -1,8 +1,10 @@
 import math
 
+import pytest
+
 from features.extractors import extract_features
 from schemas import AuxiliarySignal, MarketSnapshot
-from tests.fixtures.market_data import DEFAULT_MARKET_SNAPSHOT
+from tests.fixtures.market_data import DEFAULT_MARKET_SNAPSHOT, build_candles
 
 
 def test_extract_features_includes_market_and_aux_scores():
@@ -31,3 +33,30 @@ def test_extract_features_includes_market_and_aux_scores():
     assert "ocr_text_length_avg" in features
     assert math.isfinite(features["price_change"])
     assert features["volume_avg"] > 0
+
+
+def test_extract_feature_history_matches_window_features():
+    from envs.market_env import _compute_window_features
+    from features.extractors import FEATURE_KEYS, extract_feature_history
+
+    candles = build_candles(count=8)
+    market = MarketSnapshot(pair="Gold-USDT", candles=candles)
+    history = extract_feature_history(market, [], [], [], [], FEATURE_KEYS, history_length=3, window_size=5)
+
+    assert history.shape == (3, len(FEATURE_KEYS))
+    expected = _compute_window_features(candles[1:6], FEATURE_KEYS).observation
+    assert history[0] == pytest.approx(expected, rel=1e-5)
+
+
+def test_extract_feature_history_steps_by_stride():
+    from envs.market_env import _compute_window_features
+    from features.extractors import FEATURE_KEYS, extract_feature_history
+
+    candles = build_candles(count=12)
+    market = MarketSnapshot(pair="Gold-USDT", candles=candles)
+    history = extract_feature_history(market, [], [], [], [], FEATURE_KEYS, history_length=3, window_size=5, stride=3)
+
+    # Windows ending 3 bars apart, like consecutive WindowedDataset(stride=3) windows.
+    for row, end in zip(history, (6, 9, 12)):
+        expected = _compute_window_features(candles[end - 5 : end], FEATURE_KEYS).observation
+        assert row == pytest.approx(expected, rel=1e-5)
@@ -12,3 +12,39 @@ def test_inference_request_rejects_invalid_pair():
 
     with pytest.raises(ValidationError):
         InferenceRequest(**payload)
+
+
+def _batch(count: int = 4) -> dict:
+    return {
+        "timestamp": [1_704_067_200_000 + idx * 60_000 for idx in range(count)],
+        "open": [2000.0 + idx for idx in range(count)],
+        "high": [2001.0 + idx for idx in range(count)],
+        "low": [1999.0 + idx for idx in range(count)],
+        "close": [2000.5 + idx for idx in range(count)],
+        "volume": [10.0] * count,
+    }
+
+
+def test_inference_request_accepts_columnar_candles():
+    request = InferenceRequest(pair="Gold-USDT", market={"pair": "Gold-USDT", "candles": _batch()})
+
+    candles = request.market.candles
+    assert len(candles) == 4
+    assert candles[1].close == 2001.5
+    assert candles[0].timestamp.isoformat() == "2024-01-01T00:00:00+00:00"
+
+
+def test_candle_batch_rejects_ragged_unsorted_or_non_finite_columns():
+    from schemas import CandleBatch
+
+    ragged = {**_batch(), "close": [1.0]}
+    unsorted = {**_batch(), "timestamp": [3, 2, 1, 0]}
+    non_finite = {**_batch(), "high": [1.0, float("nan"), 1.0, 1.0]}
+
+    for payload in (ragged, unsorted, non_finite):
+        with pytest.raises(ValidationError):
+            CandleBatch(**payload)
+
+    iso = CandleBatch(**{**_batch(2), "timestamp": ["2024-01-01T00:00:00Z", "2024-01-01T00:01:00Z"]})
+    assert iso.to_bar_frame().timestamps.tolist() == [1_704_067_200_000_000_000, 1_704_067_260_000_000_000]
+    assert iso.to_rows()[1]["timestamp"] == "2024-01-01T00:01:00+00:00"
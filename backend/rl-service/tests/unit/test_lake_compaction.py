@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data.bar_frame import BarFrame
+from data_lake.candle_lake import (
+    COMPACTED_FILE,
+    candle_partition_dir,
+    partition_files,
+    read_candle_partitions,
+    write_candle_partitions,
+    write_ticker_partitions,
+)
+from data_lake.compaction import LOCK_FILE, LakeCompactor, compact_lake, compact_partition
+
+START_NS = int(datetime(2024, 3, 1, 23, 0, tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+MINUTE_NS = 60 * 1_000_000_000
+
+
+def _frame(first: int, count: int, close: float) -> BarFrame:
+    timestamps = START_NS + (first + np.arange(count, dtype=np.int64)) * MINUTE_NS
+    values = np.full(count, close)
+    return BarFrame(timestamps, values, values + 1, values - 1, values, np.ones(count))
+
+
+def test_appends_write_new_files_and_readers_prefer_later_rows(tmp_path):
+    write_candle_partitions(tmp_path, "Gold-USDT", "1m", _frame(0, 30, 100.0))
+    write_candle_partitions(tmp_path, "Gold-USDT", "1m", _frame(20, 30, 200.0))
+    partition = candle_partition_dir(tmp_path, "Gold-USDT", "1m", "2024-03-01")
+
+    assert len(partition_files(partition)) == 2
+    frame = read_candle_partitions(tmp_path, "Gold-USDT", "1m", end=START_NS + 59 * MINUTE_NS)
+    assert len(frame) == 50
+    assert frame.close[19] == 100.0
+    assert frame.close[20] == 200.0
+
+
+def test_compaction_merges_parts_and_drops_duplicates(tmp_path):
+    for batch in range(6):
+        write_candle_partitions(tmp_path, "Gold-USDT", "1m", _frame(batch * 10, 20, 100.0 + batch))
+    write_ticker_partitions(
+        tmp_path, "Gold-USDT", [{"captured_at": "2024-03-01T00:00:00Z", "last_price": 1.0}] * 4
+    )
+    before = read_candle_partitions(tmp_path, "Gold-USDT", "1m")
+
+    stats = compact_lake(tmp_path, min_part_files=2, row_group_size=16)
+    after = read_candle_partitions(tmp_path, "Gold-USDT", "1m")
+
+    np.testing.assert_array_equal(before.timestamps, after.timestamps)
+    np.testing.assert_array_equal(before.close, after.close)
+    # 23:00-23:59 holds 60 unique bars from six parts; the single 2024-03-02 part is below the threshold.
+    assert len(after) == 70
+    assert stats.files_merged == 6
+    assert stats.duplicates_dropped == 50
+    day_one = candle_partition_dir(tmp_path, "Gold-USDT", "1m", "2024-03-01")
+    assert [path.name for path in partition_files(day_one)] == [COMPACTED_FILE]
+
+    # Appends dedupe within a batch, so the four identical ticker rows were stored once.
+    remaining = compact_lake(tmp_path, min_part_files=1)
+    assert len(remaining.partitions) == 2
+    assert remaining.duplicates_dropped == 0
+    assert compact_lake(tmp_path, min_part_files=1).partitions == []
+
+def test_compaction_skips_locked_or_small_partitions(tmp_path):
+    write_candle_partitions(tmp_path, "Gold-USDT", "1m", _frame(0, 5, 100.0))
+    partition = candle_partition_dir(tmp_path, "Gold-USDT", "1m", "2024-03-01")
+
+    assert compact_partition(partition, "timestamp", min_part_files=2) is None
+    (partition / LOCK_FILE).touch()
+    assert compact_partition(partition, "timestamp", min_part_files=1) is None
+    (partition / LOCK_FILE).unlink()
+    result = LakeCompactor(tmp_path, min_part_files=1).run_once()
+    assert result.files_merged == 1
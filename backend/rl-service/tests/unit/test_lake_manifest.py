@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data.bar_frame import BarFrame
+from data_lake.candle_lake import (
+    rebuild_manifest,
+    scan_candles,
+    write_candle_partitions,
+    write_ticker_partitions,
+)
+from data_lake.compaction import compact_lake
+from data_lake.manifest import MANIFEST_FILE, LakeManifest
+
+START_NS = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+HOUR_NS = 3600 * 1_000_000_000
+
+
+def _frame(hours: int, skip: tuple[int, ...] = ()) -> BarFrame:
+    offsets = np.array([hour for hour in range(hours) if hour not in skip], dtype=np.int64)
+    close = 100.0 + offsets.astype(np.float64)
+    return BarFrame(START_NS + offsets * HOUR_NS, close, close + 1, close - 1, close, np.ones(offsets.size))
+
+
+def test_writes_record_file_bounds_and_coverage(tmp_path):
+    write_candle_partitions(tmp_path, "Gold-USDT", "1h", _frame(48, skip=(5, 6, 30)))
+    write_ticker_partitions(
+        tmp_path, "Gold-USDT", [{"captured_at": "2024-01-01T00:00:00Z", "last_price": 2000.0}]
+    )
+
+    with LakeManifest(tmp_path) as manifest:
+        entries = manifest.entries("candles", "Gold-USDT", "1h")
+        [candles] = manifest.coverage(table="candles")
+        [tickers] = manifest.coverage(table="tickers")
+
+    assert [entry.day for entry in entries] == ["2024-01-01", "2024-01-02"]
+    assert entries[0].min_ts == START_NS
+    assert entries[0].max_ts == START_NS + 23 * HOUR_NS
+    assert entries[0].row_count == 22
+    assert entries[0].gap_count == 1
+    assert len(entries[0].checksum) == 64
+    assert (candles.first_ts, candles.last_ts) == (START_NS, START_NS + 47 * HOUR_NS)
+    assert (candles.row_count, candles.file_count, candles.gap_count) == (45, 2, 2)
+    assert (tickers.interval, tickers.row_count) == ("", 1)
+
+
+def test_compaction_swaps_manifest_entries_and_scans_use_them(tmp_path):
+    for _ in range(4):
+        write_candle_partitions(tmp_path, "Gold-USDT", "1h", _frame(24))
+
+    compact_lake(tmp_path, min_part_files=4)
+
+    with LakeManifest(tmp_path) as manifest:
+        entries = manifest.entries("candles", "Gold-USDT", "1h")
+        [coverage] = manifest.coverage()
+        pruned = manifest.files("candles", "Gold-USDT", "1h", START_NS + 48 * HOUR_NS)
+    assert [entry.path.rsplit("/", 1)[-1] for entry in entries] == ["data.parquet"]
+    assert (coverage.row_count, coverage.file_count) == (24, 1)
+    assert pruned == []
+    assert scan_candles(tmp_path, "Gold-USDT", "1h", START_NS, START_NS + 5 * HOUR_NS).num_rows == 6
+
+
+def test_rebuild_manifest_indexes_existing_files(tmp_path):
+    write_candle_partitions(tmp_path, "Gold-USDT", "1h", _frame(48))
+    (tmp_path / MANIFEST_FILE).unlink()
+
+    assert rebuild_manifest(tmp_path) == 2
+    with LakeManifest(tmp_path) as manifest:
+        [coverage] = manifest.coverage(pair="Gold-USDT", interval="1h")
+    assert (coverage.row_count, coverage.gap_count) == (48, 0)
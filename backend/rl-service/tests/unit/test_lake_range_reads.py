@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data.bar_frame import BarFrame
+from data_lake.candle_lake import read_candle_columns, scan_candles, write_candle_partitions
+
+START_NS = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()) * 1_000_000_000
+HOUR_NS = 3600 * 1_000_000_000
+
+
+def _frame(hours: int, offset: float = 0.0, extras: bool = False) -> BarFrame:
+    timestamps = START_NS + np.arange(hours, dtype=np.int64) * HOUR_NS
+    close = 100.0 + np.arange(hours, dtype=np.float64) + offset
+    extra = {"funding_rate": np.full(hours, 0.001)} if extras else {}
+    return BarFrame(timestamps, close, close + 1, close - 1, close, np.ones(hours), extras=extra)
+
+
+def test_scan_candles_reads_only_requested_range_and_columns(tmp_path):
+    write_candle_partitions(tmp_path, "Gold-USDT", "1h", _frame(24 * 30))
+    start, end = START_NS + 24 * 10 * HOUR_NS, START_NS + 24 * 17 * HOUR_NS - 1
+
+    table = scan_candles(tmp_path, "Gold-USDT", "1h", start, end, columns=["close"])
+    columns = read_candle_columns(tmp_path, "Gold-USDT", "1h", start, end, columns=["close"])
+
+    assert table.column_names == ["timestamp", "close"]
+    assert table.num_rows == 24 * 7
+    assert columns["timestamp"][0] == start
+    assert columns["close"][0] == 100.0 + 240
+    assert np.all(np.diff(columns["timestamp"]) > 0)
+
+
+def test_scan_candles_dedupes_later_writes_and_fills_missing_columns(tmp_path):
+    write_candle_partitions(tmp_path, "Gold-USDT", "1h", _frame(48))
+    write_candle_partitions(tmp_path, "Gold-USDT", "1h", _frame(30, offset=0.5, extras=True))
+
+    columns = read_candle_columns(tmp_path, "Gold-USDT", "1h")
+
+    assert columns["timestamp"].size == 48
+    assert columns["close"][29] == 129.5
+    assert columns["close"][30] == 130.0
+    assert columns["funding_rate"][0] == 0.001
+    assert np.isnan(columns["funding_rate"][40])
+    with pytest.raises(ValueError):
+        read_candle_columns(tmp_path, "Gold-USDT", "1h", columns=["vwap"])
+    assert read_candle_columns(tmp_path, "XAUTUSDT", "1h", columns=["close"])["close"].size == 0
+
+
+def test_catalog_range_read_matches_bar_objects(tmp_path):
+    pytest.importorskip("nautilus_trader")
+    from nautilus_trader.model.data import BarType
+    from nautilus_trader.model.enums import AggregationSource
+
+    from data_lake.normalized_lake import (
+        load_bar_columns_from_catalog,
+        load_bar_frame_from_catalog,
+        write_normalized_catalog,
+    )
+    from training.nautilus_backtest import _build_bars, _build_instrument, _resolve_bar_spec
+
+    instrument = _build_instrument("Gold-USDT")
+    bar_type = BarType(instrument.id, _resolve_bar_spec("1h"), AggregationSource.EXTERNAL)
+    frame = _frame(200)
+    bars = _build_bars(instrument.id, bar_type, frame, instrument.price_precision, instrument.size_precision)
+    write_normalized_catalog(tmp_path, instrument, bars)
+
+    full = load_bar_frame_from_catalog(tmp_path, instrument.id)
+    window = load_bar_columns_from_catalog(
+        tmp_path, instrument.id, start=START_NS + 50 * HOUR_NS, end=START_NS + 59 * HOUR_NS
+    )
+
+    np.testing.assert_array_equal(window["timestamp"], full.timestamps[50:60])
+    np.testing.assert_allclose(window["close"], full.close[50:60])
+    np.testing.assert_allclose(window["volume"], full.volume[50:60])
+    only_close = load_bar_columns_from_catalog(tmp_path, instrument.id, str(bar_type), columns=["close"])
+    assert set(only_close) == {"timestamp", "close"}
+    assert only_close["close"].size == 200
+    empty = load_bar_columns_from_catalog(tmp_path, instrument.id, start=START_NS + 1000 * HOUR_NS)
+    assert empty["timestamp"].size == 0
@@ -1,6 +1,7 @@
 import numpy as np
+import pytest
 
-from envs.market_env import MarketWindowEnv
+from envs.market_env import ACTION_LONG, ACTION_SHORT, MarketSeriesEnv, MarketWindowDiscreteEnv, MarketWindowEnv
 from features.extractors import FEATURE_KEYS
 
 
@@ -77,3 +78,143 @@ def test_env_applies_futures_leverage_and_costs():
     assert terminated is False
     assert truncated is False
     assert abs(reward - 0.197) < 1e-6
+
+
+def _series(count: int = 12) -> list[dict]:
+    rows = []
+    for idx in range(count):
+        price = 2000 + idx
+        rows.append(
+            {
+                "timestamp": f"2024-01-01T00:{idx:02d}:00Z",
+                "open": price,
+                "high": price + 1,
+                "low": price - 1,
+                "close": price + 0.5,
+                "volume": 100 + idx,
+            }
+        )
+    return rows
+
+
+def test_series_env_random_start_is_seeded_and_truncates():
+    env = MarketSeriesEnv(rows=_series(), feature_keys=FEATURE_KEYS, window_size=3, episode_length=4, min_episode_length=2)
+    _, first_info = env.reset(seed=13)
+    other = MarketSeriesEnv(rows=_series(), feature_keys=FEATURE_KEYS, window_size=3, episode_length=4, min_episode_length=2)
+    _, second_info = other.reset(seed=13)
+    assert first_info == second_info
+    assert 2 <= first_info["episode_length"] <= 4
+
+    steps = 0
+    truncated = False
+    while not truncated:
+        observation, _, terminated, truncated, _ = env.step(np.array([1.0], dtype=np.float32))
+        assert terminated is False
+        assert observation.shape == (len(FEATURE_KEYS),)
+        steps += 1
+    assert steps == first_info["episode_length"]
+
+    with pytest.raises(RuntimeError, match="reset"):
+        env.step(np.array([1.0], dtype=np.float32))
+    env.reset(seed=14)
+    _, _, _, _, info = env.step(np.array([1.0], dtype=np.float32))
+    assert info["bars"] == 1
+
+
+def test_series_env_matches_window_env_reward():
+    rows = _series(6)
+    windows = [rows[idx : idx + 3] for idx in range(4)]
+    window_env = MarketWindowEnv(windows=windows, feature_keys=FEATURE_KEYS, leverage=2.0, taker_fee_bps=5.0)
+    series_env = MarketSeriesEnv(rows=rows, feature_keys=FEATURE_KEYS, window_size=3, leverage=2.0, taker_fee_bps=5.0)
+    window_env.reset()
+    series_env.reset(seed=1)
+    action = np.array([0.5], dtype=np.float32)
+    _, window_reward, _, _, _ = window_env.step(action)
+    _, series_reward, _, _, _ = series_env.step(action)
+    assert abs(window_reward - series_reward) < 1e-9
+
+
+def test_series_env_history_is_strided_view():
+    env = MarketSeriesEnv(rows=_series(), feature_keys=FEATURE_KEYS, window_size=3, history_length=4)
+    observation, _ = env.reset(seed=2)
+
+    assert env.observation_space.shape == (4, len(FEATURE_KEYS))
+    assert observation.shape == (4, len(FEATURE_KEYS))
+    assert np.shares_memory(observation, env._series.observations)
+    next_obs, _, _, _, _ = env.step(np.array([0.0], dtype=np.float32))
+    assert np.array_equal(next_obs[:-1], observation[1:])
+
+
+def test_window_env_history_pads_first_rows():
+    env = MarketWindowEnv(windows=_windows(), feature_keys=FEATURE_KEYS, history_length=3)
+    observation, _ = env.reset()
+
+    assert observation.shape == (3, len(FEATURE_KEYS))
+    assert np.array_equal(observation[0], observation[-1])
+
+
+def test_decision_interval_matches_repeated_single_steps():
+    rows = _series(10)
+    for idx, row in enumerate(rows):
+        row["funding_rate"] = 0.0001 * (idx % 3)
+        row["close"] = 2000 + (idx % 4) * 3.0
+    kwargs = dict(feature_keys=FEATURE_KEYS, leverage=2.0, taker_fee_bps=4.0, slippage_bps=1.0, drawdown_penalty=0.5)
+    single = MarketSeriesEnv(rows=rows, window_size=3, **kwargs)
+    held = MarketSeriesEnv(rows=rows, window_size=3, decision_interval=3, **kwargs)
+    single.reset(seed=0)
+    held.reset(seed=0)
+
+    actions = [np.array([1.0], dtype=np.float32), np.array([-0.5], dtype=np.float32)]
+    expected = 0.0
+    for action in actions:
+        for _ in range(3):
+            _, reward, _, _, _ = single.step(action)
+            expected += reward
+    total = 0.0
+    for action in actions:
+        _, reward, _, _, info = held.step(action)
+        assert info["bars"] == 3
+        total += reward
+
+    assert abs(total - expected) < 1e-12
+
+
+def test_window_env_decision_interval_stops_at_last_window():
+    env = MarketWindowEnv(windows=_windows(), feature_keys=FEATURE_KEYS, decision_interval=2)
+    env.reset()
+    _, _, terminated, _, info = env.step(np.array([1.0], dtype=np.float32))
+    assert terminated is False and info["bars"] == 2
+    _, _, terminated, _, info = env.step(np.array([1.0], dtype=np.float32))
+    assert terminated is False and info["bars"] == 1
+    _, reward, terminated, _, _ = env.step(np.array([1.0], dtype=np.float32))
+    assert terminated is True and reward == 0.0
+
+
+def test_discrete_env_decision_interval_matches_repeated_single_steps():
+    rows = _series(10)
+    for idx, row in enumerate(rows):
+        row["funding_rate"] = 0.0001 * (idx % 3)
+        row["close"] = 2000 + (idx % 4) * 3.0
+    windows = [rows[idx : idx + 3] for idx in range(len(rows) - 2)]
+    kwargs = dict(feature_keys=FEATURE_KEYS, leverage=2.0, taker_fee_bps=4.0, drawdown_penalty=0.5)
+    single = MarketWindowDiscreteEnv(windows=windows, **kwargs)
+    held = MarketWindowDiscreteEnv(windows=windows, decision_interval=3, **kwargs)
+    single.reset()
+    held.reset()
+
+    expected = 0.0
+    for action in (ACTION_LONG, ACTION_SHORT):
+        for _ in range(3):
+            _, reward, _, _, _ = single.step(action)
+            expected += reward
+    total = 0.0
+    for action in (ACTION_LONG, ACTION_SHORT):
+        _, reward, terminated, _, info = held.step(action)
+        assert terminated is False and info["bars"] == 3
+        total += reward
+    assert abs(total - expected) < 1e-12
+
+    _, _, terminated, _, info = held.step(ACTION_LONG)
+    assert terminated is False and info["bars"] == 1
+    _, reward, terminated, _, _ = held.step(ACTION_LONG)
+    assert terminated is True and reward == 0.0
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("nautilus_trader")
+
+from nautilus_trader.model.data import BarType
+from nautilus_trader.model.objects import Price, Quantity
+
+from data.bar_frame import BarFrame
+from training.nautilus_backtest import BarArrays, _build_bars, _build_instrument, _resolve_bar_spec
+
+
+def _frame(rows: int = 500) -> BarFrame:
+    rng = np.random.default_rng(3)
+    close = np.round(2000.0 + np.cumsum(rng.normal(0.0, 0.3, rows)), 2)
+    timestamps = 1_704_067_200 * 1_000_000_000 + np.arange(rows, dtype=np.int64) * 60_000_000_000
+    volume = np.round(rng.gamma(2.0, 50.0, rows), 3)
+    return BarFrame(timestamps, close, close + 0.5, close - 0.5, close, volume)
+
+
+def test_bulk_bars_match_string_constructed_prices_and_rekey_per_venue():
+    frame = _frame()
+    arrays = BarArrays.from_frame(frame)
+    bingx = _build_instrument("Gold-USDT", venue="BINGX")
+    okx = _build_instrument("Gold-USDT", venue="OKX")
+
+    bars = _build_bars(bingx.id, BarType(bingx.id, _resolve_bar_spec("1m")), arrays, 2, 3)
+    rekeyed = _build_bars(okx.id, BarType(okx.id, _resolve_bar_spec("1m")), arrays, 2, 3)
+
+    assert len(bars) == len(frame)
+    for index in (0, 137, len(frame) - 1):
+        assert bars[index].open == Price.from_str(f"{frame.open[index]:.2f}")
+        assert bars[index].low == Price.from_str(f"{frame.low[index]:.2f}")
+        assert bars[index].volume == Quantity.from_str(f"{frame.volume[index]:.3f}")
+        assert bars[index].ts_event == bars[index].ts_init == int(frame.timestamps[index])
+        assert rekeyed[index].close == bars[index].close
+    assert rekeyed[0].bar_type.instrument_id == okx.id
+    assert _build_bars(bingx.id, bars[0].bar_type, frame, 2, 3) == bars
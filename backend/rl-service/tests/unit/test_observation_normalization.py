@@ -0,0 +1,61 @@
+import io
+import zipfile
+
+import numpy as np
+import pytest
+
+from features.normalization import NormalizationStats, compute_normalization_stats, normalization_from_spec
+from models.artifact_loader import embed_observation_spec, read_observation_spec
+
+
+def _matrix() -> np.ndarray:
+    return np.array(
+        [
+            [2300.0, 1e-4, 1e6],
+            [2310.0, 2e-4, 2e6],
+            [2320.0, 3e-4, 3e6],
+            [2330.0, 4e-4, 4e6],
+        ]
+    )
+
+
+def test_zscore_stats_normalize_columns():
+    keys = ["last_price", "funding_rate", "ticker_volume_24h"]
+    stats = compute_normalization_stats(_matrix(), keys)
+    normalized = stats.apply(_matrix())
+
+    assert normalized.dtype == np.float32
+    assert np.allclose(normalized.mean(axis=0), 0.0, atol=1e-6)
+    assert np.allclose(normalized.std(axis=0), 1.0, atol=1e-5)
+
+
+def test_robust_stats_keep_constant_columns_finite():
+    matrix = np.column_stack([_matrix()[:, 0], np.full(4, 7.0)])
+    stats = compute_normalization_stats(matrix, ["last_price", "spread"], method="robust")
+
+    assert stats.scale[1] == 1.0
+    assert np.all(np.isfinite(stats.apply(matrix)))
+
+
+def test_stats_roundtrip_through_artifact_archive():
+    stats = compute_normalization_stats(_matrix(), ["a", "b", "c"])
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, mode="w") as archive:
+        archive.writestr("data", "{}")
+
+    payload = embed_observation_spec(buffer.getvalue(), {"normalization": stats.to_dict()})
+    restored = normalization_from_spec(read_observation_spec(payload))
+
+    assert isinstance(restored, NormalizationStats)
+    assert restored.feature_keys == ["a", "b", "c"]
+    assert np.allclose(restored.apply(_matrix()), stats.apply(_matrix()))
+
+
+def test_read_observation_spec_missing_entry_returns_none():
+    assert read_observation_spec(b"not-a-zip") is None
+    assert normalization_from_spec(None) is None
+
+
+def test_compute_stats_rejects_unknown_method():
+    with pytest.raises(ValueError, match="normalization method"):
+        compute_normalization_stats(_matrix(), ["a", "b", "c"], method="minmax")
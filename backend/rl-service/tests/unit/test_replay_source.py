@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data.bar_frame import BarFrame
+from data.replay_source import REPLAY_SPEED_MAX, ReplayMarketDataSource, write_replay_candles, write_replay_tickers
+from schemas import TradingPair
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+START_NS = int(START.timestamp()) * 1_000_000_000
+MINUTE_NS = 60 * 1_000_000_000
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _frame(count: int, base: float) -> BarFrame:
+    close = base + np.arange(count, dtype=np.float64)
+    return BarFrame(
+        START_NS + np.arange(count, dtype=np.int64) * MINUTE_NS,
+        close - 0.5,
+        close + 1.0,
+        close - 1.0,
+        close,
+        np.full(count, 10.0),
+        extras={"funding_rate": np.full(count, 0.0001)},
+    )
+
+
+@pytest.fixture()
+def recording(tmp_path):
+    write_replay_candles(tmp_path, TradingPair.GOLD_USDT, "1m", _frame(120, 2000.0))
+    write_replay_candles(tmp_path, TradingPair.PAXGUSDT, "1m", _frame(120, 1900.0))
+    write_replay_tickers(
+        tmp_path,
+        TradingPair.GOLD_USDT,
+        [
+            {"captured_at": START + timedelta(minutes=minute), "last_price": 2000.0 + minute}
+            for minute in range(0, 120, 10)
+        ],
+    )
+    return tmp_path
+
+
+def test_timed_replay_reveals_bars_at_speed(recording):
+    clock = FakeClock()
+    source = ReplayMarketDataSource(recording, speed=100.0, clock=clock)
+
+    assert len(source.fetch_candles(TradingPair.GOLD_USDT, "1m")) == 1
+    clock.now = 30.0  # 3000 replay seconds = 50 minutes
+    snapshot = source.load_market_snapshot(TradingPair.GOLD_USDT, "1m", limit=20)
+    other = source.fetch_candles(TradingPair.PAXGUSDT, "1m", limit=500)
+
+    assert len(snapshot.candles) == 20
+    assert snapshot.candles[-1].timestamp == START + timedelta(minutes=50)
+    assert snapshot.last_price == 2050.0
+    assert snapshot.ticker["captured_at"].startswith("2024-01-01T00:50:00")
+    assert snapshot.extras == {"funding_rate": 0.0001}
+    assert len(other) == 51
+    assert source.replay_time() == START + timedelta(minutes=50)
+
+
+def test_max_speed_reveals_one_bar_per_read(recording):
+    source = ReplayMarketDataSource(recording, speed=REPLAY_SPEED_MAX, start=START + timedelta(minutes=9))
+
+    first = source.load_market_snapshot(TradingPair.GOLD_USDT, "1m")
+    second = source.load_market_snapshot(TradingPair.GOLD_USDT, "1m")
+
+    assert len(first.candles) == 10
+    assert len(second.candles) == 11
+    assert second.last_price == 2010.0
+    assert source.replay_time() is None
+
+
+def test_candle_frame_keeps_futures_columns(recording):
+    clock = FakeClock()
+    source = ReplayMarketDataSource(recording, clock=clock)
+    clock.now = 3600.0
+    frame = source.fetch_candle_frame(
+        TradingPair.PAXGUSDT, "1m", START + timedelta(minutes=5), START + timedelta(minutes=14)
+    )
+
+    assert len(frame) == 10
+    assert frame.column("funding_rate").tolist() == [0.0001] * 10
+    assert frame.close[0] == 1905.0
+
+
+def test_replay_rejects_missing_recording(recording):
+    source = ReplayMarketDataSource(recording, speed=REPLAY_SPEED_MAX)
+    with pytest.raises(ValueError):
+        source.fetch_candles(TradingPair.XAUTUSDT, "1m")
+    with pytest.raises(ValueError):
+        ReplayMarketDataSource(recording, speed=0)
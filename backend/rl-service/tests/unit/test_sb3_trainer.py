@@ -71,3 +71,104 @@ def test_train_policy_artifact_roundtrip():
 
     model = load_sb3_model_from_bytes(payload)
     assert model is not None
+
+
+def test_train_policy_random_start_requires_series():
+    with pytest.raises(ValueError, match="series rows are required"):
+        train_policy(_windows(), TrainingConfig(timesteps=1, episode_mode="random_start"))
+
+
+def test_train_policy_random_start_requires_window_size_without_windows():
+    series = _windows(window_count=1, window_size=6)[0]
+    with pytest.raises(ValueError, match="window_size is required for random_start episodes"):
+        train_policy([], TrainingConfig(timesteps=1, episode_mode="random_start"), series=series)
+
+
+def test_train_policy_random_start_episodes():
+    pytest.importorskip("stable_baselines3")
+
+    windows = _windows(window_count=6)
+    series = [*windows[0], *(window[-1] for window in windows[1:])]
+    result = train_policy(
+        windows,
+        TrainingConfig(
+            timesteps=8,
+            seed=3,
+            episode_mode="random_start",
+            window_size=3,
+            episode_length=3,
+            decision_interval=2,
+        ),
+        series=series,
+    )
+
+    assert "episode_mode=random_start" in result.hyperparameter_summary
+    assert "decision_interval=2" in result.hyperparameter_summary
+    assert result.artifact_size_bytes > 0
+
+
+def test_train_policy_random_start_feedback_rounds_use_series_env(monkeypatch):
+    pytest.importorskip("stable_baselines3")
+
+    from training import sb3_trainer
+
+    built: list[int] = []
+    build_series_env = sb3_trainer._build_series_env
+
+    def _record_series_env(series, series_features, config, normalization=None):
+        built.append(len(series_features))
+        return build_series_env(series, series_features, config, normalization)
+
+    def _no_window_env(*args, **kwargs):
+        raise AssertionError("random_start training must not build window envs")
+
+    monkeypatch.setattr(sb3_trainer, "_build_series_env", _record_series_env)
+    monkeypatch.setattr(sb3_trainer, "_build_env", _no_window_env)
+
+    windows = _windows(window_count=6)
+    series = [*windows[0], *(window[-1] for window in windows[1:])]
+    train_policy(
+        windows,
+        TrainingConfig(
+            timesteps=4,
+            seed=4,
+            episode_mode="random_start",
+            window_size=3,
+            feedback_rounds=1,
+            feedback_timesteps=4,
+            feedback_hard_ratio=0.25,
+        ),
+        series=series,
+    )
+
+    # Main env, one scoring pass over the full series, then the feedback env on the hard bars only.
+    assert built[:2] == [6, 6]
+    assert len(built) == 3 and 2 <= built[2] < 6
+
+
+def test_train_policy_embeds_normalization_stats():
+    pytest.importorskip("stable_baselines3")
+
+    from features.normalization import normalization_from_spec
+    from models.artifact_loader import read_observation_spec
+
+    result = train_policy(_windows(), TrainingConfig(timesteps=5, seed=5, observation_normalization="zscore"))
+    spec = read_observation_spec(base64.b64decode(result.artifact_base64))
+    stats = normalization_from_spec(spec)
+
+    assert stats is not None
+    assert stats.method == "zscore"
+    assert stats.feature_keys == spec["feature_keys"]
+
+
+def test_train_policy_records_window_stride():
+    pytest.importorskip("stable_baselines3")
+
+    from data.dataset_builder import WindowedDataset
+    from models.artifact_loader import read_observation_spec
+
+    rows = [window[0] for window in _windows(window_count=6, window_size=1)]
+    result = train_policy(WindowedDataset(rows, window_size=3, stride=2), TrainingConfig(timesteps=4, seed=2))
+    spec = read_observation_spec(base64.b64decode(result.artifact_base64))
+
+    assert spec["stride"] == 2
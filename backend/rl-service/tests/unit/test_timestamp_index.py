@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from data.bar_frame import BarFrame
+from data.dataset_builder import WindowedDataset, period_warmup_rows, select_period
+from data.timestamp_index import TimestampIndex, nanos_to_iso, timestamp_to_nanos
+from training.evaluation import _resample_interval_features
+from training.walk_forward import build_time_walk_forward_folds
+
+
+def _rows(count: int, step_minutes: int = 1) -> list[dict]:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {"timestamp": (base + timedelta(minutes=idx * step_minutes)).isoformat(), "open": 1.0 + idx, "close": 2.0 + idx}
+        for idx in range(count)
+    ]
+
+
+def test_timestamp_to_nanos_keeps_microseconds_and_offsets():
+    assert timestamp_to_nanos("1970-01-01T00:00:01.000001Z") == 1_000_001_000
+    assert timestamp_to_nanos("1970-01-01T02:00:00+02:00") == 0
+    assert nanos_to_iso(1_000_001_000) == "1970-01-01T00:00:01.000001+00:00"
+    with pytest.raises(ValueError):
+        timestamp_to_nanos(None)
+
+
+def test_timestamp_index_slices_periods_and_looks_up_bars():
+    rows = _rows(10)
+    index = TimestampIndex.from_rows(rows)
+
+    bounds = index.slice_between("2024-01-01T00:02:00Z", datetime(2024, 1, 1, 0, 5, tzinfo=timezone.utc))
+    assert (bounds.start, bounds.stop) == (2, 6)
+    assert index.slice_between(end="2023-12-31T00:00:00Z") == slice(0, 0)
+    assert index.position("2024-01-01T00:07:00+00:00") == 7
+    assert index.position("2024-01-01T00:07:30+00:00") is None
+
+
+def test_sort_rows_orders_once_and_rejects_unsorted_index():
+    rows = _rows(4)
+    shuffled = [rows[2], rows[0], rows[3], rows[1]]
+
+    ordered, index = TimestampIndex.sort_rows(shuffled)
+
+    assert ordered == rows
+    assert np.all(np.diff(index.values) > 0)
+    with pytest.raises(ValueError):
+        TimestampIndex.from_rows(shuffled)
+
+
+def test_windowed_dataset_slice_period_reuses_index():
+    dataset = WindowedDataset(_rows(10), window_size=3)
+
+    sliced = dataset.slice_period("2024-01-01T00:04:00Z", "2024-01-01T00:08:00Z")
+
+    assert len(sliced.rows) == 5
+    assert len(sliced) == 3
+    assert sliced.timestamp_index.position("2024-01-01T00:04:00Z") == 0
+
+
+def test_select_period_sorts_once_and_keeps_untouched_rows():
+    rows = _rows(10)
+    shuffled = [rows[3], *rows[:3], *rows[4:]]
+
+    selected = select_period(shuffled, "2024-01-01T00:02:00Z", "2024-01-01T00:05:00Z")
+    assert [row["timestamp"] for row in selected.rows] == [row["timestamp"] for row in rows[2:6]]
+    assert selected.timestamp_index.values.tolist() == TimestampIndex.from_rows(rows[2:6]).values.tolist()
+
+    # A period covering every row keeps the caller's list, so cached hash digests stay valid.
+    assert select_period(rows, "2023-12-31T00:00:00Z", None).rows is rows
+
+
+def test_select_period_keeps_warmup_rows_before_start():
+    rows = _rows(10)
+    warmup = period_warmup_rows(window_size=3, history_length=2)
+    assert warmup == 4
+
+    selected = select_period(rows, "2024-01-01T00:06:00Z", "2024-01-01T00:08:00Z", warmup)
+    assert [row["timestamp"] for row in selected.rows] == [row["timestamp"] for row in rows[2:9]]
+    # The warm-up is clipped at the first row and never fills a period that has no bars.
+    assert select_period(rows, "2024-01-01T00:02:00Z", None, warmup).rows is rows
+    assert select_period(rows, "2024-01-02T00:00:00Z", None, warmup).rows == []
+
+    frame = BarFrame.from_rows(rows)
+    bounds = frame.timestamp_index.slice_between("2024-01-01T00:06:00Z", "2024-01-01T00:08:00Z", warmup)
+    assert (bounds.start, bounds.stop) == (2, 9)
+
+
+def test_resample_uses_index_buckets():
+    frame, error = _resample_interval_features(BarFrame.from_rows(_rows(6)), "1m", "3m")
+    resampled = frame.to_rows()
+
+    assert error is None
+    assert [row["timestamp"] for row in resampled] == [
+        "2024-01-01T00:00:00+00:00",
+        "2024-01-01T00:03:00+00:00",
+    ]
+    assert resampled[0]["open"] == 1.0
+    assert resampled[0]["close"] == 4.0
+
+
+def test_time_walk_forward_folds_split_by_wall_clock():
+    # 40 one-minute bars followed by 40 five-minute bars: equal time spans hold unequal bar counts.
+    minutes = np.concatenate([np.arange(40), 40 + np.arange(1, 41) * 5])
+    timestamps = minutes.astype(np.int64) * 60_000_000_000
+
+    folds = build_time_walk_forward_folds(timestamps, folds=2, min_train_bars=20)
+
+    assert [(fold.test_start, fold.test_end) for fold in folds] == [(20, 57), (57, 80)]
@@ -1,7 +1,11 @@
 import { loadRlServiceConfig } from "../config/rl_service";
 import type {
+  DatasetCacheRequest,
+  DatasetCacheResponse,
   DatasetPreviewRequest,
   DatasetPreviewResponse,
+  DatasetValidateRequest,
+  DatasetValidateResponse,
   DriftCheckRequest,
   DriftCheckResponse,
   EvaluationRequest,
@@ -29,6 +33,8 @@ export class RlServiceClient {
         candles: payload.market.candles,
         last_price: payload.market.lastPrice,
         spread: payload.market.spread,
+        ticker: payload.market.ticker ?? null,
+        extras: payload.market.extras ?? {},
       },
       ideas: payload.ideas ?? [],
       signals: payload.signals ?? [],
@@ -71,6 +77,7 @@ export class RlServiceClient {
       dataset_version_id: payload.datasetVersionId ?? null,
       feature_set_version_id: payload.featureSetVersionId ?? null,
       dataset_hash: payload.datasetHash ?? null,
+      dataset_ref: payload.datasetRef ?? null,
       artifact_uri: payload.artifactUri ?? null,
       artifact_checksum: payload.artifactChecksum ?? null,
       artifact_download_url: payload.artifactDownloadUrl ?? null,
@@ -94,10 +101,12 @@ export class RlServiceClient {
             embargo_bars: payload.walkForward.embargoBars ?? 0,
             min_train_bars: payload.walkForward.minTrainBars ?? null,
             strict: payload.walkForward.strict ?? true,
+            split_by: payload.walkForward.splitBy ?? "bars",
           }
         : null,
       feature_schema_fingerprint: payload.featureSchemaFingerprint ?? null,
       feature_key_extras: payload.featureKeyExtras ?? null,
+      dataset_hash_mode: payload.datasetHashMode ?? "merkle",
       dataset_features: payload.datasetFeatures ?? null,
     });
   }
@@ -113,10 +122,31 @@ export class RlServiceClient {
       stride: payload.stride,
       feature_set_version_id: payload.featureSetVersionId,
       feature_schema_fingerprint: payload.featureSchemaFingerprint ?? null,
+      hash_mode: payload.hashMode ?? "merkle",
+      quality_check: payload.qualityCheck ?? false,
+      quality_repairs: payload.qualityRepairs ?? [],
       features: payload.features,
     });
   }
 
+  async validateDataset(payload: DatasetValidateRequest): Promise<DatasetValidateResponse> {
+    return this.postJson("/datasets/validate", {
+      rows: payload.rows,
+      interval: payload.interval ?? null,
+      outlier_zscore: payload.outlierZscore ?? 12,
+      repairs: payload.repairs ?? [],
+      issue_row_limit: payload.issueRowLimit ?? 100,
+      return_rows: payload.returnRows ?? false,
+    });
+  }
+
+  async cacheDataset(payload: DatasetCacheRequest): Promise<DatasetCacheResponse> {
+    return this.postJson("/datasets/cache", {
+      rows: payload.rows,
+      base_ref: payload.baseRef ?? null,
+    });
+  }
+
   async checkDrift(payload: DriftCheckRequest): Promise<DriftCheckResponse> {
     return this.postJson("/monitoring/drift", {
       agent_id: payload.agentId,
@@ -137,6 +167,7 @@ export class RlServiceClient {
       dataset_version_id: payload.datasetVersionId ?? null,
       feature_set_version_id: payload.featureSetVersionId ?? null,
       dataset_hash: payload.datasetHash ?? null,
+      dataset_ref: payload.datasetRef ?? null,
       feature_schema_fingerprint: payload.featureSchemaFingerprint ?? null,
       feature_key_extras: payload.featureKeyExtras ?? null,
       timesteps: payload.timesteps,
@@ -151,6 +182,12 @@ export class RlServiceClient {
       feedback_rounds: payload.feedbackRounds ?? null,
       feedback_timesteps: payload.feedbackTimesteps ?? null,
       feedback_hard_ratio: payload.feedbackHardRatio ?? null,
+      episode_mode: payload.episodeMode ?? "windows",
+      episode_length: payload.episodeLength ?? null,
+      min_episode_length: payload.minEpisodeLength ?? null,
+      observation_normalization: payload.observationNormalization ?? "none",
+      history_length: payload.historyLength ?? 1,
+      decision_interval: payload.decisionInterval ?? 1,
       dataset_features: payload.datasetFeatures ?? null,
     });
   }
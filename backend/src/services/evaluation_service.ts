@@ -879,7 +879,9 @@ export async function runEvaluation(request: EvaluationRequest, options: RunEval
       } catch (error) {
         const message = error instanceof Error ? error.message : String(error);
         if (message.includes("No evaluation windows generated")) {
-          const featureRowCount = payload.datasetFeatures?.length ?? 0;
+          const featureRowCount = Array.isArray(payload.datasetFeatures)
+            ? payload.datasetFeatures.length
+            : (payload.datasetFeatures?.close.length ?? 0);
           const fallbackWindowSize = resolveEffectiveWindowSize(payload.windowSize ?? 30, featureRowCount);
           const fallbackStridePlan = resolveEffectiveStride(
             payload.stride ?? 1,
@@ -31,6 +31,7 @@ export type WalkForwardFoldConfig = {
   embargoBars?: number;
   minTrainBars?: number;
   strict?: boolean;
+  splitBy?: "bars" | "time";
 };
 
 export type AgentVersion = {
@@ -219,14 +220,34 @@ export type MarketInputSnapshot = {
   newsFeaturesRef?: string | null;
 };
 
+export type MarketCandle = { timestamp: string; open: number; high: number; low: number; close: number; volume: number };
+
+// Columnar candles, sent to the RL service as-is: parallel arrays instead of one object per
+// candle. Numeric timestamps are epoch values in `timestamp_unit` (default "ms"); strings are ISO-8601.
+export type CandleBatch = {
+  timestamp: number[] | string[];
+  open: number[];
+  high: number[];
+  low: number[];
+  close: number[];
+  volume: number[];
+  timestamp_unit?: "s" | "ms" | "us" | "ns";
+  extras?: Record<string, Array<number | null>>;
+};
+
+// Same shape; the rl-service skips the ordering checks (data-quality reports only).
+export type UncheckedCandleBatch = CandleBatch;
+
 export type InferenceRequest = {
   runId?: string;
   pair: TradingPair;
   market: {
     pair?: TradingPair;
-    candles: Array<{ timestamp: string; open: number; high: number; low: number; close: number; volume: number }>;
+    candles: MarketCandle[];
     lastPrice?: number | null;
     spread?: number | null;
+    ticker?: Record<string, unknown> | null;
+    extras?: Record<string, number>;
   };
   ideas?: Array<{ source: string; timestamp: string; score: number; confidence?: number | null }>;
   signals?: Array<{ source: string; timestamp: string; score: number; confidence?: number | null }>;
@@ -280,6 +301,7 @@ export type EvaluationRequest = {
   datasetVersionId?: string | null;
   featureSetVersionId?: string | null;
   datasetHash?: string | null;
+  datasetRef?: string | null;
   artifactUri?: string | null;
   artifactChecksum?: string | null;
   artifactDownloadUrl?: string | null;
@@ -309,6 +331,7 @@ export type EvaluationRequest = {
   walkForward?: WalkForwardFoldConfig | null;
   featureSchemaFingerprint?: string | null;
   featureKeyExtras?: string[] | null;
+  datasetHashMode?: "merkle" | "legacy";
   datasetFeatures?: Array<{
     timestamp: string;
     open: number;
@@ -316,7 +339,7 @@ export type EvaluationRequest = {
     low: number;
     close: number;
     volume: number;
-  }>;
+  }> | CandleBatch;
 };
 
 export type TrainingRequest = {
@@ -328,6 +351,7 @@ export type TrainingRequest = {
   datasetVersionId?: string | null;
   featureSetVersionId?: string | null;
   datasetHash?: string | null;
+  datasetRef?: string | null;
   windowSize?: number;
   stride?: number;
   leverage?: number | null;
@@ -342,6 +366,12 @@ export type TrainingRequest = {
   seed?: number | null;
   featureSchemaFingerprint?: string | null;
   featureKeyExtras?: string[] | null;
+  episodeMode?: "windows" | "random_start";
+  episodeLength?: number | null;
+  minEpisodeLength?: number | null;
+  observationNormalization?: "none" | "zscore" | "robust";
+  historyLength?: number;
+  decisionInterval?: number;
   datasetFeatures?: Array<{
     timestamp: string;
     open: number;
@@ -349,7 +379,7 @@ export type TrainingRequest = {
     low: number;
     close: number;
     volume: number;
-  }>;
+  }> | CandleBatch;
 };
 
 export type TrainingResponse = {
@@ -391,6 +421,9 @@ export type DatasetPreviewRequest = {
   stride?: number;
   featureSetVersionId?: string | null;
   featureSchemaFingerprint?: string | null;
+  hashMode?: "merkle" | "legacy";
+  qualityCheck?: boolean;
+  qualityRepairs?: DatasetRepair[];
   features?: Array<{
     timestamp: string;
     open: number;
@@ -420,10 +453,41 @@ export type DatasetPreviewResponse = {
     window_size?: number;
     windowSize?: number;
     stride?: number;
+    hash_mode?: string | null;
+    hashMode?: string | null;
     created_at?: string;
     createdAt?: string;
   };
   windowCount: number;
+  quality?: Record<string, unknown> | null;
+};
+
+export type DatasetRepair = "forward_fill" | "drop" | "flag_gaps";
+
+export type DatasetValidateRequest = {
+  rows: Array<Record<string, unknown>> | UncheckedCandleBatch;
+  interval?: string | null;
+  outlierZscore?: number;
+  repairs?: DatasetRepair[];
+  issueRowLimit?: number;
+  returnRows?: boolean;
+};
+
+export type DatasetValidateResponse = {
+  summary: Record<string, unknown>;
+  issue_rows: Record<string, number[]>;
+  rows?: Array<Record<string, unknown>> | null;
+};
+
+export type DatasetCacheRequest = {
+  rows: Array<Record<string, unknown>> | CandleBatch;
+  baseRef?: string | null;
+};
+
+export type DatasetCacheResponse = {
+  dataset_ref: string;
+  row_count: number;
+  columns: string[];
 };
 
 export type DriftCheckRequest = {